@@ -0,0 +1,289 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from azure.ai.projects import AIProjectClient
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from credentials import get_credential
+from fake_project import FakeProjectClient, is_fake_endpoint
+
+load_dotenv()
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_RETRIES = 5
+
+# Progress is printed and the checkpoint saved every this many processed IDs
+PROGRESS_EVERY = 100
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_project_client():
+    """
+    Return the process-wide Azure AI Project client, creating it on first use.
+
+    A fake:// endpoint (or FAKE_PROJECT=true) gives the in-process fake project, e.g.
+    with FAKE_PRELOAD=agents=500,threads=2000 to benchmark the delete scripts offline.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                endpoint = os.getenv("PROJECT_ENDPOINT")
+                if not endpoint:
+                    raise ValueError("PROJECT_ENDPOINT is not set in the .env file.")
+                if is_fake_endpoint(endpoint):
+                    _client = FakeProjectClient(endpoint)
+                    return _client
+                try:
+                    _client = AIProjectClient(
+                        endpoint=endpoint,
+                        credential=get_credential(),
+                    )
+                except Exception as e:
+                    print(f"❌ Error initializing AIProjectClient: {e}")
+                    raise
+    return _client
+
+
+class Checkpoint:
+    """
+    Resumable progress file: IDs already handled are skipped on the next run.
+
+    Args:
+        path: JSON file path, or None to disable checkpointing
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.done = set()
+        self.failed = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as checkpoint_file:
+                data = json.load(checkpoint_file)
+            self.done = set(data.get("done", []))
+            self.failed = data.get("failed", {})
+            print(f"⏯️ Resuming from {path}: {len(self.done)} already handled")
+
+    def mark_done(self, resource_id):
+        with self._lock:
+            self.done.add(resource_id)
+            self.failed.pop(resource_id, None)
+
+    def mark_failed(self, resource_id, error):
+        with self._lock:
+            self.failed[resource_id] = error
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {"done": sorted(self.done), "failed": self.failed}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            json.dump(data, tmp_file)
+        os.replace(tmp_path, self.path)
+
+
+class RateLimitGate:
+    """
+    Shared back-off gate: when any worker is throttled, all workers pause.
+
+    The pause honours the Retry-After header when present, otherwise it grows
+    exponentially (with jitter) with the number of consecutive throttles.
+    """
+
+    def __init__(self):
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttled(self, attempt, retry_after=None):
+        delay = retry_after if retry_after is not None else min(2 ** attempt, 60)
+        delay *= random.uniform(1.0, 1.2)
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+        return delay
+
+
+def _retry_after_seconds(error):
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def collect_ids(list_page, predicate=None, page_size=DEFAULT_PAGE_SIZE, max_retries=DEFAULT_MAX_RETRIES):
+    """
+    Stream every page of a list call (e.g. threads.list) into a set of matching IDs.
+
+    The SDK pager follows the `after` cursor lazily, so only IDs are kept in memory.
+    They are collected before deleting so deletions cannot invalidate the cursor.
+    A 429 or 5xx while listing backs off like the deletions (honouring Retry-After)
+    and resumes the listing after the last ID seen, so a long listing is not lost.
+
+    Args:
+        list_page: Paged list method accepting `limit` and `after`
+        predicate (callable, optional): Keeps only items for which it returns True
+        page_size (int, optional): Items requested per page. Defaults to 100.
+        max_retries (int, optional): Consecutive retries of a failing page fetch.
+
+    Returns:
+        set: IDs of the selected items
+    """
+    ids = set()
+    gate = RateLimitGate()
+    listed, last_id, attempt = 0, None, 0
+    while True:
+        gate.wait()
+        try:
+            pager = list_page(limit=page_size, after=last_id) if last_id else list_page(limit=page_size)
+            for item in pager:
+                attempt = 0
+                listed += 1
+                last_id = item.id
+                if predicate is None or predicate(item):
+                    ids.add(item.id)
+                if listed % page_size == 0:
+                    print(f"📄 Listed {listed} items ({len(ids)} selected)...")
+            return ids
+        except HttpResponseError as e:
+            retryable = e.status_code == 429 or (e.status_code or 0) >= 500
+            if not retryable or attempt == max_retries:
+                raise
+            delay = gate.throttled(attempt, _retry_after_seconds(e))
+            attempt += 1
+            print(f"🚦 {e.status_code} while listing after {last_id or 'the start'}, backing off {delay:.1f}s")
+
+
+class BulkDeleteReport:
+    """Counts and timing of a bulk delete run."""
+
+    def __init__(self, total):
+        self.total = total
+        self.deleted = 0
+        self.missing = 0
+        self.failed = 0
+        self.skipped = 0
+        self.throttled = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, field, amount=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+            return self.deleted + self.missing + self.failed
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def print_summary(self, kind):
+        rate = self.deleted / self.elapsed if self.elapsed else 0.0
+        print(f"\n🏁 {kind.capitalize()} cleanup finished in {self.elapsed:.1f}s")
+        print(f"   ✅ Deleted: {self.deleted}   🔎 Not found: {self.missing}   "
+              f"❌ Failed: {self.failed}   ⏭️ Skipped (checkpoint): {self.skipped}")
+        print(f"   ⚡ Throughput: {rate:.1f} {kind}/s   🚦 Throttled: {self.throttled} times")
+
+
+def bulk_delete(ids, delete_one, kind, concurrency=DEFAULT_CONCURRENCY,
+                checkpoint_path=None, max_retries=DEFAULT_MAX_RETRIES, dry_run=False, labels=None):
+    """
+    Delete resources by ID with bounded concurrency, throttling back-off and a checkpoint.
+
+    Args:
+        ids: Iterable of resource IDs (duplicates are ignored)
+        delete_one: Callable deleting one resource by ID
+        kind: Plural resource name used in messages (e.g. "threads")
+        concurrency (int, optional): Max deletions in flight. Defaults to 8.
+        checkpoint_path (str, optional): Resumable progress file. Defaults to none.
+        max_retries (int, optional): Retries per ID after throttling (429) or 5xx errors.
+        dry_run (bool, optional): Only list what would be deleted.
+        labels (dict, optional): Text shown next to each ID in a dry run (e.g. name and age).
+
+    Returns:
+        BulkDeleteReport: Counts of deleted, missing, failed and skipped IDs
+    """
+    unique_ids = sorted(set(ids))
+    checkpoint = Checkpoint(checkpoint_path)
+    pending = [resource_id for resource_id in unique_ids if resource_id not in checkpoint.done]
+    report = BulkDeleteReport(len(unique_ids))
+    report.skipped = len(unique_ids) - len(pending)
+
+    if dry_run:
+        labels = labels or {}
+        for resource_id in pending:
+            label = labels.get(resource_id)
+            print(f"🔍 Would delete: {resource_id}  {label}" if label else f"🔍 Would delete: {resource_id}")
+        print(f"\n🔍 Dry run: {len(pending)} {kind} would be deleted.")
+        return report
+
+    if not pending:
+        print(f"🧹 No {kind} to delete.")
+        return report
+
+    print(f"🔁 Deleting {len(pending)} {kind} with concurrency {concurrency}...")
+    gate = RateLimitGate()
+
+    def delete_with_retry(resource_id):
+        for attempt in range(max_retries + 1):
+            gate.wait()
+            try:
+                delete_one(resource_id)
+                checkpoint.mark_done(resource_id)
+                return report.add("deleted")
+            except ResourceNotFoundError:
+                checkpoint.mark_done(resource_id)
+                return report.add("missing")
+            except HttpResponseError as e:
+                retryable = e.status_code == 429 or (e.status_code or 0) >= 500
+                if not retryable or attempt == max_retries:
+                    checkpoint.mark_failed(resource_id, str(e))
+                    print(f"❌ Failed to delete {resource_id}: {e}")
+                    return report.add("failed")
+                if e.status_code == 429:
+                    report.add("throttled")
+                delay = gate.throttled(attempt, _retry_after_seconds(e))
+                print(f"🚦 {e.status_code} on {resource_id}, backing off {delay:.1f}s")
+            except Exception as e:
+                checkpoint.mark_failed(resource_id, str(e))
+                print(f"❌ Failed to delete {resource_id}: {e}")
+                return report.add("failed")
+
+    # Bound queued work too, so huge ID lists don't turn into huge future lists
+    slots = threading.BoundedSemaphore(max(1, concurrency) * 4)
+
+    def on_done(future):
+        slots.release()
+        processed = future.result()
+        if processed and processed % PROGRESS_EVERY == 0:
+            rate = report.deleted / report.elapsed if report.elapsed else 0.0
+            print(f"⏱️ {processed}/{len(pending)} processed ({rate:.1f} {kind}/s)")
+            checkpoint.save()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for resource_id in pending:
+                slots.acquire()
+                executor.submit(delete_with_retry, resource_id).add_done_callback(on_done)
+    finally:
+        checkpoint.save()
+
+    report.print_summary(kind)
+    if checkpoint.failed and checkpoint_path:
+        print(f"💾 Failed IDs are recorded in {checkpoint_path}; re-run to retry them.")
+    return report
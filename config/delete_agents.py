@@ -1,101 +1,160 @@
-import os
-from dotenv import load_dotenv
-from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
-
-load_dotenv()
-
-
-def setup_project_client():
-    """Initialize and return the Azure AI Project client."""
-    PROJECT_ENDPOINT = os.getenv("PROJECT_ENDPOINT")
-    MODEL_DEPLOYMENT_NAME = os.getenv("MODEL_DEPLOYMENT_NAME")
-    if not PROJECT_ENDPOINT:
-        raise ValueError("PROJECT_ENDPOINT is not set in the .env file.")
-    if not MODEL_DEPLOYMENT_NAME:
-        raise ValueError("MODEL_DEPLOYMENT_NAME is not set in the .env file.")
-    try:
-        project_client = AIProjectClient(
-            endpoint=PROJECT_ENDPOINT,
-            credential=DefaultAzureCredential(),
-        )
-    except Exception as e:
-        print(f"❌ Error initializing AIProjectClient: {e}")
-        raise
-    return project_client
+import argparse
+import re
+from datetime import datetime, timedelta, timezone
+from bulk_delete import (
+    DEFAULT_CONCURRENCY,
+    bulk_delete,
+    collect_ids,
+    get_project_client,
+)
+
+AGE_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def _delete_agent(agent_id: str):
+    get_project_client().agents.delete_agent(agent_id)
+
+
+def parse_age(value):
+    """Parse an age such as '90m', '12h', '3d' or '2w' into a timedelta."""
+    match = re.fullmatch(r"(\d+)([mhdw])", value.strip().lower())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid age '{value}' (use e.g. 90m, 12h, 3d, 2w)")
+    return timedelta(**{AGE_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def parse_tag(value):
+    """Parse a metadata filter 'key=value'."""
+    key, separator, tag_value = value.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"Invalid tag '{value}' (use key=value)")
+    return key, tag_value
+
+
+def agent_filter(name_prefixes=(), older_than=None, tags=()):
+    """
+    Build a predicate matching agents by name prefix, creation age and metadata tags.
+
+    All given criteria must match; several name prefixes match if any of them does.
+
+    Args:
+        name_prefixes: Agent name prefixes (e.g. "inventory_agent", "fit_agent")
+        older_than (timedelta, optional): Minimum age since the agent was created
+        tags: (key, value) pairs that must all be present in the agent metadata
+
+    Returns:
+        callable: Predicate taking an agent and returning True if it should be deleted
+    """
+    cutoff = datetime.now(timezone.utc) - older_than if older_than else None
+
+    def matches(agent):
+        if name_prefixes and not (agent.name or "").startswith(tuple(name_prefixes)):
+            return False
+        if cutoff is not None:
+            created_at = agent.created_at
+            if isinstance(created_at, (int, float)):
+                created_at = datetime.fromtimestamp(created_at, timezone.utc)
+            if created_at is None or created_at > cutoff:
+                return False
+        metadata = agent.metadata or {}
+        return all(metadata.get(key) == value for key, value in tags)
+
+    return matches
 
 
 def delete_single_agent(agent_id: str):
-    """Delete a single agent by its ID, after checking its existence."""
+    """Delete a single agent by its ID (a missing agent is reported, not an error)."""
     print("✨ Delete Single Agent")
-    client = setup_project_client()
-    existing = [agent.id for agent in client.agents.list_agents(limit=100)]
-    if agent_id not in existing:
-        print(f"🤖 Agent ID {agent_id} not found. No deletion performed.")
-        return
-
-    print(f"🔄 Starting deletion of agent ID: {agent_id}")
-    try:
-        client.agents.delete_agent(agent_id)
-        print(f"✅ Deleted agent ID: {agent_id}")
-    except Exception as e:
-        print(f"❌ Failed to delete agent ID {agent_id}: {e}")
+    return bulk_delete([agent_id], _delete_agent, "agents", concurrency=1)
 
 
-def delete_multiple_agents(agent_ids: list[str]):
+def delete_multiple_agents(agent_ids: list[str], concurrency=DEFAULT_CONCURRENCY,
+                           checkpoint_path=None, dry_run=False):
     """Delete multiple agents by their IDs, skipping non-existent ones."""
     print("✨ Delete Multiple Agents")
-    client = setup_project_client()
-    existing = [agent.id for agent in client.agents.list_agents(limit=100)]
+    return bulk_delete(agent_ids, _delete_agent, "agents", concurrency=concurrency,
+                       checkpoint_path=checkpoint_path, dry_run=dry_run)
 
-    to_delete = [aid for aid in agent_ids if aid in existing]
-    missing = [aid for aid in agent_ids if aid not in existing]
 
-    if not to_delete:
-        print("🤖 None of the specified agent IDs were found. No deletions.")
-        return
+def delete_matching_agents(predicate=None, concurrency=DEFAULT_CONCURRENCY,
+                           checkpoint_path=None, dry_run=False):
+    """Delete every agent in the project matching predicate (all agents if None)."""
+    print("✨ Delete Matching Agents" if predicate else "✨ Delete All Agents")
+    selected = predicate or (lambda agent: True)
+    # Shown by bulk_delete's dry-run listing, which also leaves out checkpointed IDs
+    labels = {}
 
-    if missing:
-        print(f"⚠️ Some IDs not found and will be skipped: {missing}")
+    def select(agent):
+        if not selected(agent):
+            return False
+        if dry_run:
+            labels[agent.id] = f"{agent.name}  created {agent.created_at}"
+        return True
 
-    for aid in to_delete:
-        print(f"🔄 Starting deletion of agent ID: {aid}")
-        try:
-            client.agents.delete_agent(aid)
-            print(f"✅ Deleted agent ID: {aid}")
-        except Exception as e:
-            print(f"❌ Failed to delete agent ID {aid}: {e}")
+    agent_ids = collect_ids(get_project_client().agents.list_agents, select)
+    print(f"🔁 Found {len(agent_ids)} matching agents.")
+    return bulk_delete(agent_ids, _delete_agent, "agents", concurrency=concurrency,
+                       checkpoint_path=checkpoint_path, dry_run=dry_run, labels=labels)
 
 
-def delete_all_agents():
+def delete_all_agents(concurrency=DEFAULT_CONCURRENCY, checkpoint_path=None, dry_run=False):
     """Delete all agents in the project."""
-    print("✨ Delete All Agents")
-    client = setup_project_client()
-    all_ids = [agent.id for agent in client.agents.list_agents(limit=100)]
-    if not all_ids:
-        print("🤖 No agents found to delete.")
-        return
-
-    print(f"🔁 Found {len(all_ids)} agents. Proceeding to delete...")
-    for aid in all_ids:
-        print(f"🔄 Starting deletion of agent ID: {aid}")
-        try:
-            client.agents.delete_agent(aid)
-            print(f"✅ Deleted agent ID: {aid}")
-        except Exception as e:
-            print(f"❌ Failed to delete agent ID {aid}: {e}")
+    return delete_matching_agents(None, concurrency, checkpoint_path, dry_run)
+
+
+def _read_ids(path):
+    with open(path, encoding="utf-8") as ids_file:
+        return [line.strip() for line in ids_file if line.strip() and not line.startswith("#")]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Delete agents from the Azure AI Foundry project, by ID or by filter.")
+    ids = parser.add_mutually_exclusive_group()
+    ids.add_argument("--id", dest="ids", nargs="+", metavar="AGENT_ID",
+                     help="Agent ID(s) to delete")
+    ids.add_argument("--ids-file", metavar="PATH",
+                     help="File with one agent ID per line")
+
+    filters = parser.add_argument_group("filters (combined with AND; listing pages through all agents)")
+    filters.add_argument("--name-prefix", action="append", default=[], metavar="PREFIX",
+                         help="Agent name prefix, e.g. inventory_agent (repeatable, any may match)")
+    filters.add_argument("--older-than", type=parse_age, metavar="AGE",
+                         help="Only agents created more than AGE ago, e.g. 12h, 3d")
+    filters.add_argument("--tag", action="append", default=[], type=parse_tag, metavar="KEY=VALUE",
+                         help="Metadata tag that must match (repeatable)")
+    filters.add_argument("--all", action="store_true",
+                         help="Delete every agent in the project (no filter)")
+
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Deletions in flight (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="Resumable progress file; re-run with the same path to continue")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="List what would be deleted without deleting")
+
+    args = parser.parse_args()
+    has_filter = bool(args.name_prefix or args.older_than or args.tag)
+    has_ids = bool(args.ids or args.ids_file)
+
+    if has_ids and (has_filter or args.all):
+        parser.error("--id/--ids-file cannot be combined with filters or --all")
+    if args.all and has_filter:
+        parser.error("--all cannot be combined with filters")
+    if not (has_ids or has_filter or args.all):
+        parser.error("select agents with --id, --ids-file, a filter, or --all")
+    return args
 
 
 if __name__ == "__main__":
-    # Delete a single agent
-    # delete_single_agent("asst_eZ8H7qwf88i9Z5Gho5werdkW")
-
-    # Delete multiple agents
-    # delete_multiple_agents([
-    #     "asst_gLxnQAEyUyeYAqqgovMLxUGO",
-    #     "asst_OZRHTkR4hqS0iee0ErHyhb88",
-    #     "asst_TndAxHg6mgEJ3rEelItzIKKq"
-    # ])
-
-    # Delete all agents
-    delete_all_agents()
+    args = parse_args()
+    options = dict(concurrency=args.concurrency, checkpoint_path=args.checkpoint,
+                   dry_run=args.dry_run)
+
+    if args.ids or args.ids_file:
+        delete_multiple_agents(args.ids or _read_ids(args.ids_file), **options)
+    elif args.all:
+        delete_all_agents(**options)
+    else:
+        predicate = agent_filter(args.name_prefix, args.older_than, args.tag)
+        delete_matching_agents(predicate, **options)
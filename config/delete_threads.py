@@ -1,100 +1,69 @@
-import os
-from dotenv import load_dotenv
-from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+import argparse
+from bulk_delete import (
+    DEFAULT_CONCURRENCY,
+    bulk_delete,
+    collect_ids,
+    get_project_client,
+)
 
-load_dotenv()
 
-
-def setup_project_client():
-    """Initialize and return the Azure AI Project client."""
-    PROJECT_ENDPOINT = os.getenv("PROJECT_ENDPOINT")
-    MODEL_DEPLOYMENT_NAME = os.getenv("MODEL_DEPLOYMENT_NAME")
-    if not PROJECT_ENDPOINT:
-        raise ValueError("PROJECT_ENDPOINT is not set in the .env file.")
-    if not MODEL_DEPLOYMENT_NAME:
-        raise ValueError("MODEL_DEPLOYMENT_NAME is not set in the .env file.")
-    try:
-        return AIProjectClient(
-            endpoint=PROJECT_ENDPOINT,
-            credential=DefaultAzureCredential(),
-        )
-    except Exception as e:
-        print(f"❌ Error initializing AIProjectClient: {e}")
-        raise
+def _delete_thread(thread_id: str):
+    get_project_client().agents.threads.delete(thread_id=thread_id)
 
 
 def delete_single_thread(thread_id: str):
-    """Delete a single thread by its ID, after verifying existence."""
+    """Delete a single thread by its ID (a missing thread is reported, not an error)."""
     print("✨ Delete Single Thread")
-    client = setup_project_client()
-    existing = [t.id for t in client.agents.threads.list(limit=100)]
-    if thread_id not in existing:
-        print(f"🧵 Thread ID {thread_id} not found. No deletion performed.")
-        return
-
-    print(f"🔄 Starting deletion of thread ID: {thread_id}")
-    try:
-        client.agents.threads.delete(thread_id=thread_id)
-        print(f"✅ Deleted thread ID: {thread_id}")
-    except Exception as e:
-        print(f"❌ Failed to delete thread ID {thread_id}: {e}")
+    return bulk_delete([thread_id], _delete_thread, "threads", concurrency=1)
 
 
-def delete_multiple_threads(thread_ids: list[str]):
+def delete_multiple_threads(thread_ids: list[str], concurrency=DEFAULT_CONCURRENCY,
+                            checkpoint_path=None, dry_run=False):
     """Delete multiple threads by their IDs, skipping non-existent ones."""
     print("✨ Delete Multiple Threads")
-    client = setup_project_client()
-    existing = [t.id for t in client.agents.threads.list(limit=100)]
-
-    to_delete = [tid for tid in thread_ids if tid in existing]
-    missing = [tid for tid in thread_ids if tid not in existing]
-
-    if not to_delete:
-        print("🧵 None of the specified thread IDs were found. No deletions.")
-        return
-
-    if missing:
-        print(f"⚠️ Some IDs not found and skipped: {missing}")
+    return bulk_delete(thread_ids, _delete_thread, "threads", concurrency=concurrency,
+                       checkpoint_path=checkpoint_path, dry_run=dry_run)
 
-    for tid in to_delete:
-        print(f"🔄 Starting deletion of thread ID: {tid}")
-        try:
-            client.agents.threads.delete(thread_id=tid)
-            print(f"✅ Deleted thread ID: {tid}")
-        except Exception as e:
-            print(f"❌ Failed to delete thread ID {tid}: {e}")
 
-
-def delete_all_threads():
-    """Delete all threads in the project."""
+def delete_all_threads(concurrency=DEFAULT_CONCURRENCY, checkpoint_path=None, dry_run=False):
+    """Delete all threads in the project, paging through the full thread list."""
     print("✨ Delete All Threads")
-    client = setup_project_client()
-    all_ids = [t.id for t in client.agents.threads.list(limit=100)]
-    if not all_ids:
-        print("🧵 No threads found to delete.")
-        return
-
-    print(f"🔁 Found {len(all_ids)} threads. Proceeding to delete...")
-    for tid in all_ids:
-        print(f"🔄 Starting deletion of thread ID: {tid}")
-        try:
-            client.agents.threads.delete(thread_id=tid)
-            print(f"✅ Deleted thread ID: {tid}")
-        except Exception as e:
-            print(f"❌ Failed to delete thread ID {tid}: {e}")
+    thread_ids = collect_ids(get_project_client().agents.threads.list)
+    print(f"🔁 Found {len(thread_ids)} threads.")
+    return bulk_delete(thread_ids, _delete_thread, "threads", concurrency=concurrency,
+                       checkpoint_path=checkpoint_path, dry_run=dry_run)
+
+
+def _read_ids(path):
+    with open(path, encoding="utf-8") as ids_file:
+        return [line.strip() for line in ids_file if line.strip() and not line.startswith("#")]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Delete conversation threads from the Azure AI Foundry project.")
+    selector = parser.add_mutually_exclusive_group(required=True)
+    selector.add_argument("--id", dest="ids", nargs="+", metavar="THREAD_ID",
+                          help="Thread ID(s) to delete")
+    selector.add_argument("--ids-file", metavar="PATH",
+                          help="File with one thread ID per line")
+    selector.add_argument("--all", action="store_true",
+                          help="Delete every thread in the project")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Deletions in flight (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="Resumable progress file; re-run with the same path to continue")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="List what would be deleted without deleting")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    # Delete a single thread
-    # delete_single_thread("thread_HscuXrOA04AZYt3JLnzvMdKG")
-
-    # Delete multiple threads
-    # delete_multiple_threads([
-    #     "thread_76Q0ygGLWGoYnX1LL31usiw5",
-    #     "thread_HBlcTcB4WpkOhTdDBzQt5Ud9",
-    #     "thread_OUxhLIRJWLioSJPTiar83wgP"
-    # ])
-
-    # Delete all threads
-    delete_all_threads()
+    args = parse_args()
+    options = dict(concurrency=args.concurrency, checkpoint_path=args.checkpoint,
+                   dry_run=args.dry_run)
+
+    if args.all:
+        delete_all_threads(**options)
+    else:
+        delete_multiple_threads(args.ids or _read_ids(args.ids_file), **options)
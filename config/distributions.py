@@ -0,0 +1,40 @@
+import math
+
+
+class Distribution:
+    """
+    Random duration in seconds, parsed from a spec such as "uniform:0.1,0.5".
+
+    Specs: "0.2" or "fixed:0.2", "uniform:low,high", "normal:mean,stddev",
+    "lognormal:median,sigma" and "exponential:mean". Samples are never negative.
+
+    Args:
+        spec: Distribution spec
+        rng: random.Random to draw from (seeded for repeatable runs)
+    """
+
+    def __init__(self, spec, rng):
+        self.spec = spec
+        self._rng = rng
+        kind, _, params = spec.partition(":")
+        if not params:
+            kind, params = "fixed", kind
+        try:
+            values = [float(value) for value in params.split(",")]
+            self._sample = {
+                "fixed": lambda: values[0],
+                "uniform": lambda: rng.uniform(values[0], values[1]),
+                "normal": lambda: rng.gauss(values[0], values[1]),
+                "lognormal": lambda: rng.lognormvariate(math.log(values[0]), values[1]),
+                "exponential": lambda: rng.expovariate(1 / values[0]),
+            }[kind.strip().lower()]
+            self._sample()
+        except (KeyError, IndexError, ValueError, ZeroDivisionError):
+            raise ValueError(f"Invalid distribution '{spec}' (use e.g. 0.2, uniform:0.1,0.5, "
+                             "normal:1,0.2, lognormal:1,0.5 or exponential:1)") from None
+
+    def sample(self):
+        return max(0.0, self._sample())
+
+    def __repr__(self):
+        return f"Distribution({self.spec!r})"
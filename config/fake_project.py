@@ -0,0 +1,701 @@
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from distributions import Distribution
+
+logger = logging.getLogger(__name__)
+
+
+FAKE_ENDPOINT_SCHEME = "fake://"
+
+DEFAULT_API_LATENCY = "uniform:0.02,0.08"
+DEFAULT_QUEUE_SECONDS = "uniform:0.1,0.4"
+DEFAULT_RUN_SECONDS = "uniform:0.5,2.0"
+DEFAULT_ERROR_STATUS = 429
+DEFAULT_REPLY = "Fake reply from {agent} to: {prompt}"
+
+# Streamed replies are split into deltas of this many words
+STREAM_DELTA_WORDS = 3
+
+
+def is_fake_endpoint(endpoint):
+    """Return True if the endpoint (or FAKE_PROJECT=true) selects the in-process fake."""
+    return (endpoint or "").startswith(FAKE_ENDPOINT_SCHEME) or \
+        os.getenv("FAKE_PROJECT", "false").lower() == "true"
+
+
+class FakeBehavior:
+    """
+    Latency, failure and reply settings of a fake project (read from FAKE_* variables).
+
+    Args:
+        api_latency (optional): Spec of each API call's latency (FAKE_API_LATENCY)
+        queue_seconds (optional): Spec of the time a run stays queued (FAKE_QUEUE_SECONDS)
+        run_seconds (optional): Spec of each in_progress phase of a run, and of each
+            connected-agent call within it (FAKE_RUN_SECONDS)
+        error_rate (optional): Probability that an API call fails (FAKE_ERROR_RATE)
+        error_status (optional): HTTP status of injected API errors (FAKE_ERROR_STATUS, 429)
+        run_failure_rate (optional): Probability that a run ends as failed (FAKE_RUN_FAILURE_RATE)
+        reply (optional): Reply template with {agent} and {prompt} fields (FAKE_REPLY)
+        replies (optional): Scripted replies, [{"match": regex, "reply": template}, ...];
+            the first pattern found in the prompt wins, otherwise reply is used.
+            Defaults to the JSON file named by FAKE_REPLIES.
+        seed (optional): Seed for every random draw, for repeatable runs (FAKE_SEED)
+    """
+
+    def __init__(self, api_latency=None, queue_seconds=None, run_seconds=None, error_rate=None,
+                 error_status=None, run_failure_rate=None, reply=None, replies=None, seed=None):
+        seed = seed if seed is not None else os.getenv("FAKE_SEED")
+        self.rng = random.Random(int(seed) if seed not in (None, "") else None)
+        self.api_latency = Distribution(
+            api_latency or os.getenv("FAKE_API_LATENCY", DEFAULT_API_LATENCY), self.rng)
+        self.queue_seconds = Distribution(
+            queue_seconds or os.getenv("FAKE_QUEUE_SECONDS", DEFAULT_QUEUE_SECONDS), self.rng)
+        self.run_seconds = Distribution(
+            run_seconds or os.getenv("FAKE_RUN_SECONDS", DEFAULT_RUN_SECONDS), self.rng)
+        self.error_rate = float(error_rate if error_rate is not None else os.getenv("FAKE_ERROR_RATE", 0))
+        self.error_status = int(error_status or os.getenv("FAKE_ERROR_STATUS", DEFAULT_ERROR_STATUS))
+        self.run_failure_rate = float(
+            run_failure_rate if run_failure_rate is not None else os.getenv("FAKE_RUN_FAILURE_RATE", 0))
+        self.reply = reply or os.getenv("FAKE_REPLY", DEFAULT_REPLY)
+        if replies is None and os.getenv("FAKE_REPLIES"):
+            with open(os.getenv("FAKE_REPLIES"), encoding="utf-8") as replies_file:
+                replies = json.load(replies_file)
+        self.replies = [(re.compile(item["match"], re.IGNORECASE), item["reply"]) for item in replies or []]
+        self._lock = threading.Lock()
+
+    def reply_for(self, agent, prompt):
+        """Return the scripted reply of an agent to a prompt."""
+        template = next((reply for pattern, reply in self.replies if pattern.search(prompt)), self.reply)
+        return template.format(agent=agent, prompt=prompt)
+
+    def chance(self, probability):
+        with self._lock:
+            return probability > 0 and self.rng.random() < probability
+
+    def draw(self, distribution):
+        with self._lock:
+            return distribution.sample()
+
+
+def _new_id(prefix):
+    return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+
+def _plain(value):
+    """Convert SDK models (tool definitions, tool resources) into plain JSON data."""
+    if hasattr(value, "as_dict"):
+        value = value.as_dict()
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _tokens(text):
+    return max(1, len(text) // 4)
+
+
+def _text_of(message):
+    return "".join(part["text"]["value"] for part in message["content"] if part["type"] == "text")
+
+
+def sse(event, data):
+    """Encode one server-sent event as the Agents service streams it."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+class NotFound(Exception):
+    """A resource does not exist in the fake backend (HTTP 404)."""
+
+
+class FakeAgentsBackend:
+    """
+    In-memory state of the Agents service: agents, threads, messages, runs, run steps,
+    files and vector stores, stored and returned as REST (JSON) payloads.
+
+    Runs advance with the clock whenever they are read: queued for a sampled time,
+    in_progress for a sampled time, requires_action when the agent has function
+    tools (until their outputs are submitted, after which the run is in_progress
+    again), then completed or failed. On completion a run gets a tool_calls step per
+    connected agent, a message_creation step, the assistant message and its usage.
+    No background threads are involved.
+
+    Args:
+        behavior (optional): FakeBehavior. Defaults to one read from FAKE_* variables.
+    """
+
+    def __init__(self, behavior=None):
+        self.behavior = behavior or FakeBehavior()
+        self._lock = threading.RLock()
+        self._sequence = itertools.count()
+        self.agents = {}
+        self.threads = {}
+        self.messages = {}
+        self.runs = {}
+        self.run_steps = {}
+        self.files = {}
+        self.vector_stores = {}
+
+    # Generic helpers
+
+    def _stamp(self, record):
+        record["_sequence"] = next(self._sequence)
+        return record
+
+    @staticmethod
+    def public(record):
+        """Return a record without its private (underscore) fields."""
+        return {key: value for key, value in record.items() if not key.startswith("_")}
+
+    @staticmethod
+    def _get(table, resource_id, kind):
+        record = table.get(resource_id)
+        if record is None:
+            raise NotFound(f"No {kind} found with id '{resource_id}'.")
+        return record
+
+    def list(self, records, order="desc", limit=None, after=None):
+        """Page through records by creation order, as the service's cursor listings do."""
+        records = sorted(records, key=lambda record: record["_sequence"], reverse=(str(order) != "asc"))
+        if after is not None:
+            ids = [record["id"] for record in records]
+            records = records[ids.index(after) + 1:] if after in ids else []
+        if limit is not None:
+            records = records[:int(limit)]
+        return [self.public(record) for record in records]
+
+    # Agents
+
+    def create_agent(self, model=None, name=None, instructions=None, description=None,
+                     tools=None, tool_resources=None, toolset=None, metadata=None, **kwargs):
+        if toolset is not None:
+            tools, tool_resources = toolset.definitions, toolset.resources
+        with self._lock:
+            agent = self._stamp({
+                "id": _new_id("asst"), "object": "assistant", "created_at": int(time.time()),
+                "name": name, "description": description, "model": model,
+                "instructions": instructions, "tools": _plain(tools or []),
+                "tool_resources": _plain(tool_resources or {}), "metadata": metadata or {},
+                "temperature": kwargs.get("temperature", 1.0), "top_p": kwargs.get("top_p", 1.0),
+            })
+            self.agents[agent["id"]] = agent
+            return self.public(agent)
+
+    def update_agent(self, agent_id, toolset=None, **changes):
+        if toolset is not None:
+            changes["tools"], changes["tool_resources"] = toolset.definitions, toolset.resources
+        with self._lock:
+            agent = self._get(self.agents, agent_id, "agent")
+            agent.update({key: _plain(value) for key, value in changes.items() if value is not None})
+            return self.public(agent)
+
+    def list_agents(self, **paging):
+        with self._lock:
+            return self.list(self.agents.values(), **paging)
+
+    def get_agent(self, agent_id):
+        with self._lock:
+            return self.public(self._get(self.agents, agent_id, "agent"))
+
+    def delete_agent(self, agent_id):
+        with self._lock:
+            self._get(self.agents, agent_id, "agent")
+            del self.agents[agent_id]
+            return {"id": agent_id, "object": "assistant.deleted", "deleted": True}
+
+    # Threads and messages
+
+    def create_thread(self, messages=None, metadata=None, **kwargs):
+        with self._lock:
+            thread = self._stamp({
+                "id": _new_id("thread"), "object": "thread", "created_at": int(time.time()),
+                "metadata": metadata or {}, "tool_resources": {},
+            })
+            self.threads[thread["id"]] = thread
+            self.messages[thread["id"]] = []
+            for message in messages or []:
+                message = _plain(message)
+                self.create_message(thread["id"], message.get("role", "user"), message.get("content", ""))
+            return self.public(thread)
+
+    def list_threads(self, **paging):
+        with self._lock:
+            return self.list(self.threads.values(), **paging)
+
+    def get_thread(self, thread_id):
+        with self._lock:
+            return self.public(self._get(self.threads, thread_id, "thread"))
+
+    def delete_thread(self, thread_id):
+        with self._lock:
+            self._get(self.threads, thread_id, "thread")
+            del self.threads[thread_id]
+            self.messages.pop(thread_id, None)
+            return {"id": thread_id, "object": "thread.deleted", "deleted": True}
+
+    def create_message(self, thread_id, role, content, run_id=None, agent_id=None, **kwargs):
+        with self._lock:
+            self._get(self.threads, thread_id, "thread")
+            message = self._stamp({
+                "id": _new_id("msg"), "object": "thread.message", "created_at": int(time.time()),
+                "thread_id": thread_id, "status": "completed", "role": getattr(role, "value", role),
+                "content": [{"type": "text", "text": {"value": str(content), "annotations": []}}],
+                "run_id": run_id, "assistant_id": agent_id, "attachments": [], "metadata": {},
+            })
+            self.messages[thread_id].append(message)
+            return self.public(message)
+
+    def list_messages(self, thread_id, run_id=None, **paging):
+        with self._lock:
+            self._get(self.threads, thread_id, "thread")
+            messages = [message for message in self.messages[thread_id]
+                        if run_id is None or message["run_id"] == run_id]
+            return self.list(messages, **paging)
+
+    # Runs
+
+    def create_run(self, thread_id, agent_id, **kwargs):
+        with self._lock:
+            self._get(self.threads, thread_id, "thread")
+            agent = self._get(self.agents, agent_id, "agent")
+            now = time.monotonic()
+            queued = self.behavior.draw(self.behavior.queue_seconds)
+            run = self._stamp({
+                "id": _new_id("run"), "object": "thread.run", "created_at": int(time.time()),
+                "thread_id": thread_id, "assistant_id": agent_id, "status": "queued",
+                "model": agent["model"], "instructions": agent["instructions"], "tools": agent["tools"],
+                "required_action": None, "last_error": None, "usage": None, "metadata": {},
+                "started_at": None, "completed_at": None, "failed_at": None, "cancelled_at": None,
+                "_in_progress_at": now + queued,
+                "_finish_at": now + queued + self._run_seconds(agent),
+                "_tool_outputs": None,
+            })
+            self.runs[run["id"]] = run
+            self.run_steps[run["id"]] = []
+            return self.public(run)
+
+    def _run_seconds(self, agent):
+        # Each connected agent called by the run adds its own run time
+        calls = 1 + sum(1 for tool in agent["tools"] if tool.get("type") == "connected_agent")
+        return sum(self.behavior.draw(self.behavior.run_seconds) for _ in range(calls))
+
+    def get_run(self, thread_id, run_id):
+        with self._lock:
+            run = self._get(self.runs, run_id, "run")
+            self._advance(run)
+            return self.public(run)
+
+    def seconds_to_next_status(self, run_id):
+        """Seconds until a run's status next changes by itself, or None if it will not."""
+        with self._lock:
+            run = self._get(self.runs, run_id, "run")
+            self._advance(run)
+            if run["status"] == "queued":
+                return max(0.0, run["_in_progress_at"] - time.monotonic())
+            if run["status"] == "in_progress":
+                return max(0.0, run["_finish_at"] - time.monotonic())
+            return None
+
+    def cancel_run(self, thread_id, run_id):
+        with self._lock:
+            run = self._get(self.runs, run_id, "run")
+            self._advance(run)
+            if run["status"] in ("queued", "in_progress", "requires_action"):
+                run.update(status="cancelled", cancelled_at=int(time.time()), required_action=None)
+            return self.public(run)
+
+    def submit_tool_outputs(self, thread_id, run_id, tool_outputs):
+        with self._lock:
+            run = self._get(self.runs, run_id, "run")
+            self._advance(run)
+            if run["status"] != "requires_action":
+                raise ValueError(f"Run {run_id} is {run['status']}, not requires_action.")
+            run.update(status="in_progress", required_action=None, _tool_outputs=_plain(tool_outputs),
+                       _finish_at=time.monotonic() + self.behavior.draw(self.behavior.run_seconds))
+            return self.public(run)
+
+    def list_run_steps(self, thread_id, run_id, **paging):
+        with self._lock:
+            run = self._get(self.runs, run_id, "run")
+            self._advance(run)
+            return self.list(self.run_steps[run_id], **paging)
+
+    def _advance(self, run):
+        now = time.monotonic()
+        if run["status"] == "queued" and now >= run["_in_progress_at"]:
+            run.update(status="in_progress", started_at=int(time.time()))
+        if run["status"] != "in_progress" or now < run["_finish_at"]:
+            return
+
+        agent = self.agents.get(run["assistant_id"], {"name": run["assistant_id"], "tools": run["tools"]})
+        functions = [tool["function"] for tool in run["tools"] if tool.get("type") == "function"]
+        if functions and run["_tool_outputs"] is None:
+            run.update(status="requires_action", required_action={
+                "type": "submit_tool_outputs",
+                "submit_tool_outputs": {"tool_calls": [
+                    {"id": _new_id("call"), "type": "function",
+                     "function": {"name": function["name"], "arguments": "{}"}}
+                    for function in functions[:1]]},
+            })
+            return
+
+        if self.behavior.chance(self.behavior.run_failure_rate):
+            run.update(status="failed", failed_at=int(time.time()),
+                       last_error={"code": "server_error", "message": "Injected run failure (FAKE_RUN_FAILURE_RATE)."})
+            return
+        self._complete(run, agent)
+
+    def _complete(self, run, agent):
+        thread_messages = self.messages.get(run["thread_id"], [])
+        user_messages = [message for message in thread_messages if message["role"] == "user"]
+        prompt = _text_of(user_messages[-1]) if user_messages else ""
+        reply = self.behavior.reply_for(agent.get("name") or run["assistant_id"], prompt)
+        prompt_tokens = _tokens(run["instructions"] or "") + sum(_tokens(_text_of(m)) for m in thread_messages)
+        completion_tokens = _tokens(reply)
+        created_at = int(time.time())
+
+        def add_step(step_type, details, usage):
+            self.run_steps[run["id"]].append(self._stamp({
+                "id": _new_id("step"), "object": "thread.run.step", "type": step_type,
+                "assistant_id": run["assistant_id"], "thread_id": run["thread_id"], "run_id": run["id"],
+                "status": "completed", "step_details": details, "usage": usage,
+                "created_at": created_at, "completed_at": created_at, "last_error": None,
+            }))
+
+        connected = [tool["connected_agent"] for tool in run["tools"] if tool.get("type") == "connected_agent"]
+        if connected:
+            calls = [{"id": _new_id("call"), "type": "connected_agent", "connected_agent": {
+                "name": tool.get("name"), "arguments": json.dumps({"query": prompt}),
+                "output": self.behavior.reply_for(tool.get("name"), prompt)}}
+                for tool in connected]
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": 10 * len(calls),
+                     "total_tokens": prompt_tokens + 10 * len(calls)}
+            add_step("tool_calls", {"type": "tool_calls", "tool_calls": calls}, usage)
+            prompt_tokens *= 2
+
+        message = self.create_message(run["thread_id"], "assistant", reply,
+                                      run_id=run["id"], agent_id=run["assistant_id"])
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        add_step("message_creation", {"type": "message_creation",
+                                      "message_creation": {"message_id": message["id"]}}, usage)
+
+        total = {field: sum(step["usage"][field] for step in self.run_steps[run["id"]])
+                 for field in ("prompt_tokens", "completion_tokens", "total_tokens")}
+        run.update(status="completed", completed_at=created_at, usage=total)
+
+    def run_events(self, thread_id, run_id, created=True):
+        """
+        Yield a run's server-sent events (bytes) as it advances, ending with `done`.
+
+        Sleeps until each status change, so a consumer receives the events when the
+        service would send them. A run reaching requires_action ends the stream.
+        """
+        run = self.get_run(thread_id, run_id)
+        if created:
+            yield sse("thread.run.created", run)
+        reported = run["status"]
+        while True:
+            wait = self.seconds_to_next_status(run_id)
+            if wait:
+                time.sleep(wait)
+            run = self.get_run(thread_id, run_id)
+            if run["status"] == reported:
+                continue
+            reported = run["status"]
+            if run["status"] == "in_progress":
+                yield sse("thread.run.in_progress", run)
+                continue
+            if run["status"] == "completed":
+                yield from self._completion_events(thread_id, run)
+            yield sse(f"thread.run.{run['status']}", run)
+            yield b"event: done\ndata: [DONE]\n\n"
+            return
+
+    def _completion_events(self, thread_id, run):
+        for step in self.list_run_steps(thread_id, run["id"], order="asc"):
+            yield sse("thread.run.step.created", {**step, "status": "in_progress"})
+            if step["type"] != "message_creation":
+                yield sse("thread.run.step.completed", step)
+                continue
+
+            message = next(message for message in self.list_messages(thread_id, run_id=run["id"])
+                           if message["id"] == step["step_details"]["message_creation"]["message_id"])
+            yield sse("thread.message.created", {**message, "status": "in_progress", "content": []})
+            words = _text_of(message).split(" ")
+            for index in range(0, len(words), STREAM_DELTA_WORDS):
+                text = " ".join(words[index:index + STREAM_DELTA_WORDS])
+                text += " " if index + STREAM_DELTA_WORDS < len(words) else ""
+                yield sse("thread.message.delta", {
+                    "id": message["id"], "object": "thread.message.delta",
+                    "delta": {"role": "assistant", "content": [
+                        {"index": 0, "type": "text", "text": {"value": text, "annotations": []}}]},
+                })
+            yield sse("thread.message.completed", message)
+            yield sse("thread.run.step.completed", step)
+
+    # Files and vector stores
+
+    def upload_file(self, filename, size, purpose):
+        with self._lock:
+            file = self._stamp({
+                "id": _new_id("assistant"), "object": "file", "bytes": size, "filename": filename,
+                "created_at": int(time.time()), "purpose": getattr(purpose, "value", purpose),
+                "status": "processed",
+            })
+            self.files[file["id"]] = file
+            return self.public(file)
+
+    def get_file(self, file_id):
+        with self._lock:
+            return self.public(self._get(self.files, file_id, "file"))
+
+    def delete_file(self, file_id):
+        with self._lock:
+            self._get(self.files, file_id, "file")
+            del self.files[file_id]
+            return {"id": file_id, "object": "file", "deleted": True}
+
+    def create_vector_store(self, file_ids=None, name=None, **kwargs):
+        with self._lock:
+            for file_id in file_ids or []:
+                self._get(self.files, file_id, "file")
+            count = len(file_ids or [])
+            vector_store = self._stamp({
+                "id": _new_id("vs"), "object": "vector_store", "created_at": int(time.time()),
+                "name": name, "status": "completed", "usage_bytes": 0, "metadata": {},
+                "file_counts": {"in_progress": 0, "completed": count, "failed": 0,
+                                "cancelled": 0, "total": count},
+            })
+            self.vector_stores[vector_store["id"]] = vector_store
+            return self.public(vector_store)
+
+    def get_vector_store(self, vector_store_id):
+        with self._lock:
+            return self.public(self._get(self.vector_stores, vector_store_id, "vector store"))
+
+    def delete_vector_store(self, vector_store_id):
+        with self._lock:
+            self._get(self.vector_stores, vector_store_id, "vector store")
+            del self.vector_stores[vector_store_id]
+            return {"id": vector_store_id, "object": "vector_store.deleted", "deleted": True}
+
+    def preload(self, agents=0, threads=0):
+        """Create placeholder agents and threads, e.g. to exercise the bulk delete scripts."""
+        for index in range(agents):
+            self.create_agent(model="fake-model", name=f"preloaded-agent-{index:05d}")
+        for _ in range(threads):
+            self.create_thread()
+
+
+# SDK-shaped client
+
+
+def _models():
+    from azure.ai.agents import models
+    return models
+
+
+class _Operations:
+    """Base of the fake operation groups: injected latency and errors, SDK models out."""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def _call(self, func, *args, **kwargs):
+        from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+
+        behavior = self._backend.behavior
+        time.sleep(behavior.draw(behavior.api_latency))
+        if behavior.chance(behavior.error_rate):
+            error = HttpResponseError(message=f"({behavior.error_status}) Injected error (FAKE_ERROR_RATE).")
+            error.status_code = behavior.error_status
+            raise error
+        try:
+            return func(*args, **kwargs)
+        except NotFound as e:
+            error = ResourceNotFoundError(message=str(e))
+            error.status_code = 404
+            raise error from None
+
+    def _pages(self, model, func, *args, limit=None, order=None, after=None, **kwargs):
+        """Yield models page by page, fetching the next page only when needed (as SDK pagers do)."""
+        page_size = limit or 20
+        order = getattr(order, "value", order) or "desc"
+        while True:
+            page = self._call(func, *args, order=order, limit=page_size, after=after, **kwargs)
+            for item in page:
+                yield model(item)
+            if len(page) < page_size:
+                return
+            after = page[-1]["id"]
+
+
+class _ThreadOperations(_Operations):
+
+    def create(self, **kwargs):
+        return _models().AgentThread(self._call(self._backend.create_thread, **kwargs))
+
+    def get(self, thread_id, **kwargs):
+        return _models().AgentThread(self._call(self._backend.get_thread, thread_id))
+
+    def delete(self, thread_id, **kwargs):
+        self._call(self._backend.delete_thread, thread_id)
+
+    def list(self, limit=None, order=None, after=None, **kwargs):
+        return self._pages(_models().AgentThread, self._backend.list_threads,
+                           limit=limit, order=order, after=after)
+
+
+class _MessageOperations(_Operations):
+
+    def create(self, thread_id, role, content, **kwargs):
+        return _models().ThreadMessage(self._call(self._backend.create_message, thread_id, role, content))
+
+    def list(self, thread_id, run_id=None, limit=None, order=None, after=None, **kwargs):
+        return self._pages(_models().ThreadMessage, self._backend.list_messages, thread_id,
+                           run_id=run_id, limit=limit, order=order, after=after)
+
+
+class _RunOperations(_Operations):
+
+    def create(self, thread_id, agent_id, **kwargs):
+        return _models().ThreadRun(self._call(self._backend.create_run, thread_id, agent_id))
+
+    def get(self, thread_id, run_id, **kwargs):
+        return _models().ThreadRun(self._call(self._backend.get_run, thread_id, run_id))
+
+    def cancel(self, thread_id, run_id, **kwargs):
+        return _models().ThreadRun(self._call(self._backend.cancel_run, thread_id, run_id))
+
+    def submit_tool_outputs(self, thread_id, run_id, tool_outputs, **kwargs):
+        return _models().ThreadRun(
+            self._call(self._backend.submit_tool_outputs, thread_id, run_id, tool_outputs))
+
+    def stream(self, thread_id, agent_id, event_handler=None, **kwargs):
+        """
+        Start a run and return an AgentRunStream fed with server-sent events.
+
+        The events are produced as the fake run advances, and parsed by the SDK's own
+        event handler machinery. A run reaching requires_action ends the stream.
+        """
+        models = _models()
+        run = self._call(self._backend.create_run, thread_id, agent_id)
+        return models.AgentRunStream(self._backend.run_events(thread_id, run["id"]),
+                                     lambda *args: None, event_handler or models.AgentEventHandler())
+
+
+class _RunStepOperations(_Operations):
+
+    def list(self, thread_id, run_id, limit=None, order=None, after=None, **kwargs):
+        return self._pages(_models().RunStep, self._backend.list_run_steps, thread_id, run_id,
+                           limit=limit, order=order, after=after)
+
+
+class _FileOperations(_Operations):
+
+    def upload(self, file_path=None, purpose=None, file=None, filename=None, **kwargs):
+        if file_path is not None:
+            filename, size = os.path.basename(file_path), os.path.getsize(file_path)
+        else:
+            size = len(file.read()) if hasattr(file, "read") else len(file or b"")
+        return _models().FileInfo(self._call(self._backend.upload_file, filename, size, purpose))
+
+    def upload_and_poll(self, **kwargs):
+        return self.upload(**kwargs)
+
+    def get(self, file_id, **kwargs):
+        return _models().FileInfo(self._call(self._backend.get_file, file_id))
+
+    def delete(self, file_id, **kwargs):
+        self._call(self._backend.delete_file, file_id)
+
+
+class _VectorStoreOperations(_Operations):
+
+    def create_and_poll(self, file_ids=None, name=None, **kwargs):
+        return _models().VectorStore(self._call(self._backend.create_vector_store, file_ids, name))
+
+    def create(self, file_ids=None, name=None, **kwargs):
+        return self.create_and_poll(file_ids=file_ids, name=name)
+
+    def get(self, vector_store_id, **kwargs):
+        return _models().VectorStore(self._call(self._backend.get_vector_store, vector_store_id))
+
+    def delete(self, vector_store_id, **kwargs):
+        self._call(self._backend.delete_vector_store, vector_store_id)
+
+
+class FakeAgentsClient(_Operations):
+    """Stand-in for AIProjectClient.agents (azure.ai.agents.AgentsClient)."""
+
+    def __init__(self, backend):
+        super().__init__(backend)
+        self.threads = _ThreadOperations(backend)
+        self.messages = _MessageOperations(backend)
+        self.runs = _RunOperations(backend)
+        self.run_steps = _RunStepOperations(backend)
+        self.files = _FileOperations(backend)
+        self.vector_stores = _VectorStoreOperations(backend)
+
+    def create_agent(self, **definition):
+        return _models().Agent(self._call(self._backend.create_agent, **definition))
+
+    def update_agent(self, agent_id, **definition):
+        return _models().Agent(self._call(self._backend.update_agent, agent_id, **definition))
+
+    def get_agent(self, agent_id, **kwargs):
+        return _models().Agent(self._call(self._backend.get_agent, agent_id))
+
+    def delete_agent(self, agent_id, **kwargs):
+        self._call(self._backend.delete_agent, agent_id)
+
+    def list_agents(self, limit=None, order=None, after=None, **kwargs):
+        return self._pages(_models().Agent, self._backend.list_agents, limit=limit, order=order, after=after)
+
+    def close(self):
+        pass
+
+
+class FakeProjectClient:
+    """
+    In-process stand-in for AIProjectClient, for offline and repeatable performance runs.
+
+    Exposes the `agents` surface used by the conversation managers, the agent
+    factories, the upload cache, teardown and the bulk delete scripts, returning the
+    SDK's own model types. State lives in memory for the life of the client.
+
+    Settings come from FAKE_* variables (see FakeBehavior); FAKE_PRELOAD
+    ("agents=500,threads=2000") creates placeholder resources up front.
+
+    Args:
+        endpoint (optional): Endpoint it was selected with (informational)
+        behavior (optional): FakeBehavior overriding the FAKE_* variables
+    """
+
+    def __init__(self, endpoint=FAKE_ENDPOINT_SCHEME, behavior=None):
+        self.endpoint = endpoint
+        self.backend = FakeAgentsBackend(behavior)
+        self.agents = FakeAgentsClient(self.backend)
+
+        preload = dict(item.split("=", 1) for item in os.getenv("FAKE_PRELOAD", "").split(",") if "=" in item)
+        if preload:
+            self.backend.preload(**{key.strip(): int(value) for key, value in preload.items()})
+        logger.info("🧪 Using the in-process fake project at %s", endpoint)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
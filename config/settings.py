@@ -3,7 +3,7 @@ import logging
 import os
 from dotenv import load_dotenv
 from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+from credentials import get_credential
 
 # ──────────────────────────────────────────────
 # 🔧 Logging Setup
@@ -60,7 +60,7 @@ def test_project_connection(endpoint):
     try:
         client = AIProjectClient(
             endpoint=endpoint,
-            credential=DefaultAzureCredential()
+            credential=get_credential()
         )
         logging.info(
             f"✅ Successfully connected to Azure AI Project at: {endpoint}")
@@ -0,0 +1,217 @@
+"""
+Measure scenario start-up cost: module import time and time-to-prompt.
+
+For each scenario, `python -X importtime -c "import main"` is run --runs times in
+the scenario directory, and the cumulative import time of `main` plus the slowest
+imported modules are reported. Then `main.py` is started and the time until each
+start-up milestone is printed (configuration loaded, project connected, session
+menu shown); the run is stopped at the menu. Reaching the menu needs a working
+.env and credentials, otherwise the milestones reached before the failure are shown.
+
+Results can be saved with --save and compared against a saved baseline with
+--baseline; the exit status is 1 when a median exceeds the baseline by more than
+--max-regression.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--scenario 3] [--runs 5] [--no-prompt]
+        [--save startup.json] [--baseline startup.json --max-regression 0.2]
+"""
+
+import argparse
+import json
+import os
+import queue
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("2", "3", "4")
+
+# (name, text printed by main.py when the milestone is reached)
+MILESTONES = (
+    ("configuration", "Configuration loaded"),
+    ("connected", "Connected to Azure AI Project"),
+    ("prompt", "Select session type"),
+)
+
+TOP_MODULES = 8
+
+
+def scenario_dir(scenario):
+    return os.path.join(ROOT, f"scenario_{scenario}")
+
+
+def parse_importtime(stderr):
+    """
+    Return [(module, self_us, cumulative_us)] for `main` and everything it imported.
+
+    -X importtime prints the import tree children-first, so main's imports are the
+    nested entries just above it; interpreter start-up (site, .pth files) is skipped.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.rstrip()[1:], int(self_us), int(cumulative_us)))
+
+    modules = []
+    for name, self_us, cumulative_us in reversed(entries):
+        if modules and not name.startswith(" "):
+            break
+        if modules or name == "main":
+            modules.append((name.strip(), self_us, cumulative_us))
+    return modules
+
+
+def measure_imports(scenario, runs):
+    """Time `import main` in fresh interpreters; return per-run ms and the last run's modules."""
+    totals = []
+    modules = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main"],
+            cwd=scenario_dir(scenario), capture_output=True, text=True)
+        modules = parse_importtime(result.stderr)
+        main_entry = [cumulative for name, _, cumulative in modules if name == "main"]
+        if result.returncode != 0 or not main_entry:
+            print(f"❌ import main failed in scenario {scenario}:\n{result.stderr[-2000:]}")
+            return [], []
+        totals.append(main_entry[-1] / 1000)
+    return totals, modules
+
+
+def measure_prompt(scenario, timeout):
+    """
+    Start main.py and return {milestone: seconds} for the milestones reached.
+
+    Also returns the last output line, which explains where start-up stopped.
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-u", "main.py"], cwd=scenario_dir(scenario),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, encoding="utf-8", errors="replace")
+    lines = queue.Queue()
+
+    def read_output():
+        for line in process.stdout:
+            lines.put((time.perf_counter() - started, line.rstrip()))
+        lines.put(None)
+
+    threading.Thread(target=read_output, daemon=True).start()
+
+    reached = {}
+    last_line = ""
+    pending = list(MILESTONES)
+    deadline = started + timeout
+    try:
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                last_line = f"(timed out after {timeout:.0f}s) {last_line}"
+                break
+            try:
+                entry = lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if entry is None:
+                break
+            elapsed, line = entry
+            if line.strip():
+                last_line = line.strip()
+                reached.setdefault("first_output", elapsed)
+            for name, marker in list(pending):
+                if marker in line:
+                    reached[name] = elapsed
+                    pending.remove((name, marker))
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+    return reached, last_line
+
+
+def benchmark_scenario(scenario, runs, prompt_runs, timeout):
+    print(f"\n🏁 Scenario {scenario}")
+    import_ms, modules = measure_imports(scenario, runs)
+    result = {"import_ms": import_ms, "prompt_s": []}
+    if import_ms:
+        print(f"📦 import main: median {statistics.median(import_ms):7.1f} ms   "
+              f"min {min(import_ms):7.1f} ms   ({len(import_ms)} runs)")
+        slowest = sorted((m for m in modules if m[0] != "main"), key=lambda m: m[2], reverse=True)
+        for name, self_us, cumulative_us in slowest[:TOP_MODULES]:
+            print(f"   {cumulative_us / 1000:7.1f} ms  (self {self_us / 1000:5.1f} ms)  {name}")
+
+    for _ in range(prompt_runs):
+        reached, last_line = measure_prompt(scenario, timeout)
+        milestones = "   ".join(
+            f"{name} {reached[name]:.2f}s" for name in ("first_output", *dict(MILESTONES))
+            if name in reached)
+        print(f"⏱️ {milestones or 'no output'}")
+        if "prompt" in reached:
+            result["prompt_s"].append(reached["prompt"])
+        else:
+            print(f"⚠️ Menu not reached; last output: {last_line}")
+    return result
+
+
+def median_or_none(values):
+    return statistics.median(values) if values else None
+
+
+def compare(results, baseline, max_regression):
+    """Print medians against the baseline; return False if any regressed beyond the limit."""
+    ok = True
+    print("\n📊 Against baseline")
+    for scenario, result in results.items():
+        for metric, unit in (("import_ms", "ms"), ("prompt_s", "s")):
+            current = median_or_none(result[metric])
+            previous = median_or_none(baseline.get(scenario, {}).get(metric, []))
+            if current is None or previous is None:
+                continue
+            change = (current - previous) / previous if previous else 0.0
+            regressed = change > max_regression
+            ok = ok and not regressed
+            print(f"{'❌' if regressed else '✅'} scenario {scenario} {metric}: "
+                  f"{previous:.2f} → {current:.2f} {unit} ({change:+.0%})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="Scenario to measure (repeatable; default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="Import-time runs per scenario")
+    parser.add_argument("--prompt-runs", type=int, default=1, help="Time-to-prompt runs per scenario")
+    parser.add_argument("--no-prompt", action="store_true", help="Only measure import time")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for the menu")
+    parser.add_argument("--save", metavar="PATH", help="Write the results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against saved results")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline (default: 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    prompt_runs = 0 if args.no_prompt else args.prompt_runs
+    results = {
+        scenario: benchmark_scenario(scenario, args.runs, prompt_runs, args.timeout)
+        for scenario in args.scenario or SCENARIOS
+    }
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as results_file:
+            json.dump(results, results_file, indent=2)
+        print(f"\n💾 Results saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if not compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Measure end-to-end conversation throughput of the conversation managers over HTTP.
+
+Runs --conversations conversations of --turns turns each (create thread, send a
+message, run the agent, read the reply) with --concurrency in flight, through the
+real SDK pipeline, and reports turns per second and turn latency percentiles. By
+default a local Agents API stand-in (core.agents_api_server) is started in-process,
+shaped by the FAKE_* variables (latency, run time, injected 429s); --endpoint
+targets an already running server or a real project instead.
+
+Usage:
+    python benchmarks/throughput_benchmark.py [--scenario 3] [--conversations 50]
+        [--concurrency 8] [--turns 2] [--async] [--endpoint URL] [--save results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("2", "3", "4")
+QUESTION = "What can you tell me about this?"
+
+
+def load_scenario(scenario):
+    """Make a scenario's core package importable, keeping its local state out of the tree."""
+    sys.path.insert(0, os.path.join(ROOT, f"scenario_{scenario}"))
+    state_dir = tempfile.mkdtemp(prefix="throughput-")
+    os.environ.setdefault("RESOURCE_MANIFEST_DIR", os.path.join(state_dir, "manifests"))
+    os.environ.setdefault("USAGE_LEDGER", os.path.join(state_dir, "usage_ledger.jsonl"))
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from core.log_config import setup_logging
+    setup_logging()
+
+
+def percentile(values, fraction):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(fraction * 100) - 1]
+
+
+def run_sync(endpoint, model, conversations, concurrency, turns):
+    """Run the conversations on a thread pool with core.conversation_manager."""
+    from core.azure_client import connect_to_project
+    from core.conversation_manager import create_thread, send_user_message, run_agent
+    from core.message_reader import DEFAULT_READER
+
+    project = connect_to_project(endpoint)
+    agent = project.agents.create_agent(
+        model=model, name="throughput-benchmark", instructions="Answer briefly.")
+
+    def conversation(index):
+        latencies = []
+        thread = create_thread(project)
+        for turn in range(turns):
+            started = time.perf_counter()
+            send_user_message(project, thread, f"{QUESTION} ({index}.{turn})")
+            run = run_agent(project, thread, agent)
+            DEFAULT_READER.run_messages(project, thread.id, run)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(conversation, index) for index in range(conversations)]
+            return [future.result() if not future.exception() else future.exception()
+                    for future in futures]
+    finally:
+        project.agents.delete_agent(agent.id)
+
+
+def run_async(endpoint, model, conversations, concurrency, turns):
+    """Run the conversations as asyncio tasks with core.async_conversation_manager."""
+    from core.azure_client import get_async_project, close_async_projects
+    from core.async_conversation_manager import create_thread, send_user_message, run_agent
+    from core.message_reader import DEFAULT_READER
+
+    async def main():
+        project = get_async_project(endpoint)
+        agent = await project.agents.create_agent(
+            model=model, name="throughput-benchmark", instructions="Answer briefly.")
+        slots = asyncio.Semaphore(concurrency)
+
+        async def conversation(index):
+            async with slots:
+                latencies = []
+                thread = await create_thread(project)
+                for turn in range(turns):
+                    started = time.perf_counter()
+                    await send_user_message(project, thread, f"{QUESTION} ({index}.{turn})")
+                    run = await run_agent(project, thread, agent)
+                    await DEFAULT_READER.run_messages_async(project, thread.id, run)
+                    latencies.append(time.perf_counter() - started)
+                return latencies
+
+        try:
+            return await asyncio.gather(*(conversation(index) for index in range(conversations)),
+                                        return_exceptions=True)
+        finally:
+            await project.agents.delete_agent(agent.id)
+            await close_async_projects()
+
+    return asyncio.run(main())
+
+
+def report(results, elapsed, server=None):
+    latencies = [latency for result in results if isinstance(result, list) for latency in result]
+    errors = [result for result in results if isinstance(result, BaseException)]
+    summary = {
+        "turns": len(latencies),
+        "failed_conversations": len(errors),
+        "elapsed_s": elapsed,
+        "turns_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_s": percentile(latencies, 0.50),
+        "p95_s": percentile(latencies, 0.95),
+        "max_s": max(latencies, default=0.0),
+    }
+
+    print(f"\n🏁 {summary['turns']} turns in {elapsed:.2f}s — {summary['turns_per_s']:.1f} turns/s")
+    print(f"⏱️ Turn latency: p50 {summary['p50_s']:.3f}s   p95 {summary['p95_s']:.3f}s   "
+          f"max {summary['max_s']:.3f}s")
+    if server is not None:
+        summary.update(server.counters)
+        print(f"🌐 Server: {server.counters['requests']} requests "
+              f"({server.counters['requests'] / elapsed:.0f}/s), "
+              f"{server.counters['injected_errors']} injected errors")
+    if errors:
+        print(f"❌ {len(errors)} conversations failed, e.g.: {errors[0]}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, default="3",
+                        help="Scenario whose core package is measured (default: 3)")
+    parser.add_argument("--endpoint", help="Project endpoint (default: start a local Agents API server)")
+    parser.add_argument("--model", default=os.getenv("MODEL_DEPLOYMENT_NAME", "gpt-4o"),
+                        help="Model deployment for the benchmark agent")
+    parser.add_argument("--conversations", type=int, default=50, help="Conversations to run")
+    parser.add_argument("--concurrency", type=int, default=8, help="Conversations in flight")
+    parser.add_argument("--turns", type=int, default=2, help="Turns per conversation")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Use the async conversation manager (needs the async extra)")
+    parser.add_argument("--save", metavar="PATH", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    load_scenario(args.scenario)
+
+    server = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        from core.agents_api_server import start_server
+        server = start_server()
+        endpoint = server.endpoint
+
+    mode = "async" if args.use_async else "threads"
+    print(f"🚀 {args.conversations} conversations x {args.turns} turns, concurrency "
+          f"{args.concurrency} ({mode}) against {endpoint}")
+    runner = run_async if args.use_async else run_sync
+    started = time.perf_counter()
+    try:
+        results = runner(endpoint, args.model, args.conversations, args.concurrency, args.turns)
+        summary = report(results, time.perf_counter() - started, server)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as results_file:
+            json.dump({"scenario": args.scenario, "mode": mode, **vars(args), **summary},
+                      results_file, indent=2, default=str)
+        print(f"\n💾 Results saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
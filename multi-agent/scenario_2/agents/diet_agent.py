@@ -1,9 +1,15 @@
 import logging
-from azure.ai.agents.models import ConnectedAgentTool
+from core.agent_registry import DEFAULT_REGISTRY
+from core.tracing import traced, set_attributes
 
+logger = logging.getLogger(__name__)
 
+
+@traced()
 def create_diet_agent(project, model_name):
     """Create the DietAgent specialized for meal planning and nutrition advice."""
+    from azure.ai.agents.models import ConnectedAgentTool
+
     agent_name = "diet_agent"
     agent_description = "Specialized nutrition and meal planning expert"
     agent_instructions = """
@@ -31,19 +37,19 @@ def create_diet_agent(project, model_name):
     Always provide practical, evidence-based nutrition advice and create realistic meal plans that fit the user's lifestyle and goals.
     """
 
-    # logging.info(f"🥗 Creating diet agent ({agent_name})...")
-    print(f"🥗 Creating diet agent ({agent_name})...")
+    logger.info("🥗 Creating diet agent (%s)...", agent_name)
 
     try:
-        agent = project.agents.create_agent(
+        agent = DEFAULT_REGISTRY.get_or_create_agent(
+            project,
             model=model_name,
             name=agent_name,
             description=agent_description,
             instructions=agent_instructions,
         )
 
-        # logging.info(f"✅ {agent_name} created: {agent.id}")
-        print(f"✅ {agent_name} created: {agent.id}")
+        set_attributes(agent_name=agent_name, agent_id=agent.id)
+        logger.info("✅ %s ready: %s", agent_name, agent.id)
 
         connected_tool = ConnectedAgentTool(
             id=agent.id,
@@ -51,11 +57,9 @@ def create_diet_agent(project, model_name):
             description="Provides personalized nutrition advice, meal plans, and dietary guidance"
         )
 
-        # logging.info(f"✅ {agent_name} connected to tools.")
-        print(f"✅ {agent_name} connected to tools.")
+        logger.info("✅ %s connected to tools.", agent_name)
         return agent, connected_tool
 
     except Exception as e:
-        # logging.error(f"❌ Failed to create diet agent ({agent_name}): {e}")
-        print(f"❌ Failed to create diet agent ({agent_name}): {e}")
+        logger.error("❌ Failed to create diet agent (%s): %s", agent_name, e)
         raise
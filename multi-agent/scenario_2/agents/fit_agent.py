@@ -1,6 +1,11 @@
 import logging
+from core.agent_registry import DEFAULT_REGISTRY
+from core.tracing import traced, set_attributes
 
+logger = logging.getLogger(__name__)
 
+
+@traced()
 def create_fit_agent(project, model_name, diet_tool, workout_tool):
     """Create the main FitAgent that coordinates with specialized sub-agents."""
     agent_name = "fit_agent"
@@ -35,14 +40,14 @@ def create_fit_agent(project, model_name, diet_tool, workout_tool):
     Remember: You're the main point of contact for users. Make them feel supported on their wellness journey while leveraging your specialized sub-agents for expert advice.
     """
 
-    # logging.info(f"🏋️ Creating main fit agent ({agent_name})...")
-    print(f"🏋️ Creating main fit agent ({agent_name})...")
+    logger.info("🏋️ Creating main fit agent (%s)...", agent_name)
 
     try:
         # Combine tools from both sub-agents
         all_tools = diet_tool.definitions + workout_tool.definitions
 
-        agent = project.agents.create_agent(
+        agent = DEFAULT_REGISTRY.get_or_create_agent(
+            project,
             model=model_name,
             name=agent_name,
             description=agent_description,
@@ -50,11 +55,10 @@ def create_fit_agent(project, model_name, diet_tool, workout_tool):
             tools=all_tools,
         )
 
-        # logging.info(f"✅ {agent_name} created: {agent.id}")
-        print(f"✅ {agent_name} created: {agent.id}")
+        set_attributes(agent_name=agent_name, agent_id=agent.id)
+        logger.info("✅ %s ready: %s", agent_name, agent.id)
         return agent
 
     except Exception as e:
-        # logging.error(f"❌ Failed to create main fit agent ({agent_name}): {e}")
-        print(f"❌ Failed to create main fit agent ({agent_name}): {e}")
+        logger.error("❌ Failed to create main fit agent (%s): %s", agent_name, e)
         raise
@@ -1,9 +1,15 @@
 import logging
-from azure.ai.agents.models import ConnectedAgentTool
+from core.agent_registry import DEFAULT_REGISTRY
+from core.tracing import traced, set_attributes
 
+logger = logging.getLogger(__name__)
 
+
+@traced()
 def create_workout_agent(project, model_name):
     """Create the WorkoutAgent specialized for fitness training and exercise planning."""
+    from azure.ai.agents.models import ConnectedAgentTool
+
     agent_name = "workout_agent"
     agent_description = "Specialized fitness trainer and workout planning expert"
     agent_instructions = """
@@ -43,19 +49,19 @@ def create_workout_agent(project, model_name):
     Always consider the user's fitness level, available time, equipment access, and any physical limitations when creating workout plans.
     """
 
-    # logging.info(f"💪 Creating workout agent ({agent_name})...")
-    print(f"💪 Creating workout agent ({agent_name})...")
+    logger.info("💪 Creating workout agent (%s)...", agent_name)
 
     try:
-        agent = project.agents.create_agent(
+        agent = DEFAULT_REGISTRY.get_or_create_agent(
+            project,
             model=model_name,
             name=agent_name,
             description=agent_description,
             instructions=agent_instructions,
         )
 
-        # logging.info(f"✅ {agent_name} created: {agent.id}")
-        print(f"✅ {agent_name} created: {agent.id}")
+        set_attributes(agent_name=agent_name, agent_id=agent.id)
+        logger.info("✅ %s ready: %s", agent_name, agent.id)
 
         connected_tool = ConnectedAgentTool(
             id=agent.id,
@@ -63,11 +69,9 @@ def create_workout_agent(project, model_name):
             description="Provides personalized workout plans, exercise routines, and fitness guidance"
         )
 
-        # logging.info(f"✅ {agent_name} connected to tools.")
-        print(f"✅ {agent_name} connected to tools.")
+        logger.info("✅ %s connected to tools.", agent_name)
         return agent, connected_tool
 
     except Exception as e:
-        # logging.error(f"❌ Failed to create workout agent ({agent_name}): {e}")
-        print(f"❌ Failed to create workout agent ({agent_name}): {e}")
+        logger.error("❌ Failed to create workout agent (%s): %s", agent_name, e)
         raise
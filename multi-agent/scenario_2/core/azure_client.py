@@ -1,24 +1,119 @@
 import logging
-from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+import os
+from core.credentials import get_credential, get_async_credential, close_async_credential, prefetch_token
+from core.fake_project import is_fake_endpoint
+from core.tracing import traced
 
+logger = logging.getLogger(__name__)
 
+
+# One credential (see core.credentials) and one client per endpoint for the whole
+# process, so every caller shares a single token cache and connection pool.
+_projects = {}
+_async_projects = {}
+
+# Plain-HTTP endpoints are local stand-ins (see core.agents_api_server)
+LOCAL_ENDPOINT_SCHEME = "http://"
+
+
+def _client_options(endpoint, get_credential):
+    """
+    Credential keyword arguments for a project client.
+
+    The SDK's token policy refuses to send tokens without TLS, so an http:// endpoint
+    gets a static bearer token (LOCAL_API_TOKEN) instead of an Azure credential.
+    """
+    if not endpoint.startswith(LOCAL_ENDPOINT_SCHEME):
+        return {"credential": get_credential()}
+
+    from azure.core.credentials import AzureKeyCredential
+    from azure.core.pipeline.policies import AzureKeyCredentialPolicy
+
+    token = AzureKeyCredential(os.getenv("LOCAL_API_TOKEN", "local"))
+    return {"credential": token,
+            "authentication_policy": AzureKeyCredentialPolicy(token, "Authorization", prefix="Bearer")}
+
+
+def project_endpoint(project):
+    """
+    Return the endpoint a project client was connected to, or None if it is unknown.
+
+    Shared clients are looked up by identity; other clients fall back to their configuration.
+    """
+    for endpoint, client in (*_projects.items(), *_async_projects.items()):
+        if client is project:
+            return endpoint
+    config = getattr(project, "_config", None)
+    return getattr(project, "endpoint", None) or getattr(config, "endpoint", None)
+
+
+@traced()
 def connect_to_project(endpoint):
-    """Establish connection to Azure AI Project."""
-    # logging.info("🔗 Connecting to Azure AI Project...")
-    print("🔗 Connecting to Azure AI Project...")
+    """
+    Return the shared Azure AI Project client for an endpoint (credential from AZURE_CREDENTIAL_TYPE).
+
+    A fake:// endpoint (or FAKE_PROJECT=true) returns the in-process fake from core.fake_project;
+    an http:// endpoint (core.agents_api_server) is called with a static local token.
+    """
+    client = _projects.get(endpoint)
+    if client is not None:
+        return client
+
+    if is_fake_endpoint(endpoint):
+        from core.fake_project import FakeProjectClient
+
+        client = _projects[endpoint] = FakeProjectClient(endpoint)
+        return client
+
+    logger.info("🔗 Connecting to Azure AI Project...")
 
     try:
+        # The SDK is imported on first connect; the token is fetched meanwhile
+        if not endpoint.startswith(LOCAL_ENDPOINT_SCHEME):
+            prefetch_token()
+        from azure.ai.projects import AIProjectClient
+
         client = AIProjectClient(
             endpoint=endpoint,
-            credential=DefaultAzureCredential()
+            **_client_options(endpoint, get_credential)
         )
-        # logging.info(f"✅ Connected to Azure AI Project at: {endpoint}")
-        print(f"✅ Connected to Azure AI Project at: {endpoint}")
+        _projects[endpoint] = client
+        logger.info("✅ Connected to Azure AI Project at: %s", endpoint)
         return client
 
     except Exception as e:
-        # logging.error(
-        #     f"❌ Failed to connect to Azure AI Project at {endpoint}: {e}")
-        print(f"❌ Failed to connect to Azure AI Project at {endpoint}: {e}")
+        logger.error("❌ Failed to connect to Azure AI Project at %s: %s", endpoint, e)
         raise
+
+
+def get_async_project(endpoint):
+    """Return the shared async Azure AI Project client for an endpoint (requires aiohttp)."""
+    client = _async_projects.get(endpoint)
+    if client is not None:
+        return client
+
+    logger.info("🔗 Connecting to Azure AI Project (async)...")
+
+    try:
+        from azure.ai.projects.aio import AIProjectClient as AsyncAIProjectClient
+
+        client = AsyncAIProjectClient(
+            endpoint=endpoint,
+            **_client_options(endpoint, get_async_credential)
+        )
+        _async_projects[endpoint] = client
+        logger.info("✅ Connected to Azure AI Project at: %s", endpoint)
+        return client
+
+    except Exception as e:
+        logger.error("❌ Failed to connect to Azure AI Project at %s: %s", endpoint, e)
+        raise
+
+
+async def close_async_projects():
+    """Close every shared async client and the shared async credential."""
+    for client in _async_projects.values():
+        await client.close()
+    _async_projects.clear()
+
+    await close_async_credential()
@@ -1,21 +1,22 @@
 import logging
+from core.agent_registry import DEFAULT_REGISTRY
+from core.resource_manifest import DEFAULT_MANIFEST
+
+logger = logging.getLogger(__name__)
 
 
 def delete_agents(project, *agents):
     """Clean up agents after execution (optional)."""
-    # logging.info("🗑️ Starting agent cleanup process...")
-    print("🗑️ Starting agent cleanup process...")
+    logger.info("🗑️ Starting agent cleanup process...")
 
     for agent in agents:
         try:
-            # logging.info(f"🗑️ Deleting agent: {agent.name}")
-            print(f"🗑️ Deleting agent: {agent.name}")
+            logger.info("🗑️ Deleting agent: %s", agent.name)
             project.agents.delete_agent(agent.id)
-            # logging.info(f"✅ Deleted agent: {agent.name}")
-            print(f"✅ Deleted agent: {agent.name}")
+            DEFAULT_REGISTRY.forget(agent.id)
+            DEFAULT_MANIFEST.forget(agent.id)
+            logger.info("✅ Deleted agent: %s", agent.name)
         except Exception as e:
-            # logging.error(f"❌ Failed to delete agent {agent.name}: {e}")
-            print(f"❌ Failed to delete agent {agent.name}: {e}")
 
-    # logging.info("✅ Agent cleanup process completed.")
-    print("✅ Agent cleanup process completed.")
+            logger.error("❌ Failed to delete agent %s: %s", agent.name, e)
+    logger.info("✅ Agent cleanup process completed.")
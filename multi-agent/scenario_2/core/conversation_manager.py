@@ -1,31 +1,40 @@
-import time
 import logging
-from azure.ai.agents.models import MessageRole, ListSortOrder
+import time
+from core.log_config import flush_logs
+from core.message_reader import DEFAULT_READER
+from core.resource_manifest import DEFAULT_MANIFEST
+from core.polling import wait_for_run, cancel_run
+from core.run_profiler import should_profile, record_run_profile
+from core.tracing import traced, set_attributes
+from core.usage_ledger import DEFAULT_LEDGER
+
+logger = logging.getLogger(__name__)
 
 
+@traced()
 def create_thread(project):
     """Create a conversation thread for the fitness advisor session."""
-    # logging.info("🧵 Creating conversation thread...")
-    print("\n🧵 Creating conversation thread...")
+    logger.info("🧵 Creating conversation thread...")
 
     try:
         thread = project.agents.threads.create()
-        # logging.info(f"✅ Thread created: {thread.id}")
-        print(f"✅ Thread created: {thread.id}")
+        DEFAULT_MANIFEST.record("threads", thread.id)
+        set_attributes(thread_id=thread.id)
+        logger.info("✅ Thread created: %s", thread.id)
         return thread
 
     except Exception as e:
-        # logging.error(f"❌ Failed to create conversation thread: {e}")
-        print(f"❌ Failed to create conversation thread: {e}")
+        logger.error("❌ Failed to create conversation thread: %s", e)
         raise
 
 
+@traced()
 def send_user_message(project, thread, content):
     """Send a user message to the conversation thread."""
-    # logging.info(f"💬 User message: {content}")
-    print(f"\n💬 User message: {content}")
-    # logging.info("📨 Sending user message to fitness advisor...")
-    print("📨 Sending user message to fitness advisor...")
+    from azure.ai.agents.models import MessageRole
+
+    logger.info("💬 User message: %s", content)
+    logger.info("📨 Sending user message to fitness advisor...")
 
     try:
         message = project.agents.messages.create(
@@ -33,81 +42,139 @@ def send_user_message(project, thread, content):
             role=MessageRole.USER,
             content=content
         )
-        # logging.info(f"✅ Message sent: {message.id}")
-        print(f"✅ Message sent: {message.id}")
+        set_attributes(thread_id=thread.id, message_id=message.id)
+        DEFAULT_LEDGER.note_prompt(thread.id, content)
+        logger.info("✅ Message sent: %s", message.id)
         return message
 
     except Exception as e:
-        # logging.error(f"❌ Failed to send user message: {e}")
-        print(f"❌ Failed to send user message: {e}")
+        logger.error("❌ Failed to send user message: %s", e)
         raise
 
 
-def run_agent(project, thread, agent, poll_interval=2, timeout=60):
-    """Execute the agent run and poll for completion."""
-    # logging.info("🏃 Starting fitness advisor run...")
-    print("🏃 Starting fitness advisor run...")
+@traced()
+def run_agent(project, thread, agent, polling=None, timeout=60, profile=None):
+    """Execute the agent run and poll for completion with the given polling strategy."""
+    logger.info("🏃 Starting fitness advisor run...")
 
     try:
+        started = time.perf_counter()
         run = project.agents.runs.create(
             thread_id=thread.id,
             agent_id=agent.id
         )
-        # logging.info(f"🔄 Run initiated: {run.id} — Status: {run.status}")
-        print(f"🔄 Run initiated: {run.id} — Status: {run.status}")
+        logger.info("🔄 Run initiated: %s — Status: %s", run.id, run.status)
+        set_attributes(thread_id=thread.id, agent_id=agent.id, run_id=run.id)
+
+        # Poll for completion (adaptive backoff unless a strategy is given)
+        try:
+            run = wait_for_run(
+                project, thread.id, run,
+                agent_id=agent.id,
+                polling=polling,
+                timeout=timeout,
+                on_status=lambda r: logger.debug("📡 Run status: %s", r.status)
+            )
+        except (TimeoutError, KeyboardInterrupt):
+            # Don't leave the run executing (and holding the thread) server-side
+            cancel_agent_run(project, thread, run)
+            raise
+
+        duration = time.perf_counter() - started
+        # Final status
+        report_run_outcome(run)
+        set_attributes(run_id=run.id, run_status=run.status)
+        steps = record_run_profile(project, thread.id, run) if should_profile(profile) else None
+        DEFAULT_LEDGER.record_run(project, thread.id, run, steps=steps, duration=duration)
+
+        return run
+
+    except Exception as e:
+        logger.error("💥 Failed to run fitness advisor: %s", e)
+        raise
+
 
-        # Poll for completion
-        start_time = time.time()
-        while run.status in ["queued", "in_progress"]:
-            if time.time() - start_time > timeout:
-                raise TimeoutError(
-                    "⏰ Run timed out while waiting for completion.")
+@traced()
+def stream_agent(project, thread, agent, profile=None):
+    """Execute the agent run and print the reply as it streams in (no polling or re-listing)."""
+    from core.streaming import ConsoleStreamHandler
 
-            time.sleep(poll_interval)
-            run = project.agents.runs.get(thread_id=thread.id, run_id=run.id)
-            # logging.info(f"📡 Run status: {run.status}")
-            print(f"📡 Run status: {run.status}")
+    logger.info("🏃 Starting fitness advisor run (streaming)...")
 
+    try:
+        started = time.perf_counter()
+        handler = ConsoleStreamHandler()
+        try:
+            with project.agents.runs.stream(
+                thread_id=thread.id,
+                agent_id=agent.id,
+                event_handler=handler
+            ) as stream:
+                stream.until_done()
+        except KeyboardInterrupt:
+            if handler.run is not None:
+                cancel_agent_run(project, thread, handler.run)
+            raise
+
+        run = handler.run
+        if run is None:
+            raise RuntimeError("Stream ended before any run event was received.")
+
+        duration = time.perf_counter() - started
         # Final status
-        if run.status == "failed":
-            # logging.error(f"❌ Run failed: {run.last_error}")
-            print(f"❌ Run failed: {run.last_error}")
-        else:
-            # logging.info(f"✅ Run completed with status: {run.status}")
-            print(f"✅ Run completed with status: {run.status}")
+        report_run_outcome(run)
+        set_attributes(run_id=run.id, run_status=run.status)
+        steps = record_run_profile(project, thread.id, run) if should_profile(profile) else None
+        DEFAULT_LEDGER.record_run(project, thread.id, run, steps=steps, duration=duration)
 
         return run
 
     except Exception as e:
-        # logging.error(f"💥 Failed to run fitness advisor: {e}", exc_info=True)
-        print(f"💥 Failed to run fitness advisor: {e}")
+        logger.error("💥 Failed to stream fitness advisor: %s", e)
         raise
 
 
+def cancel_agent_run(project, thread, run):
+    """Cancel a run server-side so it stops consuming tokens and frees the thread."""
+    logger.info("🛑 Cancelling run %s...", run.id)
+
+    try:
+        run = cancel_run(project, thread.id, run.id)
+        logger.info("✅ Run %s is now %s", run.id, run.status)
+    except Exception as e:
+        logger.error("❌ Failed to cancel run %s: %s", run.id, e)
+
+    return run
+
+
 def display_agent_responses(project, thread, run):
     """Fetch and display agent responses from the conversation thread."""
-    # logging.info("📥 Fetching messages from thread...")
-    print("📥 Fetching messages from thread...")
+    logger.info("📥 Fetching messages from thread...")
 
     try:
-        messages = project.agents.messages.list(
-            thread_id=thread.id,
-            order=ListSortOrder.ASCENDING
-        )
-
-        for msg in messages:
-            if msg.run_id == run.id and msg.text_messages:
-                try:
-                    last_message = msg.text_messages[-1].text.value
-                    # logging.info(
-                    #     f"\n🧠 {msg.role.capitalize()}: {last_message}")
-                    print(f"\n🧠 {msg.role.capitalize()}: {last_message}")
-                except (IndexError, AttributeError) as inner_e:
-                    # logging.warning(
-                    #     f"⚠️ Skipped a malformed message: {inner_e}")
-                    print(f"⚠️ Skipped a malformed message: {inner_e}")
+        messages = DEFAULT_READER.run_messages(project, thread.id, run)
+        print_run_messages(messages, run)
 
     except Exception as e:
-        # logging.error(f"❌ Failed to fetch/display agent responses: {e}")
-        print(f"❌ Failed to fetch/display agent responses: {e}")
+        logger.error("❌ Failed to fetch/display agent responses: %s", e)
         raise
+
+
+def report_run_outcome(run):
+    """Print the final status of a run."""
+    if run.status == "failed":
+        logger.error("❌ Run failed: %s", run.last_error)
+    else:
+        logger.info("✅ Run completed with status: %s", run.status)
+
+
+def print_run_messages(messages, run):
+    """Print the text of every message produced by a specific run."""
+    flush_logs()
+    for msg in messages:
+        if msg.run_id == run.id and msg.text_messages:
+            try:
+                last_message = msg.text_messages[-1].text.value
+                print(f"\n🧠 {msg.role.capitalize()}: {last_message}")
+            except (IndexError, AttributeError) as inner_e:
+                print(f"⚠️ Skipped a malformed message: {inner_e}")
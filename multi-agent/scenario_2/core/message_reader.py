@@ -0,0 +1,125 @@
+import threading
+
+DEFAULT_PAGE_SIZE = 20
+
+
+class _RunMessageCollector:
+    """Consumes a newest-first message listing and decides when to stop reading."""
+
+    def __init__(self, run, last_seen_id):
+        self.run = run
+        self.last_seen_id = last_seen_id
+        self.newest_id = None
+        self.messages = []
+
+    def add(self, msg):
+        """Record a message; return False once no older message can belong to the run."""
+        if self.newest_id is None:
+            self.newest_id = msg.id
+
+        if msg.id == self.last_seen_id:
+            return False
+
+        if msg.run_id == self.run.id:
+            self.messages.append(msg)
+            return True
+
+        # Anything older than the run's first message cannot belong to the run.
+        if self.messages or _created_before_run(msg, self.run):
+            return False
+
+        return True
+
+
+def _created_before_run(msg, run):
+    msg_created = getattr(msg, "created_at", None)
+    run_created = getattr(run, "created_at", None)
+    return msg_created is not None and run_created is not None and msg_created < run_created
+
+
+class MessageReader:
+    """
+    Incremental reader returning only the messages a run added to a thread.
+
+    The thread is listed newest-first in small pages (the SDK pages lazily with an
+    `after` cursor), and listing stops at the last message already read on that thread
+    or as soon as it passes the run's first message. Each turn therefore costs
+    O(new messages) instead of O(thread length).
+
+    Args:
+        page_size (int, optional): Messages requested per page. Defaults to 20.
+    """
+
+    def __init__(self, page_size=DEFAULT_PAGE_SIZE):
+        self.page_size = page_size
+        self._last_seen = {}
+        self._lock = threading.Lock()
+
+    def run_messages(self, project, thread_id, run):
+        """
+        Fetch the messages produced by a run.
+
+        Args:
+            project: Azure AI Project client
+            thread_id: ID of the conversation thread
+            run: Run object whose messages should be returned
+
+        Returns:
+            list: Messages of the run, oldest first
+        """
+        from azure.ai.agents.models import ListSortOrder
+
+        collector = self._collector(thread_id, run)
+        for msg in project.agents.messages.list(
+            thread_id=thread_id,
+            order=ListSortOrder.DESCENDING,
+            limit=self.page_size
+        ):
+            if not collector.add(msg):
+                break
+
+        return self._finish(thread_id, collector)
+
+    async def run_messages_async(self, project, thread_id, run):
+        """
+        Async counterpart of run_messages for the azure.ai.projects.aio client.
+
+        Args:
+            project: Async Azure AI Project client
+            thread_id: ID of the conversation thread
+            run: Run object whose messages should be returned
+
+        Returns:
+            list: Messages of the run, oldest first
+        """
+        from azure.ai.agents.models import ListSortOrder
+
+        collector = self._collector(thread_id, run)
+        async for msg in project.agents.messages.list(
+            thread_id=thread_id,
+            order=ListSortOrder.DESCENDING,
+            limit=self.page_size
+        ):
+            if not collector.add(msg):
+                break
+
+        return self._finish(thread_id, collector)
+
+    def forget(self, thread_id):
+        """Drop the read cursor of a thread (e.g. after the thread is deleted)."""
+        with self._lock:
+            self._last_seen.pop(thread_id, None)
+
+    def _collector(self, thread_id, run):
+        with self._lock:
+            return _RunMessageCollector(run, self._last_seen.get(thread_id))
+
+    def _finish(self, thread_id, collector):
+        if collector.newest_id is not None:
+            with self._lock:
+                self._last_seen[thread_id] = collector.newest_id
+        return list(reversed(collector.messages))
+
+
+# Shared by every conversation in the process so cursors persist across turns.
+DEFAULT_READER = MessageReader()
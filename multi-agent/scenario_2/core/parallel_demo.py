@@ -0,0 +1,140 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from core.conversation_manager import create_thread, send_user_message, run_agent
+from core.log_config import flush_logs
+from core.message_reader import DEFAULT_READER
+from core.tracing import traced, bind
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+@dataclass
+class DemoResult:
+    """Outcome of one demo question asked on its own thread."""
+    question: str
+    thread_id: str = None
+    status: str = None
+    responses: list = field(default_factory=list)
+    elapsed: float = 0.0
+    error: str = None
+
+
+@traced()
+def ask_on_new_thread(project, agent, question, timeout=60):
+    """
+    Ask a single question on a fresh thread and collect the reply without printing.
+
+    The run goes through core.conversation_manager.run_agent, so it is polled,
+    cancelled on timeout and recorded in the usage ledger like any other turn.
+
+    Args:
+        project: Azure AI Project client
+        agent: AI agent to run
+        question: User message content
+        timeout (int, optional): Max time (in seconds) to wait for the run. Defaults to 60.
+
+    Returns:
+        DemoResult: Replies, final run status and wall time (errors are captured, not raised)
+    """
+    result = DemoResult(question=question)
+    start_time = time.perf_counter()
+
+    try:
+        thread = create_thread(project)
+        result.thread_id = thread.id
+        send_user_message(project, thread, question)
+        run = run_agent(project, thread, agent, timeout=timeout)
+        result.status = getattr(run.status, "value", run.status)
+
+        for msg in DEFAULT_READER.run_messages(project, thread.id, run):
+            if msg.text_messages:
+                result.responses.append(
+                    (msg.role, msg.text_messages[-1].text.value))
+
+        if run.status == "failed":
+            result.error = str(run.last_error)
+
+    except Exception as e:
+        result.error = str(e)
+
+    result.elapsed = time.perf_counter() - start_time
+    return result
+
+
+def demo_max_concurrency():
+    """Return DEMO_MAX_CONCURRENCY, or the default if it is unset, not a number or below 1."""
+    value = os.getenv("DEMO_MAX_CONCURRENCY")
+    if not value:
+        return DEFAULT_MAX_CONCURRENCY
+    try:
+        max_concurrency = int(value)
+    except ValueError:
+        max_concurrency = 0
+    if max_concurrency < 1:
+        logger.warning("⚠️ Invalid DEMO_MAX_CONCURRENCY=%r (expected a whole number >= 1), using %s",
+                       value, DEFAULT_MAX_CONCURRENCY)
+        return DEFAULT_MAX_CONCURRENCY
+    return max_concurrency
+
+
+@traced()
+def run_questions_concurrently(project, agent, questions, max_concurrency=None, timeout=60):
+    """
+    Ask independent questions in parallel, one thread per question.
+
+    Args:
+        project: Azure AI Project client
+        agent: AI agent to run
+        questions: List of user questions
+        max_concurrency (int, optional): Max questions in flight at once. Defaults to the
+            DEMO_MAX_CONCURRENCY environment variable, or 4 if it is missing or invalid.
+        timeout (int, optional): Max time (in seconds) to wait for each run. Defaults to 60.
+
+    Returns:
+        tuple: (results, total_elapsed) - DemoResult list in question order and total wall time
+    """
+    if max_concurrency is None:
+        max_concurrency = demo_max_concurrency()
+    max_concurrency = max(1, min(max_concurrency, len(questions) or 1))
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        results = list(executor.map(
+            bind(lambda question: ask_on_new_thread(project, agent, question, timeout)),
+            questions
+        ))
+
+    return results, time.perf_counter() - start_time
+
+
+def print_demo_results(results, total_elapsed):
+    """
+    Print parallel demo results in question order with per-question and total timing.
+
+    Args:
+        results: DemoResult list in question order
+        total_elapsed: Total wall time of the parallel demo in seconds
+    """
+    flush_logs()
+    for index, result in enumerate(results, start=1):
+        print(f"\n💭 Demo Question {index}: {result.question}")
+        print("-" * 40)
+
+        for role, text in result.responses:
+            print(f"\n🧠 {role.capitalize()}: {text}")
+
+        if result.error:
+            print(f"❌ Error: {result.error}")
+
+        print(f"\n⏱️ {result.elapsed:.2f}s — Status: {result.status} — Thread: {result.thread_id}")
+
+    failed = sum(1 for result in results if result.error)
+    serial_time = sum(result.elapsed for result in results)
+    print("\n" + "=" * 50)
+    print(f"🏁 {len(results)} questions in {total_elapsed:.2f}s "
+          f"(sum of question times: {serial_time:.2f}s, failed: {failed})")
@@ -0,0 +1,198 @@
+# core/resource_manifest.py
+
+import atexit
+import glob
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from core.local_store import JsonStore
+from core.message_reader import DEFAULT_READER
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MANIFEST_DIR = "manifests"
+DEFAULT_TEARDOWN_CONCURRENCY = 8
+
+# Deleted phase by phase: agents reference vector stores and files, vector stores reference files
+TEARDOWN_PHASES = (("agents", "threads"), ("vector_stores",), ("files",))
+RESOURCE_KINDS = ("agents", "threads", "vector_stores", "files")
+
+
+class ResourceManifest:
+    """
+    Per-session record of every resource this process created in the project.
+
+    Agents, threads, uploaded files and vector stores are appended to one JSON file
+    per session (under RESOURCE_MANIFEST_DIR) as soon as they are created, so they
+    can be torn down at exit or later with teardown.py, even after a crash.
+
+    Args:
+        path (optional): Manifest file. Defaults to a new session file in
+            RESOURCE_MANIFEST_DIR (or ./manifests).
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._store = None
+        self._lock = threading.RLock()
+
+    @property
+    def path(self):
+        with self._lock:
+            if self._path is None:
+                directory = os.getenv("RESOURCE_MANIFEST_DIR", DEFAULT_MANIFEST_DIR)
+                stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+                self._path = os.path.join(directory, f"session-{stamp}-{os.getpid()}.json")
+            return self._path
+
+    @property
+    def store(self):
+        with self._lock:
+            if self._store is None:
+                self._store = JsonStore(self.path)
+            return self._store
+
+    def record(self, kind, resource_id):
+        """Add a created resource ("agents", "threads", "vector_stores" or "files")."""
+        with self._lock:
+            if self.store.get("created_at") is None:
+                self.store.set("created_at", datetime.now(timezone.utc).isoformat())
+            ids = self.store.get(kind, [])
+            if resource_id not in ids:
+                self.store.set(kind, ids + [resource_id])
+
+    def forget(self, resource_id):
+        """Drop a resource that has been deleted."""
+        with self._lock:
+            if self._store is None and not os.path.exists(self.path):
+                return
+            for kind in RESOURCE_KINDS:
+                ids = self.store.get(kind, [])
+                if resource_id in ids:
+                    self.store.set(kind, [i for i in ids if i != resource_id])
+
+    def resources(self):
+        """Return {kind: [ids]} for every resource still in the manifest."""
+        return {kind: list(self.store.get(kind, [])) for kind in RESOURCE_KINDS}
+
+
+def _deleter(project, kind):
+    return {
+        "agents": project.agents.delete_agent,
+        "threads": lambda resource_id: project.agents.threads.delete(thread_id=resource_id),
+        "vector_stores": lambda resource_id: project.agents.vector_stores.delete(resource_id),
+        "files": lambda resource_id: project.agents.files.delete(resource_id),
+    }[kind]
+
+
+def teardown(project, manifest, concurrency=None):
+    """
+    Delete every resource in a manifest, concurrently within each dependency phase.
+
+    Agents and threads go first, then vector stores, then files. Resources that no
+    longer exist count as deleted. A concurrency of 1 deletes sequentially on the
+    calling thread, which also works at exit, where executors accept no new work. Deleted resources are removed from the manifest
+    (and from the agent registry / upload cache); the manifest file itself is
+    removed once it is empty.
+
+    Args:
+        project: Azure AI Project client
+        manifest: ResourceManifest to tear down
+        concurrency (int, optional): Deletions in flight. Defaults to the
+            TEARDOWN_CONCURRENCY environment variable, or 8.
+
+    Returns:
+        dict: {kind: [ids that could not be deleted]}
+    """
+    from azure.core.exceptions import ResourceNotFoundError
+    from core.agent_registry import DEFAULT_REGISTRY
+
+    if concurrency is None:
+        concurrency = int(os.getenv("TEARDOWN_CONCURRENCY", DEFAULT_TEARDOWN_CONCURRENCY))
+
+    resources = manifest.resources()
+    total = sum(len(ids) for ids in resources.values())
+    failures = {kind: [] for kind in RESOURCE_KINDS}
+    if not total:
+        logger.info("🧹 Nothing to tear down in %s", manifest.path)
+        return failures
+
+    logger.info("🧹 Tearing down %s resources from %s...", total, manifest.path)
+
+    def delete(kind, resource_id):
+        try:
+            _deleter(project, kind)(resource_id)
+            logger.info("🗑️ Deleted %s: %s", kind[:-1].replace('_', ' '), resource_id)
+        except ResourceNotFoundError:
+            logger.info("🔎 Already gone: %s", resource_id)
+        except Exception as e:
+            logger.error("❌ Failed to delete %s %s: %s", kind[:-1].replace('_', ' '), resource_id, e)
+            failures[kind].append(resource_id)
+            return
+        manifest.forget(resource_id)
+        if kind == "agents":
+            DEFAULT_REGISTRY.forget(resource_id)
+        elif kind == "threads":
+            DEFAULT_READER.forget(resource_id)
+        elif kind in ("vector_stores", "files"):
+            _forget_upload(resource_id)
+
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for phase in TEARDOWN_PHASES:
+                futures = [executor.submit(delete, kind, resource_id)
+                           for kind in phase for resource_id in resources[kind]]
+                for future in futures:
+                    future.result()
+    else:
+        for phase in TEARDOWN_PHASES:
+            for kind in phase:
+                for resource_id in resources[kind]:
+                    delete(kind, resource_id)
+
+    failed = sum(len(ids) for ids in failures.values())
+    logger.info("✅ Teardown completed. Deleted: %s, Failed: %s", total - failed, failed)
+    if not failed:
+        try:
+            os.remove(manifest.path)
+        except OSError:
+            pass
+    return failures
+
+
+def _forget_upload(resource_id):
+    try:
+        from core.upload_cache import DEFAULT_UPLOAD_CACHE
+    except ImportError:
+        return
+    DEFAULT_UPLOAD_CACHE.forget(resource_id)
+
+
+def session_manifests(directory=None):
+    """Return the manifest files left by previous sessions, oldest first."""
+    directory = directory or os.getenv("RESOURCE_MANIFEST_DIR", DEFAULT_MANIFEST_DIR)
+    return sorted(glob.glob(os.path.join(directory, "session-*.json")))
+
+
+def teardown_on_exit_enabled():
+    """Return True when TEARDOWN_ON_EXIT is set to 'true' in the environment."""
+    return os.getenv("TEARDOWN_ON_EXIT", "false").lower() == "true"
+
+
+def register_teardown_at_exit(project, manifest=None):
+    """
+    Tear down this session's resources when the program exits, if TEARDOWN_ON_EXIT=true.
+
+    Off by default, because agents and uploads are meant to be reused across starts
+    (see core.agent_registry and core.upload_cache); use teardown.py to clean up later.
+    Deletes sequentially: by the time atexit callbacks run, thread pools refuse new work.
+    """
+    if teardown_on_exit_enabled():
+        atexit.register(teardown, project, manifest or DEFAULT_MANIFEST, concurrency=1)
+
+
+# Shared by every module in the process so one session writes one manifest.
+DEFAULT_MANIFEST = ResourceManifest()
@@ -11,10 +11,17 @@ A comprehensive wellness advisor using Azure AI Foundry connected agents:
 Usage: python main.py
 """
 
+import logging
 import sys
-from settings import setup_logging, load_configuration
+from dotenv import load_dotenv
+from settings import load_configuration
 from core.azure_client import connect_to_project
+from core.log_config import setup_logging, flush_logs
+from core.tracing import setup_tracing, span
 from core.cleanup_utils import delete_agents
+from core.provisioning import Step, provision
+from core.resource_manifest import register_teardown_at_exit
+from core.usage_ledger import register_summary_at_exit
 from agents.diet_agent import create_diet_agent
 from agents.workout_agent import create_workout_agent
 from agents.fit_agent import create_fit_agent
@@ -22,36 +29,56 @@ from core.conversation_manager import (
     create_thread,
     send_user_message,
     run_agent,
+    stream_agent,
     display_agent_responses
 )
+from core.parallel_demo import run_questions_concurrently, print_demo_results
 
+logger = logging.getLogger(__name__)
 
-def create_fitness_system(project, model_name):
-    """Initialize the complete fitness advisor multi-agent system."""
-    print("")
-    print("🏗️ Building Fitness & Wellness Advisor System...")
 
-    # Create specialized sub-agents
-    diet_agent, diet_tool = create_diet_agent(project, model_name)
-    workout_agent, workout_tool = create_workout_agent(project, model_name)
+DEMO_QUESTIONS = [
+    "Hi! I want to lose 10 pounds in a healthy way. Can you help me create a plan?",
+    "I'm a beginner and want to start working out at home. What exercises should I do?",
+    "Can you suggest a high-protein meal plan for muscle building?",
+    "I'm vegan and need workout-friendly meals. Any suggestions?"
+]
 
-    # Create main coordinator agent
-    fit_agent = create_fit_agent(project, model_name, diet_tool, workout_tool)
 
-    print("✅ Fitness advisor system ready!")
+def create_fitness_system(project, model_name):
+    """Initialize the complete fitness advisor multi-agent system."""
+    logger.info("🏗️ Building Fitness & Wellness Advisor System...")
+
+    # Sub-agents are created concurrently, the coordinator once both tools exist;
+    # anything created is rolled back if a step fails
+    results = provision(project, [
+        Step("diet", lambda: create_diet_agent(project, model_name)),
+        Step("workout", lambda: create_workout_agent(project, model_name)),
+        Step("fit", lambda diet, workout: create_fit_agent(
+            project, model_name, diet[1], workout[1]), requires=("diet", "workout")),
+    ])
+
+    diet_agent = results["diet"][0]
+    workout_agent = results["workout"][0]
+    fit_agent = results["fit"]
+
+    logger.info("✅ Fitness advisor system ready!")
     return fit_agent, diet_agent, workout_agent
 
 
-def interactive_session(project, fit_agent):
-    """Run an interactive session with the fitness advisor."""
+def interactive_session(project, fit_agent, stream=True):
+    """Run an interactive session with the fitness advisor, streaming replies by default."""
     thread = create_thread(project)
 
+    flush_logs()
     print("\n🎉 Welcome to your personal Fitness & Wellness Advisor!")
     print("Ask me about nutrition, workouts, meal plans, or your overall wellness goals.")
     print("Type 'quit' to exit.\n")
 
     while True:
+        in_turn = False
         try:
+            flush_logs()
             user_input = input("👤 You: ").strip()
 
             if user_input.lower() in ['quit', 'exit', 'bye']:
@@ -61,17 +88,27 @@ def interactive_session(project, fit_agent):
             if not user_input:
                 continue
 
+            in_turn = True
             # Send message and get response
-            send_user_message(project, thread, user_input)
-            run = run_agent(project, thread, fit_agent)
-            display_agent_responses(project, thread, run)
+            with span("turn"):
+                send_user_message(project, thread, user_input)
+                if stream:
+                    stream_agent(project, thread, fit_agent)
+                else:
+                    run = run_agent(project, thread, fit_agent)
+                    display_agent_responses(project, thread, run)
             print()  # Add spacing between interactions
 
         except KeyboardInterrupt:
+            if in_turn:
+                # The run was cancelled server-side; keep chatting on the same thread
+                flush_logs()
+                print("⛔ Request cancelled. Ask something else or type 'quit' to exit.")
+                continue
             print("\n👋 Session ended. Stay fit!")
             break
         except Exception as e:
-            print(f"❌ Error: {e}")
+            logger.error("❌ Error: %s", e)
             continue
 
 
@@ -79,51 +116,67 @@ def demo_session(project, fit_agent):
     """Run a demonstration session with predefined questions."""
     thread = create_thread(project)
 
-    demo_questions = [
-        "Hi! I want to lose 10 pounds in a healthy way. Can you help me create a plan?",
-        "I'm a beginner and want to start working out at home. What exercises should I do?",
-        "Can you suggest a high-protein meal plan for muscle building?",
-        "I'm vegan and need workout-friendly meals. Any suggestions?"
-    ]
-
+    flush_logs()
     print("\n🎬 Running Fitness Advisor Demo Session...")
     print("=" * 50)
 
-    for question in demo_questions:
+    for question in DEMO_QUESTIONS:
+        flush_logs()
         print(f"\n💭 Demo Question: {question}")
         print("-" * 40)
 
-        send_user_message(project, thread, question)
-        run = run_agent(project, thread, fit_agent)
-        display_agent_responses(project, thread, run)
+        with span("turn"):
+            send_user_message(project, thread, question)
+            run = run_agent(project, thread, fit_agent)
+            display_agent_responses(project, thread, run)
         print()
 
 
+def parallel_demo_session(project, fit_agent, max_concurrency=None):
+    """Run the predefined questions in parallel, each on its own thread."""
+    flush_logs()
+    print("\n🎬 Running Fitness Advisor Parallel Demo Session...")
+    print("=" * 50)
+
+    results, total_elapsed = run_questions_concurrently(
+        project, fit_agent, DEMO_QUESTIONS, max_concurrency)
+    print_demo_results(results, total_elapsed)
+
+
 def main():
     """Main application entry point."""
     try:
-        # setup_logging()
-        print("🚀 Starting Fitness & Wellness Advisor...")
+        # .env first, so LOG_* and TRACING settings apply from the first line
+        load_dotenv()
+        setup_logging()
+        setup_tracing("fitness-advisor")
+        logger.info("🚀 Starting Fitness & Wellness Advisor...")
 
         # Initialize Azure connection
         endpoint, model_name = load_configuration()
         project = connect_to_project(endpoint)
+        register_teardown_at_exit(project)
+        register_summary_at_exit()
 
         # Create the multi-agent system
         fit_agent, _, _ = create_fitness_system(
             project, model_name)
 
         # Choose session type
+        flush_logs()
         print("\nSelect session type:")
         print("1. Interactive session (chat with the advisor)")
         print("2. Demo session (see predefined examples)")
+        print("3. Parallel demo session (each example on its own thread)")
 
-        choice = input("Enter choice (1 or 2): ").strip()
+        choice = input("Enter choice (1, 2 or 3): ").strip()
 
         if choice == "1":
             interactive_session(project, fit_agent)
         elif choice == "2":
             demo_session(project, fit_agent)
+        elif choice == "3":
+            parallel_demo_session(project, fit_agent)
         else:
             print("Running demo session by default...")
             demo_session(project, fit_agent)
@@ -132,15 +185,15 @@ def main():
         # print("\n🧹 Cleaning up agents...")
         # delete_agents(project, fit_agent, diet_agent, workout_agent)
 
-        print("🎉 Fitness & Wellness Advisor session completed!")
+        logger.info("🎉 Fitness & Wellness Advisor session completed!")
 
     except KeyboardInterrupt:
-        print("\n🛑 Program interrupted by user")
+        logger.info("🛑 Program interrupted by user")
     except Exception as e:
-        print(f"💥 Unexpected error: {e}")
+        logger.error("💥 Unexpected error: %s", e)
         sys.exit(1)
     finally:
-        print("🔴 Program terminated")
+        logger.info("🔴 Program terminated")
 
 
 if __name__ == "__main__":
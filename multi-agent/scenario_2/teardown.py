@@ -0,0 +1,57 @@
+# teardown.py
+
+import argparse
+import logging
+import sys
+from dotenv import load_dotenv
+from settings import load_configuration
+from core.azure_client import connect_to_project
+from core.log_config import setup_logging
+from core.resource_manifest import (
+    DEFAULT_TEARDOWN_CONCURRENCY,
+    ResourceManifest,
+    session_manifests,
+    teardown,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Delete the agents, threads, files and vector stores recorded in session manifests.")
+    selector = parser.add_mutually_exclusive_group(required=True)
+    selector.add_argument("--manifest", nargs="+", metavar="PATH",
+                          help="Session manifest file(s) to tear down")
+    selector.add_argument("--all", action="store_true",
+                          help="Tear down every session manifest in RESOURCE_MANIFEST_DIR")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help=f"Deletions in flight (default: TEARDOWN_CONCURRENCY or {DEFAULT_TEARDOWN_CONCURRENCY})")
+    return parser.parse_args()
+
+
+def main():
+    """Tear down the resources left by previous sessions."""
+    args = parse_args()
+    load_dotenv()
+    setup_logging()
+    endpoint, _ = load_configuration()
+
+    paths = args.manifest or session_manifests()
+    if not paths:
+        logger.info("🧹 No session manifests found.")
+        return
+
+    project = connect_to_project(endpoint)
+    failed = 0
+    for path in paths:
+        failures = teardown(project, ResourceManifest(path), args.concurrency)
+        failed += sum(len(ids) for ids in failures.values())
+
+    if failed:
+        logger.warning("⚠️ %d resources could not be deleted; their manifests were kept for a retry.", failed)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
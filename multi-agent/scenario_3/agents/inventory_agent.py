@@ -1,6 +1,13 @@
 # agents/inventory_agent.py
 
-from azure.ai.agents.models import ConnectedAgentTool, OpenApiTool, OpenApiAnonymousAuthDetails
+import functools
+import logging
+import os
+from core.agent_registry import DEFAULT_REGISTRY
+from core.tracing import traced, set_attributes
+
+logger = logging.getLogger(__name__)
+
 
 SERVER = "https://simple-fastapi-inventory.azurewebsites.net"
 APPLICATION_JSON = "application/json"
@@ -147,16 +154,32 @@ openapi_spec = {
     }
 }
 
-auth = OpenApiAnonymousAuthDetails()
 
-tool = OpenApiTool(
-    name="inventory_api",
-    spec=openapi_spec,
-    description="Inventory management via REST API - supports full CRUD operations",
-    auth=auth
-)
+def inventory_api_url():
+    """
+    Return the inventory API the spec points at: INVENTORY_API_URI, or the public SERVER.
+
+    Read when the tool is built, after .env is loaded. The OpenAPI tool is called by the
+    Agent Service, so a local core.inventory_api_server must be reachable from it (e.g.
+    through a dev tunnel).
+    """
+    return os.getenv("INVENTORY_API_URI", SERVER).rstrip("/")
+
+
+@functools.lru_cache(maxsize=None)
+def get_inventory_tool():
+    """Build the inventory OpenApiTool on first use (keeps the SDK out of module import)."""
+    from azure.ai.agents.models import OpenApiTool, OpenApiAnonymousAuthDetails
 
+    return OpenApiTool(
+        name="inventory_api",
+        spec={**openapi_spec, "servers": [{"url": inventory_api_url()}]},
+        description="Inventory management via REST API - supports full CRUD operations",
+        auth=OpenApiAnonymousAuthDetails()
+    )
 
+
+@traced()
 def create_inventory_agent(project, model_name):
     """
     Create an inventory management agent with OpenAPI function calling capabilities.
@@ -171,6 +194,8 @@ def create_inventory_agent(project, model_name):
     Raises:
         Exception: If agent creation fails
     """
+    from azure.ai.agents.models import ConnectedAgentTool
+
     agent_name = "inventory_agent"
     agent_description = "Manages inventory operations using OpenAPI function calls"
     agent_instructions = (
@@ -183,18 +208,20 @@ def create_inventory_agent(project, model_name):
         "Always provide clear, accurate information about inventory status and operations."
     )
 
-    print(f"🤖 Creating ({agent_name})...")
+    logger.info("🤖 Creating (%s)...", agent_name)
 
     try:
-        agent = project.agents.create_agent(
+        agent = DEFAULT_REGISTRY.get_or_create_agent(
+            project,
             model=model_name,
             name=agent_name,
             description=agent_description,
             instructions=agent_instructions,
-            tools=tool.definitions
+            tools=get_inventory_tool().definitions
         )
 
-        print(f"✅ {agent_name} created: {agent.id}")
+        set_attributes(agent_name=agent_name, agent_id=agent.id)
+        logger.info("✅ %s ready: %s", agent_name, agent.id)
 
         connected_tool = ConnectedAgentTool(
             id=agent.id,
@@ -202,9 +229,9 @@ def create_inventory_agent(project, model_name):
             description="Inventory management with full CRUD operations via REST API"
         )
 
-        print(f"✅ {agent_name} connected to tools.")
+        logger.info("✅ %s connected to tools.", agent_name)
         return agent, connected_tool
 
     except Exception as e:
-        print(f"❌ Failed to create agent ({agent_name}): {e}")
+        logger.error("❌ Failed to create agent (%s): %s", agent_name, e)
         raise
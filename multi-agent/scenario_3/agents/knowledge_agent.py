@@ -1,12 +1,20 @@
 # agents/knowledge_agent.py
 
-from azure.ai.agents.models import ConnectedAgentTool, FilePurpose, FileSearchTool
+import logging
+from core.upload_cache import DEFAULT_UPLOAD_CACHE
+from core.agent_registry import DEFAULT_REGISTRY
+from core.tracing import traced, set_attributes
+
+logger = logging.getLogger(__name__)
 
 
 def upload_file_and_create_vector_store(project, file_path):
     """
     Upload a company knowledge file and create a vector store for search functionality.
 
+    Both steps are skipped when the file content is unchanged and the previously
+    uploaded file and vector store still exist (see core.upload_cache).
+
     Args:
         project: Azure AI Project client
         file_path: Path to the company knowledge file
@@ -18,25 +26,24 @@ def upload_file_and_create_vector_store(project, file_path):
         Exception: If file upload or vector store creation fails
     """
     try:
-        print(f"📁 Uploading knowledge file: {file_path}")
-        file = project.agents.files.upload(
-            file_path=file_path, purpose=FilePurpose.AGENTS
-        )
-        print(f"✅ File uploaded: {file.id}")
+        logger.info("📁 Uploading knowledge file: %s", file_path)
+        file = DEFAULT_UPLOAD_CACHE.upload_file(project, file_path)
+        logger.info("✅ File ready: %s", file.id)
 
-        print("🔍 Creating vector store...")
-        vector_store = project.agents.vector_stores.create_and_poll(
-            file_ids=[file.id], name="company_knowledge_vectorstore"
+        logger.info("🔍 Preparing vector store...")
+        vector_store = DEFAULT_UPLOAD_CACHE.get_or_create_vector_store(
+            project, file_ids=[file.id], name="company_knowledge_vectorstore"
         )
-        print(f"✅ Vector store created: {vector_store.id}")
+        logger.info("✅ Vector store ready: %s", vector_store.id)
 
         return vector_store
 
     except Exception as e:
-        print(f"❌ Failed to upload file or create vector store: {e}")
+        logger.error("❌ Failed to upload file or create vector store: %s", e)
         raise
 
 
+@traced()
 def create_knowledge_agent(project, model_name, file_path):
     """
     Create a knowledge agent with file search capabilities for company information.
@@ -52,6 +59,8 @@ def create_knowledge_agent(project, model_name, file_path):
     Raises:
         Exception: If agent creation fails
     """
+    from azure.ai.agents.models import ConnectedAgentTool, FileSearchTool
+
     agent_name = "knowledge_agent"
     agent_description = "Provides company business logic, policies, and organizational information"
     agent_instructions = (
@@ -65,13 +74,14 @@ def create_knowledge_agent(project, model_name, file_path):
         "Always provide clear, authoritative answers based on official company documentation."
     )
 
-    print(f"🤖 Creating ({agent_name})...")
+    logger.info("🤖 Creating (%s)...", agent_name)
 
     try:
         vector_store = upload_file_and_create_vector_store(project, file_path)
         file_search_tool = FileSearchTool(vector_store_ids=[vector_store.id])
 
-        agent = project.agents.create_agent(
+        agent = DEFAULT_REGISTRY.get_or_create_agent(
+            project,
             model=model_name,
             name=agent_name,
             description=agent_description,
@@ -80,7 +90,8 @@ def create_knowledge_agent(project, model_name, file_path):
             tool_resources=file_search_tool.resources,
         )
 
-        print(f"✅ {agent_name} created: {agent.id}")
+        set_attributes(agent_name=agent_name, agent_id=agent.id)
+        logger.info("✅ %s ready: %s", agent_name, agent.id)
 
         connected_tool = ConnectedAgentTool(
             id=agent.id,
@@ -88,9 +99,9 @@ def create_knowledge_agent(project, model_name, file_path):
             description="Provides company business logic, policies, and organizational knowledge"
         )
 
-        print(f"✅ {agent_name} connected to tools.")
+        logger.info("✅ %s connected to tools.", agent_name)
         return agent, connected_tool
 
     except Exception as e:
-        print(f"❌ Failed to create agent ({agent_name}): {e}")
+        logger.error("❌ Failed to create agent (%s): %s", agent_name, e)
         raise
@@ -1,11 +1,21 @@
 # agents/sales_agent.py
 
+import logging
 import os
-from azure.ai.projects import AIProjectClient
-from azure.ai.agents.models import ConnectedAgentTool, FilePurpose, CodeInterpreterTool
+from typing import TYPE_CHECKING
+from core.agent_registry import DEFAULT_REGISTRY
+from core.tracing import traced, set_attributes
+from core.upload_cache import DEFAULT_UPLOAD_CACHE
 
+logger = logging.getLogger(__name__)
 
-def create_sales_agent(project: AIProjectClient, model_name: str, local_file_path: str):
+
+if TYPE_CHECKING:
+    from azure.ai.projects import AIProjectClient
+
+
+@traced()
+def create_sales_agent(project: "AIProjectClient", model_name: str, local_file_path: str):
     """
     Create a sales analysis agent with code interpreter capabilities for data analysis.
 
@@ -20,6 +30,8 @@ def create_sales_agent(project: AIProjectClient, model_name: str, local_file_pat
     Raises:
         Exception: If agent creation fails
     """
+    from azure.ai.agents.models import ConnectedAgentTool, CodeInterpreterTool
+
     agent_name = "sales_agent"
     agent_description = "Analyzes sales data and generates reports using Python code execution"
     agent_instructions = (
@@ -34,18 +46,17 @@ def create_sales_agent(project: AIProjectClient, model_name: str, local_file_pat
         "Always explain your analysis methodology and provide clear interpretations of results."
     )
 
-    print(f"🤖 Creating agent ({agent_name})...")
+    logger.info("🤖 Creating agent (%s)...", agent_name)
 
     try:
-        print(f"📁 Uploading sales data file: {local_file_path}")
-        file = project.agents.files.upload(
-            file_path=local_file_path, purpose=FilePurpose.AGENTS
-        )
-        print(f"✅ Sales data file uploaded: {file.id}")
+        logger.info("📁 Uploading sales data file: %s", local_file_path)
+        file = DEFAULT_UPLOAD_CACHE.upload_file(project, local_file_path)
+        logger.info("✅ Sales data file ready: %s", file.id)
 
         code_interpreter = CodeInterpreterTool(file_ids=[file.id])
 
-        agent = project.agents.create_agent(
+        agent = DEFAULT_REGISTRY.get_or_create_agent(
+            project,
             model=model_name,
             name=agent_name,
             description=agent_description,
@@ -53,7 +64,8 @@ def create_sales_agent(project: AIProjectClient, model_name: str, local_file_pat
             tools=code_interpreter.definitions,
             tool_resources=code_interpreter.resources
         )
-        print(f"✅ Created {agent_name}, ID: {agent.id}")
+        set_attributes(agent_name=agent_name, agent_id=agent.id)
+        logger.info("✅ %s ready, ID: %s", agent_name, agent.id)
 
         connected_tool = ConnectedAgentTool(
             id=agent.id,
@@ -61,9 +73,9 @@ def create_sales_agent(project: AIProjectClient, model_name: str, local_file_pat
             description="Sales data analysis and reporting with Python code execution"
         )
 
-        print(f"✅ {agent_name} connected to tools.")
+        logger.info("✅ %s connected to tools.", agent_name)
         return agent, connected_tool
 
     except Exception as e:
-        print(f"❌ Failed to create agent ({agent_name}): {e}")
+        logger.error("❌ Failed to create agent (%s): %s", agent_name, e)
         raise
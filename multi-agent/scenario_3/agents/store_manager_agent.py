@@ -1,6 +1,13 @@
 # agents/store_manager_agent.py
 
+import logging
+from core.agent_registry import DEFAULT_REGISTRY
+from core.tracing import traced, set_attributes
 
+logger = logging.getLogger(__name__)
+
+
+@traced()
 def create_main_agent(project, model_name, knowledge_agent_tool, inventory_agent_tool, sales_agent_tool):
     """
     Create the main store manager agent that coordinates with all other specialized agents.
@@ -45,7 +52,7 @@ def create_main_agent(project, model_name, knowledge_agent_tool, inventory_agent
         "When users ask questions, determine which agent(s) can best help and coordinate their responses effectively."
     )
 
-    print(f"🤖 Creating ({agent_name})...")
+    logger.info("🤖 Creating (%s)...", agent_name)
 
     try:
         # Combine all connected agent tools
@@ -53,7 +60,8 @@ def create_main_agent(project, model_name, knowledge_agent_tool, inventory_agent
                      inventory_agent_tool.definitions +
                      sales_agent_tool.definitions)
 
-        agent = project.agents.create_agent(
+        agent = DEFAULT_REGISTRY.get_or_create_agent(
+            project,
             model=model_name,
             name=agent_name,
             description=agent_description,
@@ -61,10 +69,11 @@ def create_main_agent(project, model_name, knowledge_agent_tool, inventory_agent
             tools=all_tools,
         )
 
-        print(f"✅ {agent_name} created: {agent.id}")
-        print(f"🔗 Connected to {len(all_tools)} specialized tools")
+        set_attributes(agent_name=agent_name, agent_id=agent.id)
+        logger.info("✅ %s ready: %s", agent_name, agent.id)
+        logger.info("🔗 Connected to %s specialized tools", len(all_tools))
         return agent
 
     except Exception as e:
-        print(f"❌ Failed to create agent ({agent_name}): {e}")
+        logger.error("❌ Failed to create agent (%s): %s", agent_name, e)
         raise
@@ -0,0 +1,156 @@
+# core/agent_registry.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from core.azure_client import project_endpoint
+from core.local_store import JsonStore
+from core.resource_manifest import DEFAULT_MANIFEST
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_REGISTRY_PATH = "agent_registry.json"
+
+
+def _canonical(value):
+    """Convert SDK models (tool definitions, tool resources) into plain JSON data."""
+    if hasattr(value, "as_dict"):
+        value = value.as_dict()
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def agent_fingerprint(definition):
+    """
+    Hash an agent definition so any change to it can be detected.
+
+    Args:
+        definition: Keyword arguments passed to create_agent (model, name, description,
+            instructions, tools, tool_resources, ...)
+
+    Returns:
+        str: SHA-256 hex digest of the canonical JSON form of the definition
+    """
+    canonical = json.dumps(_canonical(definition), sort_keys=True,
+                           separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _registry_key(endpoint, name):
+    return f"{endpoint}#{name}" if endpoint else name
+
+
+class AgentRegistry:
+    """
+    Local registry that reuses agents across program starts.
+
+    Each agent name, per project endpoint, maps to the ID and definition fingerprint
+    of the agent last provisioned for it, so switching PROJECT_ENDPOINT never looks
+    up another project's agents. On startup an unchanged definition reuses the existing
+    agent, a changed one is updated in place, and a new agent is only created when
+    none exists (or the recorded one was deleted). Any other error looking up the
+    recorded agent is raised, so a transient failure never creates a duplicate.
+
+    Args:
+        path (optional): Registry file. Defaults to AGENT_REGISTRY_PATH or agent_registry.json.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._store = None
+        self._lock = threading.Lock()
+        self.created_in_session = []
+
+    @property
+    def store(self):
+        with self._lock:
+            if self._store is None:
+                self._store = JsonStore(
+                    self._path or os.getenv("AGENT_REGISTRY_PATH", DEFAULT_REGISTRY_PATH))
+            return self._store
+
+    @traced()
+    def get_or_create_agent(self, project, **definition):
+        """
+        Return an agent matching the definition, creating or updating it only if needed.
+
+        Args:
+            project: Azure AI Project client
+            **definition: Keyword arguments for create_agent; `name` and the project endpoint
+                are the registry key
+
+        Returns:
+            agent: Reused, updated or newly created agent
+
+        Raises:
+            Exception: If updating or creating the agent fails
+        """
+        name = definition["name"]
+        endpoint = project_endpoint(project)
+        key = _registry_key(endpoint, name)
+        fingerprint = agent_fingerprint(definition)
+        entry = self.store.get(key)
+        # An entry from before the registry was keyed by endpoint is adopted if its agent is here
+        legacy = self.store.get(name) if entry is None and key != name else None
+        agent = self._existing_agent(project, entry or legacy)
+        if legacy and agent is not None:
+            self.store.delete(name)
+            entry = legacy
+
+        if agent is not None and entry["fingerprint"] == fingerprint:
+            logger.info("♻️ Reusing %s: %s", name, agent.id)
+            return agent
+
+        if agent is not None:
+            agent = project.agents.update_agent(agent_id=agent.id, **definition)
+            logger.info("🔄 Definition of %s changed, updated: %s", name, agent.id)
+        else:
+            agent = project.agents.create_agent(**definition)
+            DEFAULT_MANIFEST.record("agents", agent.id)
+            with self._lock:
+                self.created_in_session.append(agent.id)
+
+        self.store.set(key, {
+            "name": name,
+            "endpoint": endpoint,
+            "agent_id": agent.id,
+            "fingerprint": fingerprint,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        })
+        return agent
+
+    def name_of(self, agent_id):
+        """Return the name an agent ID is registered under, or None."""
+        for key, entry in self.store.items():
+            if entry.get("agent_id") == agent_id:
+                return entry.get("name", key)
+        return None
+
+    def forget(self, agent_id):
+        """Remove an agent from the registry, e.g. after deleting it."""
+        for key, entry in self.store.items():
+            if entry.get("agent_id") == agent_id:
+                self.store.delete(key)
+
+    def _existing_agent(self, project, entry):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        if not entry:
+            return None
+        try:
+            return project.agents.get_agent(entry["agent_id"])
+        except ResourceNotFoundError:
+            logger.warning("⚠️ Registered agent %s no longer exists, recreating it", entry['agent_id'])
+            return None
+
+
+# Shared by every factory in the process so created_in_session covers the whole run.
+DEFAULT_REGISTRY = AgentRegistry()
@@ -0,0 +1,178 @@
+# core/async_conversation_manager.py
+
+import asyncio
+import logging
+import time
+from core.message_reader import DEFAULT_READER
+from core.resource_manifest import DEFAULT_MANIFEST
+from core.conversation_manager import report_run_outcome, print_run_messages
+from core.polling import wait_for_run_async, cancel_run_async
+from core.tracing import traced, set_attributes
+from core.usage_ledger import DEFAULT_LEDGER
+
+logger = logging.getLogger(__name__)
+
+
+@traced()
+async def create_thread(project):
+    """
+    Create a conversation thread with the async client.
+
+    Args:
+        project: Async Azure AI Project client (see core.azure_client.get_async_project)
+
+    Returns:
+        thread: Created conversation thread
+
+    Raises:
+        Exception: If thread creation fails
+    """
+    logger.info("🧵 Creating conversation thread...")
+
+    try:
+        thread = await project.agents.threads.create()
+        DEFAULT_MANIFEST.record("threads", thread.id)
+        set_attributes(thread_id=thread.id)
+        logger.info("✅ Thread created: %s", thread.id)
+        return thread
+
+    except Exception as e:
+        logger.error("❌ Failed to create conversation thread: %s", e)
+        raise
+
+
+@traced()
+async def send_user_message(project, thread, content):
+    """
+    Send a user message to the conversation thread with the async client.
+
+    Args:
+        project: Async Azure AI Project client
+        thread: Conversation thread object
+        content: Message content to send
+
+    Returns:
+        message: Created message object
+
+    Raises:
+        Exception: If message sending fails
+    """
+    from azure.ai.agents.models import MessageRole
+
+    logger.info("💬 User message: %s", content)
+
+    try:
+        if not content or not content.strip():
+            raise ValueError("Message content cannot be empty")
+
+        message = await project.agents.messages.create(
+            thread_id=thread.id,
+            role=MessageRole.USER,
+            content=content
+        )
+        set_attributes(thread_id=thread.id, message_id=message.id)
+        DEFAULT_LEDGER.note_prompt(thread.id, content)
+        logger.info("✅ Message sent: %s", message.id)
+        return message
+
+    except Exception as e:
+        logger.error("❌ Failed to send user message: %s", e)
+        raise
+
+
+@traced()
+async def run_agent(project, thread, agent, polling=None, timeout=60):
+    """
+    Run the AI agent on a conversation thread without blocking the event loop.
+
+    Args:
+        project: Async Azure AI Project client
+        thread: Conversation thread object
+        agent: AI agent to run
+        polling (optional): Polling strategy deciding the wait between status checks.
+            Defaults to the shared adaptive backoff strategy in core.polling.
+        timeout (int, optional): Max time (in seconds) to wait for run to complete. Defaults to 60.
+
+    Returns:
+        run: Run object containing final status and metadata
+
+    Raises:
+        TimeoutError: If the agent run does not complete within the timeout period
+            (the run is cancelled server-side first, as it is when the task is cancelled)
+        Exception: If run initiation or polling fails
+    """
+    try:
+        started = time.perf_counter()
+        run = await project.agents.runs.create(
+            thread_id=thread.id,
+            agent_id=agent.id
+        )
+        logger.info("🔄 Run initiated: %s — Status: %s", run.id, run.status)
+        set_attributes(thread_id=thread.id, agent_id=agent.id, run_id=run.id)
+
+        try:
+            run = await wait_for_run_async(
+                project, thread.id, run,
+                agent_id=agent.id,
+                polling=polling,
+                timeout=timeout
+            )
+        except (TimeoutError, asyncio.CancelledError):
+            await cancel_agent_run(project, thread, run)
+            raise
+
+        duration = time.perf_counter() - started
+        report_run_outcome(run)
+        set_attributes(run_status=run.status)
+        # The async client cannot be used from the ledger's worker thread, so only
+        # the run's own usage is recorded here (no per-step or connected-agent entries)
+        DEFAULT_LEDGER.record_run(None, thread.id, run, steps=[], duration=duration)
+        return run
+
+    except Exception as e:
+        logger.error("💥 Failed to run agent on thread %s: %s", thread.id, e)
+        raise
+
+
+async def cancel_agent_run(project, thread, run):
+    """
+    Cancel a run server-side so it stops consuming tokens and frees the thread.
+
+    Args:
+        project: Async Azure AI Project client
+        thread: Conversation thread object
+        run: Run object to cancel
+
+    Returns:
+        run: Latest run object after the cancellation attempt
+    """
+    logger.info("🛑 Cancelling run %s...", run.id)
+
+    try:
+        run = await cancel_run_async(project, thread.id, run.id)
+        logger.info("✅ Run %s is now %s", run.id, run.status)
+    except Exception as e:
+        logger.error("❌ Failed to cancel run %s: %s", run.id, e)
+
+    return run
+
+
+async def display_agent_responses(project, thread, run):
+    """
+    Fetch and display the agent's responses related to a specific run.
+
+    Args:
+        project: Async Azure AI Project client
+        thread: Conversation thread object
+        run: Run object that triggered the agent response
+
+    Raises:
+        Exception: If fetching or displaying messages fails
+    """
+    try:
+        messages = await DEFAULT_READER.run_messages_async(project, thread.id, run)
+        print_run_messages(messages, run)
+
+    except Exception as e:
+        logger.error("❌ Failed to fetch/display agent responses: %s", e)
+        raise
@@ -1,5 +1,12 @@
 # core/cleanup_utils.py
 
+import logging
+from core.agent_registry import DEFAULT_REGISTRY
+from core.resource_manifest import DEFAULT_MANIFEST
+
+logger = logging.getLogger(__name__)
+
+
 def delete_agents(project, *agents):
     """
     Clean up agents after execution by deleting them from the project.
@@ -13,10 +20,10 @@ def delete_agents(project, *agents):
         even if some deletions fail, and will report the status of each deletion.
     """
     if not agents:
-        print("⚠️ No agents provided for cleanup")
+        logger.warning("⚠️ No agents provided for cleanup")
         return
 
-    print("🗑️ Starting agent cleanup process...")
+    logger.info("🗑️ Starting agent cleanup process...")
 
     deleted_count = 0
     failed_count = 0
@@ -27,21 +34,22 @@ def delete_agents(project, *agents):
                 agent_name = getattr(agent, 'name', 'Unknown')
                 agent_id = getattr(agent, 'id', 'Unknown')
 
-                print(f"🗑️ Deleting agent: {agent_name} (ID: {agent_id})")
+                logger.info("🗑️ Deleting agent: %s (ID: %s)", agent_name, agent_id)
                 project.agents.delete_agent(agent.id)
-                print(f"✅ Deleted agent: {agent_name}")
+                DEFAULT_REGISTRY.forget(agent.id)
+                DEFAULT_MANIFEST.forget(agent.id)
+                logger.info("✅ Deleted agent: %s", agent_name)
                 deleted_count += 1
             else:
-                print(f"⚠️ Skipping invalid agent object: {agent}")
+                logger.warning("⚠️ Skipping invalid agent object: %s", agent)
                 failed_count += 1
 
         except Exception as e:
             agent_name = getattr(agent, 'name', 'Unknown')
-            print(f"❌ Failed to delete agent {agent_name}: {e}")
+            logger.error("❌ Failed to delete agent %s: %s", agent_name, e)
             failed_count += 1
 
-    print(
-        f"✅ Agent cleanup completed. Deleted: {deleted_count}, Failed: {failed_count}")
+    logger.info("✅ Agent cleanup completed. Deleted: %s, Failed: %s", deleted_count, failed_count)
 
     if failed_count > 0:
-        print("⚠️ Some agents could not be deleted. They may need manual cleanup.")
+        logger.warning("⚠️ Some agents could not be deleted. They may need manual cleanup.")
@@ -1,9 +1,19 @@
 # core/conversation_manager.py
 
+import logging
 import time
-from azure.ai.agents.models import MessageRole, ListSortOrder
+from core.log_config import flush_logs
+from core.message_reader import DEFAULT_READER
+from core.resource_manifest import DEFAULT_MANIFEST
+from core.polling import wait_for_run, cancel_run
+from core.run_profiler import should_profile, record_run_profile
+from core.tracing import traced, set_attributes
+from core.usage_ledger import DEFAULT_LEDGER
 
+logger = logging.getLogger(__name__)
 
+
+@traced()
 def create_thread(project):
     """
     Create a conversation thread for the inventory management session.
@@ -17,18 +27,21 @@ def create_thread(project):
     Raises:
         Exception: If thread creation fails
     """
-    print("\n🧵 Creating conversation thread...")
+    logger.info("🧵 Creating conversation thread...")
 
     try:
         thread = project.agents.threads.create()
-        print(f"✅ Thread created: {thread.id}")
+        DEFAULT_MANIFEST.record("threads", thread.id)
+        set_attributes(thread_id=thread.id)
+        logger.info("✅ Thread created: %s", thread.id)
         return thread
 
     except Exception as e:
-        print(f"❌ Failed to create conversation thread: {e}")
+        logger.error("❌ Failed to create conversation thread: %s", e)
         raise
 
 
+@traced()
 def send_user_message(project, thread, content):
     """
     Send a user message to the conversation thread.
@@ -44,8 +57,10 @@ def send_user_message(project, thread, content):
     Raises:
         Exception: If message sending fails
     """
-    print(f"\n💬 User message: {content}")
-    print("📨 Sending message to store manager...")
+    from azure.ai.agents.models import MessageRole
+
+    logger.info("💬 User message: %s", content)
+    logger.info("📨 Sending message to store manager...")
 
     try:
         if not content or not content.strip():
@@ -56,15 +71,18 @@ def send_user_message(project, thread, content):
             role=MessageRole.USER,
             content=content
         )
-        print(f"✅ Message sent: {message.id}")
+        set_attributes(thread_id=thread.id, message_id=message.id)
+        DEFAULT_LEDGER.note_prompt(thread.id, content)
+        logger.info("✅ Message sent: %s", message.id)
         return message
 
     except Exception as e:
-        print(f"❌ Failed to send user message: {e}")
+        logger.error("❌ Failed to send user message: %s", e)
         raise
 
 
-def run_agent(project, thread, agent, poll_interval=2, timeout=60):
+@traced()
+def run_agent(project, thread, agent, polling=None, timeout=60, profile=None):
     """
     Run the AI agent on a conversation thread and poll until completion.
 
@@ -72,47 +90,140 @@ def run_agent(project, thread, agent, poll_interval=2, timeout=60):
         project: Azure AI Project client
         thread: Conversation thread object
         agent: AI agent to run
-        poll_interval (int, optional): Seconds to wait between status checks. Defaults to 2.
+        polling (optional): Polling strategy deciding the wait between status checks.
+            Defaults to the shared adaptive backoff strategy in core.polling.
         timeout (int, optional): Max time (in seconds) to wait for run to complete. Defaults to 60.
+        profile (bool, optional): Print a per-step timing table and log it to a JSONL file.
+            Defaults to the RUN_PROFILING environment variable.
 
     Returns:
         run: Run object containing final status and metadata
 
     Raises:
         TimeoutError: If the agent run does not complete within the timeout period
+            (the run is cancelled server-side first, as it is on KeyboardInterrupt)
         Exception: If run initiation or polling fails
     """
-    print("🏃 Starting inventory management run...")
+    logger.info("🏃 Starting inventory management run...")
 
     try:
+        started = time.perf_counter()
         run = project.agents.runs.create(
             thread_id=thread.id,
             agent_id=agent.id
         )
-        print(f"🔄 Run initiated: {run.id} — Status: {run.status}")
+        logger.info("🔄 Run initiated: %s — Status: %s", run.id, run.status)
+        set_attributes(thread_id=thread.id, agent_id=agent.id, run_id=run.id)
+
+        try:
+            run = wait_for_run(
+                project, thread.id, run,
+                agent_id=agent.id,
+                polling=polling,
+                timeout=timeout,
+                on_status=lambda r: logger.debug("📡 Run status: %s", r.status)
+            )
+        except (TimeoutError, KeyboardInterrupt):
+            cancel_agent_run(project, thread, run)
+            raise
+
+        duration = time.perf_counter() - started
+        report_run_outcome(run)
+        set_attributes(run_id=run.id, run_status=run.status)
+        steps = record_run_profile(project, thread.id, run) if should_profile(profile) else None
+        DEFAULT_LEDGER.record_run(project, thread.id, run, steps=steps, duration=duration)
+
+        return run
+
+    except Exception as e:
+        logger.error("💥 Failed to run inventory management: %s", e)
+        raise
+
+
+@traced()
+def stream_agent(project, thread, agent, profile=None):
+    """
+    Run the AI agent on a conversation thread and print its reply as it streams in.
+
+    Message deltas are printed as they arrive and connected-agent/tool steps are
+    reported as events, so neither status polling nor a follow-up message listing
+    is needed.
+
+    Args:
+        project: Azure AI Project client
+        thread: Conversation thread object
+        agent: AI agent to run
+        profile (bool, optional): Print a per-step timing table and log it to a JSONL file.
+            Defaults to the RUN_PROFILING environment variable.
 
-        start_time = time.time()
-        while run.status in ["queued", "in_progress"]:
-            if time.time() - start_time > timeout:
-                raise TimeoutError(
-                    "⏰ Run timed out while waiting for completion.")
+    Returns:
+        run: Run object containing final status and metadata
 
-            time.sleep(poll_interval)
-            run = project.agents.runs.get(thread_id=thread.id, run_id=run.id)
-            print(f"📡 Run status: {run.status}")
+    Raises:
+        Exception: If the run cannot be started or the stream fails
+    """
+    from core.streaming import ConsoleStreamHandler
 
-        if run.status == "failed":
-            print(f"❌ Run failed: {run.last_error}")
-        else:
-            print(f"✅ Run completed with status: {run.status}")
+    logger.info("🏃 Starting inventory management run (streaming)...")
+
+    try:
+        started = time.perf_counter()
+        handler = ConsoleStreamHandler()
+        try:
+            with project.agents.runs.stream(
+                thread_id=thread.id,
+                agent_id=agent.id,
+                event_handler=handler
+            ) as stream:
+                stream.until_done()
+        except KeyboardInterrupt:
+            if handler.run is not None:
+                cancel_agent_run(project, thread, handler.run)
+            raise
+
+        run = handler.run
+        if run is None:
+            raise RuntimeError("Stream ended before any run event was received.")
+
+        duration = time.perf_counter() - started
+        report_run_outcome(run)
+        set_attributes(run_id=run.id, run_status=run.status)
+        steps = record_run_profile(project, thread.id, run) if should_profile(profile) else None
+        DEFAULT_LEDGER.record_run(project, thread.id, run, steps=steps, duration=duration)
 
         return run
 
     except Exception as e:
-        print(f"💥 Failed to run inventory management: {e}")
+        logger.error("💥 Failed to stream inventory management: %s", e)
         raise
 
 
+def cancel_agent_run(project, thread, run):
+    """
+    Cancel a run server-side so it stops consuming tokens and frees the thread.
+
+    Failures are reported rather than raised, because this runs while another
+    error (timeout or Ctrl+C) is already propagating.
+
+    Args:
+        project: Azure AI Project client
+        thread: Conversation thread object
+        run: Run object to cancel
+
+    Returns:
+        run: Latest run object after the cancellation attempt
+    """
+    logger.info("🛑 Cancelling run %s...", run.id)
+
+    try:
+        run = cancel_run(project, thread.id, run.id)
+        logger.info("✅ Run %s is now %s", run.id, run.status)
+    except Exception as e:
+        logger.error("❌ Failed to cancel run %s: %s", run.id, e)
+
+    return run
+
+
 def display_agent_responses(project, thread, run):
     """
     Fetch and display the agent's responses related to a specific run.
@@ -128,22 +239,43 @@ def display_agent_responses(project, thread, run):
     Raises:
         Exception: If fetching or displaying messages fails
     """
-    print("📥 Fetching messages from thread...")
+    logger.info("📥 Fetching messages from thread...")
 
     try:
-        messages = project.agents.messages.list(
-            thread_id=thread.id,
-            order=ListSortOrder.ASCENDING
-        )
-
-        for msg in messages:
-            if msg.run_id == run.id and msg.text_messages:
-                try:
-                    last_message = msg.text_messages[-1].text.value
-                    print(f"\n🧠 {msg.role.capitalize()}: {last_message}")
-                except (IndexError, AttributeError) as inner_e:
-                    print(f"⚠️ Skipped a malformed message: {inner_e}")
+        messages = DEFAULT_READER.run_messages(project, thread.id, run)
+        print_run_messages(messages, run)
 
     except Exception as e:
-        print(f"❌ Failed to fetch/display agent responses: {e}")
+        logger.error("❌ Failed to fetch/display agent responses: %s", e)
         raise
+
+
+def report_run_outcome(run):
+    """
+    Print the final status of a run.
+
+    Args:
+        run: Run object in its final status
+    """
+    if run.status == "failed":
+        logger.error("❌ Run failed: %s", run.last_error)
+    else:
+        logger.info("✅ Run completed with status: %s", run.status)
+
+
+def print_run_messages(messages, run):
+    """
+    Print the text of every message produced by a specific run.
+
+    Args:
+        messages: Iterable of thread messages
+        run: Run object whose messages should be printed
+    """
+    flush_logs()
+    for msg in messages:
+        if msg.run_id == run.id and msg.text_messages:
+            try:
+                last_message = msg.text_messages[-1].text.value
+                print(f"\n🧠 {msg.role.capitalize()}: {last_message}")
+            except (IndexError, AttributeError) as inner_e:
+                print(f"⚠️ Skipped a malformed message: {inner_e}")
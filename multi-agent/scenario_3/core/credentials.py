@@ -0,0 +1,316 @@
+# core/credentials.py
+
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CREDENTIAL_TYPE = "chain"
+TOKEN_SCOPE = "https://ai.azure.com/.default"
+
+# Same order as DefaultAzureCredential, minus the managed identity probe, which can
+# take seconds to time out off Azure (add it with AZURE_CREDENTIAL_CHAIN when needed).
+DEFAULT_CREDENTIAL_CHAIN = ("environment", "workload_identity", "cli", "azd")
+
+DEFAULT_TOKEN_CACHE_NAME = "azure-ai-agents"
+DEFAULT_AUTH_RECORD_PATH = ".azure_auth_record.json"
+
+# Tokens are refreshed this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 300
+
+CREDENTIAL_CLASSES = {
+    "default": "DefaultAzureCredential",
+    "environment": "EnvironmentCredential",
+    "workload_identity": "WorkloadIdentityCredential",
+    "managed_identity": "ManagedIdentityCredential",
+    "cli": "AzureCliCredential",
+    "azd": "AzureDeveloperCliCredential",
+    "powershell": "AzurePowerShellCredential",
+    "interactive": "InteractiveBrowserCredential",
+    "device_code": "DeviceCodeCredential",
+}
+
+# Credentials whose tokens are persisted to the token cache, so a restart does not
+# prompt the user again. Service principal and workload identity tokens are
+# re-acquired without a prompt and stay in memory (SharedCredential).
+CACHEABLE_TYPES = {"interactive", "device_code"}
+
+# Credentials that sign a user in and can reuse the account via an AuthenticationRecord
+USER_TYPES = {"interactive", "device_code"}
+
+_credential = None
+_async_credential = None
+_lock = threading.Lock()
+
+
+def credential_type():
+    """Return the configured AZURE_CREDENTIAL_TYPE ('chain' unless set)."""
+    kind = os.getenv("AZURE_CREDENTIAL_TYPE", DEFAULT_CREDENTIAL_TYPE).strip().lower()
+    if kind != "chain" and kind not in CREDENTIAL_CLASSES:
+        choices = ", ".join(["chain", *CREDENTIAL_CLASSES])
+        raise ValueError(f"Unknown AZURE_CREDENTIAL_TYPE '{kind}' (choose from: {choices})")
+    return kind
+
+
+def credential_chain():
+    """Return the credential types probed, in order, when AZURE_CREDENTIAL_TYPE=chain."""
+    value = os.getenv("AZURE_CREDENTIAL_CHAIN")
+    if not value:
+        return DEFAULT_CREDENTIAL_CHAIN
+    chain = tuple(kind.strip().lower() for kind in value.split(",") if kind.strip())
+    unknown = [kind for kind in chain if kind not in CREDENTIAL_CLASSES or kind == "default"]
+    if unknown:
+        raise ValueError(f"Unknown credential type(s) in AZURE_CREDENTIAL_CHAIN: {', '.join(unknown)}")
+    return chain
+
+
+def encrypted_cache_available():
+    """Return True unless this is Linux without a usable libsecret keyring (e.g. headless)."""
+    if not sys.platform.startswith("linux"):
+        return True
+    try:
+        from msal_extensions.libsecret import trial_run
+
+        trial_run()
+        return True
+    except Exception:
+        return False
+
+
+def _token_cache_options(kind):
+    if kind not in CACHEABLE_TYPES or os.getenv("AZURE_TOKEN_CACHE", "true").lower() != "true":
+        return {}
+    allow_unencrypted = os.getenv("AZURE_TOKEN_CACHE_ALLOW_UNENCRYPTED", "false").lower() == "true"
+    if not allow_unencrypted and not encrypted_cache_available():
+        # Without this, MSAL fails every token request with "Cache encryption is impossible"
+        logger.warning("⚠️ No keyring to encrypt the token cache, keeping tokens in memory "
+                       "(AZURE_TOKEN_CACHE_ALLOW_UNENCRYPTED=true persists them unencrypted)")
+        return {}
+    from azure.identity import TokenCachePersistenceOptions
+
+    return {"cache_persistence_options": TokenCachePersistenceOptions(
+        name=os.getenv("AZURE_TOKEN_CACHE_NAME", DEFAULT_TOKEN_CACHE_NAME),
+        allow_unencrypted_storage=allow_unencrypted,
+    )}
+
+
+def _build_user_credential(credential_class, options):
+    from azure.identity import AuthenticationRecord
+
+    # Reusing the saved account record lets the persistent cache sign in silently
+    record_path = os.getenv("AZURE_AUTH_RECORD_PATH", DEFAULT_AUTH_RECORD_PATH)
+    if os.path.exists(record_path):
+        with open(record_path, encoding="utf-8") as record_file:
+            options["authentication_record"] = AuthenticationRecord.deserialize(record_file.read())
+        return credential_class(**options)
+
+    credential = credential_class(**options)
+    record = credential.authenticate(scopes=[TOKEN_SCOPE])
+    with open(record_path, "w", encoding="utf-8") as record_file:
+        record_file.write(record.serialize())
+    logger.info("💾 Saved sign-in record to %s", record_path)
+    return credential
+
+
+def _build(module_name, kind):
+    # azure.identity is imported here, on first use, rather than at startup
+    module = importlib.import_module(module_name)
+    credential_class = getattr(module, CREDENTIAL_CLASSES[kind], None)
+    if credential_class is None:
+        raise ValueError(f"AZURE_CREDENTIAL_TYPE '{kind}' is not available for async clients")
+    options = _token_cache_options(kind)
+    if kind in USER_TYPES:
+        return _build_user_credential(credential_class, options)
+    return credential_class(**options)
+
+
+class TimedCredential:
+    """
+    Wraps one credential and logs how long its first token request took.
+
+    Used for every probe in the chain, so a slow link (typically the Azure CLI) is
+    visible at startup. Exceptions are re-raised unchanged, so ChainedTokenCredential
+    still moves on after CredentialUnavailableError.
+    """
+
+    def __init__(self, name, credential):
+        self.name = name
+        self._credential = credential
+        self._reported = False
+
+    def get_token(self, *scopes, **kwargs):
+        return self._timed(self._credential.get_token, scopes, kwargs)
+
+    def get_token_info(self, *scopes, options=None):
+        return self._timed(self._credential.get_token_info, scopes, {"options": options})
+
+    def _timed(self, request, scopes, kwargs):
+        started = time.perf_counter()
+        try:
+            token = request(*scopes, **kwargs)
+        except Exception:
+            logger.info("🔐 %s: unavailable after %.2fs", self.name, time.perf_counter() - started)
+            raise
+        if not self._reported:
+            self._reported = True
+            logger.info("🔐 %s: token acquired in %.2fs", self.name, time.perf_counter() - started)
+        return token
+
+    def close(self):
+        self._credential.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _timed(name, credential):
+    # Named subclass so ChainedTokenCredential's error lists the real credential
+    return type(name, (TimedCredential,), {})(name, credential)
+
+
+class SharedCredential:
+    """
+    Process-wide credential that keeps each scope's token until shortly before it expires.
+
+    Every client in the process (sync projects, scripts, tools) shares it, so the
+    credential chain is walked, and the Azure CLI shelled out to, once per token
+    lifetime instead of once per client.
+    """
+
+    def __init__(self, credential):
+        self._credential = credential
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def get_token_info(self, *scopes, options=None):
+        from azure.core.credentials import AccessTokenInfo
+
+        key = (scopes, tuple(sorted((options or {}).items())))
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None or time.time() >= (token.refresh_on or token.expires_on - TOKEN_REFRESH_MARGIN):
+                if hasattr(self._credential, "get_token_info"):
+                    token = self._credential.get_token_info(*scopes, options=options)
+                else:
+                    access_token = self._credential.get_token(*scopes, **(options or {}))
+                    token = AccessTokenInfo(access_token.token, access_token.expires_on)
+                self._tokens[key] = token
+            return token
+
+    def get_token(self, *scopes, **kwargs):
+        from azure.core.credentials import AccessToken
+
+        token = self.get_token_info(*scopes, options=kwargs or None)
+        return AccessToken(token.token, token.expires_on)
+
+    def close(self):
+        # Shared for the whole process; individual clients must not close it
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+def create_credential():
+    """
+    Build the credential selected by AZURE_CREDENTIAL_TYPE.
+
+    Types: chain (default; probes AZURE_CREDENTIAL_CHAIN in order and times each
+    probe), default (DefaultAzureCredential), environment, workload_identity,
+    managed_identity, cli, azd, powershell, interactive, device_code. Interactive and
+    device code sign-ins persist tokens to an encrypted local cache (AZURE_TOKEN_CACHE).
+
+    Returns:
+        TokenCredential: A new credential (prefer get_credential, which shares one)
+    """
+    kind = credential_type()
+    if kind != "chain":
+        logger.info("🔐 Using %s", CREDENTIAL_CLASSES[kind])
+        return _timed(CREDENTIAL_CLASSES[kind], _build("azure.identity", kind))
+
+    probes = []
+    for link in credential_chain():
+        try:
+            probes.append(_timed(CREDENTIAL_CLASSES[link], _build("azure.identity", link)))
+        except Exception as e:
+            # e.g. WorkloadIdentityCredential without its environment variables
+            logger.info("⏭️ Skipping %s: %s", CREDENTIAL_CLASSES[link], e)
+    logger.info("🔐 Credential chain: %s", ' → '.join(probe.name for probe in probes))
+    from azure.identity import ChainedTokenCredential
+
+    return ChainedTokenCredential(*probes)
+
+
+def get_credential():
+    """Return the process-wide credential, creating it on first use."""
+    global _credential
+    if _credential is None:
+        with _lock:
+            if _credential is None:
+                _credential = SharedCredential(create_credential())
+    return _credential
+
+
+def get_async_credential():
+    """
+    Return the process-wide async credential (azure.identity.aio), creating it on first use.
+
+    Honours AZURE_CREDENTIAL_TYPE and AZURE_CREDENTIAL_CHAIN like get_credential; the
+    interactive and device_code types have no async equivalent. Close it with
+    close_async_credential.
+    """
+    global _async_credential
+    if _async_credential is None:
+        with _lock:
+            if _async_credential is None:
+                kind = credential_type()
+                if kind != "chain":
+                    _async_credential = _build("azure.identity.aio", kind)
+                else:
+                    probes = []
+                    for link in credential_chain():
+                        try:
+                            probes.append(_build("azure.identity.aio", link))
+                        except Exception as e:
+                            logger.info("⏭️ Skipping %s: %s", CREDENTIAL_CLASSES[link], e)
+                    from azure.identity.aio import ChainedTokenCredential
+
+                    _async_credential = ChainedTokenCredential(*probes)
+    return _async_credential
+
+
+def prefetch_token(scope=TOKEN_SCOPE):
+    """
+    Start acquiring a token for scope on a background thread.
+
+    Called while the SDK client is being imported and built, so the credential chain
+    (often an `az` subprocess) runs in parallel instead of on the first request. The
+    first request then finds the token in SharedCredential; errors surface there.
+    """
+    threading.Thread(target=_prefetch, args=(scope,), name="token-prefetch", daemon=True).start()
+
+
+def _prefetch(scope):
+    try:
+        get_credential().get_token_info(scope)
+    except Exception:
+        pass
+
+
+async def close_async_credential():
+    """Close the shared async credential, if one was created."""
+    global _async_credential
+    if _async_credential is not None:
+        await _async_credential.close()
+        _async_credential = None
@@ -0,0 +1,403 @@
+# core/inventory_api_server.py
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from core.distributions import Distribution
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_SEED_ITEMS = 50
+DEFAULT_ERROR_STATUS = 503
+DEFAULT_RETRY_AFTER = 1
+DEFAULT_LIST_LIMIT = 100
+GZIP_MIN_BYTES = 1024
+
+# Seeded items cycle through the products of data/sales_data.csv (name, base price)
+SEED_PRODUCTS = (
+    ("Smartphone", 450), ("T-Shirt", 20), ("Headphones", 150), ("Blender", 70),
+    ("Fiction Book", 15), ("Perfume", 60), ("Yoga Mat", 25), ("Desk Chair", 120),
+    ("Action Figure", 30), ("Snacks", 5),
+)
+
+# Item fields of the inventory_agent OpenAPI spec and the JSON types they accept
+ITEM_FIELDS = {
+    "name": (str,),
+    "description": (str, type(None)),
+    "price": (int, float),
+    "quantity": (int,),
+}
+REQUIRED_FIELDS = ("name", "price", "quantity")
+
+ITEM_PATH = re.compile(r"^/items/(\d+)$")
+
+
+class InventoryStore:
+    """
+    In-memory inventory indexed by item ID, seedable with millions of items.
+
+    Seeded items (IDs 1..seed_items) are computed from their ID when read, so seeding
+    costs no memory or start-up time; only created, updated and deleted items are
+    stored. A lookup by ID is a dict lookup plus a binary search, and a page of the
+    listing costs O(limit) plus the created items it skips.
+
+    Args:
+        seed_items (optional): Number of seeded items. Defaults to INVENTORY_SEED_ITEMS or 50.
+    """
+
+    def __init__(self, seed_items=None):
+        self.seed_items = int(seed_items if seed_items is not None
+                              else os.getenv("INVENTORY_SEED_ITEMS", DEFAULT_SEED_ITEMS))
+        self._changed = {}   # Updated seeded items and every created item, by ID
+        self._deleted = []   # Deleted seeded IDs, sorted
+        self._next_id = self.seed_items + 1
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            created = sum(1 for item_id in self._changed if item_id > self.seed_items)
+            return self.seed_items - len(self._deleted) + created
+
+    @staticmethod
+    def seeded_item(item_id):
+        name, base_price = SEED_PRODUCTS[(item_id - 1) % len(SEED_PRODUCTS)]
+        return {
+            "id": item_id,
+            "name": f"{name} {item_id}",
+            "description": f"Seeded inventory item {item_id}",
+            "price": round(base_price * (0.8 + (item_id * 7919 % 41) / 100), 2),
+            "quantity": item_id * 104729 % 500,
+        }
+
+    def _is_deleted_seed(self, item_id):
+        index = bisect_left(self._deleted, item_id)
+        return index < len(self._deleted) and self._deleted[index] == item_id
+
+    def get(self, item_id):
+        """Return the item with an ID, or None."""
+        with self._lock:
+            item = self._changed.get(item_id)
+            if item is not None:
+                return dict(item)
+            if 1 <= item_id <= self.seed_items and not self._is_deleted_seed(item_id):
+                return self.seeded_item(item_id)
+            return None
+
+    def list(self, skip=0, limit=None):
+        """Return items in ID order, skipping `skip` and returning at most `limit`."""
+        with self._lock:
+            ids = self._live_ids(skip)
+            page = []
+            for item_id in ids:
+                if limit is not None and len(page) >= limit:
+                    break
+                page.append(self.get(item_id))
+            return page
+
+    def _live_ids(self, skip):
+        # Seeded IDs come first: the k-th live one is k plus the deleted IDs at or below it
+        live_seeded = self.seed_items - len(self._deleted)
+        if skip < live_seeded:
+            item_id = skip + 1
+            deleted = bisect_right(self._deleted, item_id)
+            while skip + 1 + deleted != item_id:
+                item_id = skip + 1 + deleted
+                deleted = bisect_right(self._deleted, item_id)
+            for item_id in range(item_id, self.seed_items + 1):
+                if deleted < len(self._deleted) and self._deleted[deleted] == item_id:
+                    deleted += 1
+                    continue
+                yield item_id
+
+        # Created IDs follow, in creation (and so ID) order
+        skip = max(0, skip - live_seeded)
+        created = (item_id for item_id in self._changed if item_id > self.seed_items)
+        for index, item_id in enumerate(created):
+            if index >= skip:
+                yield item_id
+
+    def create(self, fields):
+        with self._lock:
+            item = {"id": self._next_id, "name": fields["name"], "description": fields.get("description"),
+                    "price": fields["price"], "quantity": fields["quantity"]}
+            self._changed[item["id"]] = item
+            self._next_id += 1
+            return dict(item)
+
+    def update(self, item_id, fields):
+        """Apply the non-null fields to an item; returns None if it does not exist."""
+        with self._lock:
+            item = self.get(item_id)
+            if item is None:
+                return None
+            item.update({name: value for name, value in fields.items() if value is not None})
+            self._changed[item_id] = item
+            return dict(item)
+
+    def delete(self, item_id):
+        """Delete an item; returns it, or None if it does not exist."""
+        with self._lock:
+            item = self.get(item_id)
+            if item is None:
+                return None
+            self._changed.pop(item_id, None)
+            if item_id <= self.seed_items:
+                self._deleted.insert(bisect_left(self._deleted, item_id), item_id)
+            return item
+
+
+def validate_item(body, required=REQUIRED_FIELDS):
+    """
+    Check a request body against the ItemCreate/ItemUpdate schema.
+
+    Returns:
+        tuple: (fields, errors) - Known fields of the body, and FastAPI-style error entries
+    """
+    if not isinstance(body, dict):
+        return {}, [{"loc": ["body"], "msg": "Input should be a valid dictionary", "type": "dict_type"}]
+    errors = [{"loc": ["body", name], "msg": "Field required", "type": "missing"}
+              for name in required if name not in body]
+    fields = {}
+    for name, types in ITEM_FIELDS.items():
+        if name not in body:
+            continue
+        value = body[name]
+        nullable = name not in required
+        if isinstance(value, bool) or not (isinstance(value, types) or (nullable and value is None)):
+            errors.append({"loc": ["body", name], "msg": f"Invalid {name}", "type": "type_error"})
+        else:
+            fields[name] = value
+    return fields, errors
+
+
+class InventoryApiHandler(BaseHTTPRequestHandler):
+    """Serves the inventory_agent OpenAPI spec: /items/ and /items/{item_id} CRUD."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    @property
+    def store(self):
+        return self.server.store
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        logger.debug("📦 %s - %s", self.address_string(), format % args)
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/")
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            body = self._read_body()
+        except ValueError:
+            self._send_json(422, {"detail": [{"loc": ["body"], "msg": "Invalid JSON", "type": "json_invalid"}]})
+            return
+
+        server = self.server
+        time.sleep(server.draw_latency())
+        if server.inject_error():
+            self._send_json(server.error_status, {"detail": "Injected error (INVENTORY_ERROR_RATE)"},
+                            {"Retry-After": str(server.retry_after)})
+            return
+        server.count("requests")
+
+        match = ITEM_PATH.match(path)
+        if path == "/items" and method == "GET":
+            self._list_items(query)
+        elif path == "/items" and method == "POST":
+            self._create_item(body)
+        elif match and method in ("GET", "PUT", "DELETE"):
+            self._item(method, int(match.group(1)), body)
+        elif path == "/items" or match:
+            self._send_json(405, {"detail": "Method Not Allowed"})
+        else:
+            self._send_json(404, {"detail": "Not Found"})
+
+    def _list_items(self, query):
+        try:
+            skip = max(0, int(query.get("skip", 0)))
+            limit = int(query["limit"]) if "limit" in query else None
+        except ValueError:
+            self._send_json(422, {"detail": [{"loc": ["query"], "msg": "Invalid skip or limit", "type": "int_parsing"}]})
+            return
+        if self.server.list_limit:
+            limit = min(limit, self.server.list_limit) if limit is not None else self.server.list_limit
+        self._send_json(200, self.store.list(skip, limit))
+
+    def _create_item(self, body):
+        fields, errors = validate_item(body)
+        if errors:
+            self._send_json(422, {"detail": errors})
+            return
+        self._send_json(201, self.store.create(fields))
+
+    def _item(self, method, item_id, body):
+        if method == "GET":
+            item = self.store.get(item_id)
+        elif method == "DELETE":
+            item = self.store.delete(item_id)
+        else:
+            fields, errors = validate_item(body, required=())
+            if errors:
+                self._send_json(422, {"detail": errors})
+                return
+            item = self.store.update(item_id, fields)
+        if item is None:
+            self._send_json(404, {"detail": "Item not found"})
+        else:
+            self._send_json(200, item)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw) if raw else None
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        gzipped = len(data) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            data = gzip.compress(data, compresslevel=1)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class InventoryApiServer(ThreadingHTTPServer):
+    """
+    Local, in-memory implementation of the inventory API used by the inventory agent.
+
+    Implements the openapi_spec of agents/inventory_agent.py (list, create, get,
+    update and delete items) over keep-alive connections, backed by an
+    InventoryStore. GET /items/ also accepts skip and limit, and returns at most
+    INVENTORY_LIST_LIMIT items (100 by default), so a listing tool call on a store
+    seeded with millions of items cannot flood the model's context. Run it
+    with `python -m core.inventory_api_server` and set INVENTORY_API_URI to
+    `endpoint`; agents/inventory_agent.py and single-agent/agent3 then use it.
+
+    Args:
+        address: (host, port) to listen on; port 0 picks a free port
+        store (optional): InventoryStore. Defaults to one seeded from INVENTORY_SEED_ITEMS.
+        latency (optional): Spec of each request's latency, as in core.distributions
+            (INVENTORY_LATENCY, e.g. "uniform:0.02,0.08"; default 0)
+        error_rate (optional): Probability that a request fails (INVENTORY_ERROR_RATE)
+        error_status (optional): HTTP status of injected errors (INVENTORY_ERROR_STATUS, 503)
+        list_limit (optional): Max items returned by GET /items/ (INVENTORY_LIST_LIMIT, 100);
+            0 returns every item
+        retry_after (optional): Whole Retry-After seconds sent with injected errors
+            (INVENTORY_RETRY_AFTER, 1)
+        seed (optional): Seed for latency and error draws (FAKE_SEED)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, store=None, latency=None, error_rate=None, error_status=None,
+                 list_limit=None, retry_after=None, seed=None):
+        super().__init__(address, InventoryApiHandler)
+        self.store = store or InventoryStore()
+        seed = seed if seed is not None else os.getenv("FAKE_SEED")
+        self._rng = random.Random(int(seed) if seed not in (None, "") else None)
+        self.latency = Distribution(latency or os.getenv("INVENTORY_LATENCY", "0"), self._rng)
+        self.error_rate = float(error_rate if error_rate is not None else os.getenv("INVENTORY_ERROR_RATE", 0))
+        self.error_status = int(error_status or os.getenv("INVENTORY_ERROR_STATUS", DEFAULT_ERROR_STATUS))
+        self.list_limit = int(list_limit if list_limit is not None
+                              else os.getenv("INVENTORY_LIST_LIMIT", DEFAULT_LIST_LIMIT))
+        self.retry_after = int(retry_after if retry_after is not None
+                               else os.getenv("INVENTORY_RETRY_AFTER", DEFAULT_RETRY_AFTER))
+        self.counters = {"requests": 0, "injected_errors": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        """INVENTORY_API_URI value that targets this server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw_latency(self):
+        with self._lock:
+            return self.latency.sample()
+
+    def inject_error(self):
+        with self._lock:
+            injected = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if injected:
+                self.counters["injected_errors"] += 1
+            return injected
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+
+def start_server(host=DEFAULT_HOST, port=0, **options):
+    """
+    Start an InventoryApiServer on a background thread (e.g. inside a benchmark).
+
+    Returns:
+        InventoryApiServer: Running server; call shutdown() to stop it
+    """
+    server = InventoryApiServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="inventory-api-server", daemon=True).start()
+    logger.info("📦 Local inventory API listening at %s", server.endpoint)
+    return server
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Serve an in-memory implementation of the inventory API (settings from INVENTORY_* variables).")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--items", type=int, help="Seeded items (default: INVENTORY_SEED_ITEMS or 50)")
+    parser.add_argument("--latency", help="Latency spec per request, e.g. uniform:0.02,0.08")
+    return parser.parse_args()
+
+
+def main():
+    from dotenv import load_dotenv
+    from core.log_config import setup_logging
+
+    args = parse_args()
+    load_dotenv()
+    setup_logging()
+    server = InventoryApiServer((args.host, args.port), InventoryStore(args.items), latency=args.latency)
+    logger.info("📦 Local inventory API with %d items; set INVENTORY_API_URI=%s", len(server.store), server.endpoint)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("🛑 Stopped after %d requests (%d injected errors)",
+                    server.counters["requests"], server.counters["injected_errors"])
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
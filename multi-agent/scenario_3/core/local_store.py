@@ -0,0 +1,71 @@
+# core/local_store.py
+
+import json
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class JsonStore:
+    """
+    Small key/value store persisted as one JSON document on local disk.
+
+    The file is read on first access and rewritten atomically (temp file + rename)
+    after every change, so an interrupted run never leaves a truncated file.
+    All access is serialized with a lock, so concurrent provisioning threads can
+    share one store.
+
+    Args:
+        path: Path of the JSON file (created on first write)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._data = None
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._load().get(key, default)
+
+    def set(self, key, value):
+        with self._lock:
+            self._load()[key] = value
+            self._save()
+
+    def delete(self, key):
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._save()
+
+    def items(self):
+        """Return a snapshot of all (key, value) pairs."""
+        with self._lock:
+            return list(self._load().items())
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path, encoding="utf-8") as store_file:
+                    self._data = json.load(store_file)
+            except FileNotFoundError:
+                self._data = {}
+            except (OSError, ValueError) as e:
+                logger.warning("⚠️ Ignoring unreadable store %s: %s", self.path, e)
+                self._data = {}
+        return self._data
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(self._data, tmp_file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
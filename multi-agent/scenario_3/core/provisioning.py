@@ -0,0 +1,160 @@
+# core/provisioning.py
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from core.agent_registry import DEFAULT_REGISTRY
+from core.resource_manifest import DEFAULT_MANIFEST
+from core.tracing import traced, bind
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PROVISIONING_WORKERS = 4
+
+
+@dataclass
+class Step:
+    """
+    One provisioning step in a dependency graph.
+
+    `func` is called with the results of the `requires` steps, in that order,
+    once all of them have finished.
+    """
+    name: str
+    func: callable
+    requires: tuple = field(default_factory=tuple)
+
+
+def _check_graph(steps):
+    names = {step.name for step in steps}
+    if len(names) != len(steps):
+        raise ValueError("Provisioning step names must be unique")
+
+    for step in steps:
+        missing = set(step.requires) - names
+        if missing:
+            raise ValueError(f"Step {step.name} requires unknown steps: {sorted(missing)}")
+
+    # Kahn's algorithm: every step must become runnable eventually
+    remaining = {step.name: set(step.requires) for step in steps}
+    while remaining:
+        ready = [name for name, requires in remaining.items() if not requires]
+        if not ready:
+            raise ValueError(f"Provisioning steps have a dependency cycle: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for requires in remaining.values():
+            requires.difference_update(ready)
+
+
+@traced()
+def provision(project, steps, max_workers=None, upload_cache=None):
+    """
+    Run provisioning steps concurrently, each as soon as the steps it requires are done.
+
+    If any step fails, steps not yet started are skipped, running steps are allowed
+    to finish, and everything created during this call is deleted: agents first,
+    then vector stores and files (when an upload cache is given). Agents or uploads
+    that were reused or only updated are left untouched.
+
+    Args:
+        project: Azure AI Project client
+        steps: List of Step objects forming a dependency graph
+        max_workers (int, optional): Max steps running at once. Defaults to the
+            PROVISIONING_WORKERS environment variable, or 4.
+        upload_cache (optional): core.upload_cache.UploadCache whose new uploads
+            should be rolled back as well
+
+    Returns:
+        dict: Step name -> result of the step's function
+
+    Raises:
+        ValueError: If the steps do not form a valid dependency graph
+        Exception: The first step failure, re-raised after rollback
+    """
+    _check_graph(steps)
+    if max_workers is None:
+        max_workers = int(os.getenv("PROVISIONING_WORKERS", DEFAULT_PROVISIONING_WORKERS))
+
+    checkpoint = _created_so_far(upload_cache)
+    results = {}
+    pending = {step.name: step for step in steps}
+    running = {}
+    failure = None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while (pending or running) and failure is None:
+            for name, step in list(pending.items()):
+                if all(required in results for required in step.requires):
+                    args = [results[required] for required in step.requires]
+                    running[executor.submit(bind(step.func), *args)] = name
+                    del pending[name]
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error("❌ Provisioning step %s failed: %s", name, e)
+                    failure = failure or e
+
+        # Let in-flight steps finish so their resources can be rolled back too
+        wait(running)
+
+    if failure is not None:
+        rollback(project, _created_since(checkpoint, upload_cache), upload_cache)
+        raise failure
+
+    return results
+
+
+def _created_so_far(upload_cache):
+    return {
+        "agents": len(DEFAULT_REGISTRY.created_in_session),
+        "vector_stores": len(upload_cache.created_in_session["vector_stores"]) if upload_cache else 0,
+        "files": len(upload_cache.created_in_session["files"]) if upload_cache else 0,
+    }
+
+
+def _created_since(checkpoint, upload_cache):
+    created = {"agents": DEFAULT_REGISTRY.created_in_session[checkpoint["agents"]:]}
+    for kind in ("vector_stores", "files"):
+        created[kind] = upload_cache.created_in_session[kind][checkpoint[kind]:] if upload_cache else []
+    return created
+
+
+@traced()
+def rollback(project, created, upload_cache=None):
+    """
+    Delete resources created by a failed provisioning run, dependents first.
+
+    Args:
+        project: Azure AI Project client
+        created: Dict with "agents", "vector_stores" and "files" ID lists
+        upload_cache (optional): Upload cache to drop the deleted uploads from
+    """
+    if not any(created.values()):
+        return
+
+    logger.info("↩️ Rolling back resources created during provisioning...")
+    deleters = {
+        "agents": project.agents.delete_agent,
+        "vector_stores": lambda resource_id: project.agents.vector_stores.delete(resource_id),
+        "files": lambda resource_id: project.agents.files.delete(resource_id),
+    }
+
+    for kind in ("agents", "vector_stores", "files"):
+        for resource_id in created[kind]:
+            try:
+                deleters[kind](resource_id)
+                DEFAULT_MANIFEST.forget(resource_id)
+                if kind == "agents":
+                    DEFAULT_REGISTRY.forget(resource_id)
+                elif upload_cache:
+                    upload_cache.forget(resource_id)
+                logger.info("🗑️ Deleted %s: %s", kind[:-1].replace('_', ' '), resource_id)
+            except Exception as e:
+                logger.warning("⚠️ Failed to delete %s %s: %s", kind[:-1].replace('_', ' '), resource_id, e)
@@ -0,0 +1,42 @@
+# core/run_steps.py
+
+
+def read_field(obj, key):
+    """Read a field from an SDK model (mapping-style) or a plain object."""
+    if obj is None:
+        return None
+    try:
+        return obj.get(key)
+    except AttributeError:
+        return getattr(obj, key, None)
+
+
+def describe_tool_call(tool_call):
+    """
+    Build a short label for a run step tool call.
+
+    Args:
+        tool_call: Tool call from a run step (connected agent, OpenAPI, code interpreter, ...)
+
+    Returns:
+        str: Label such as 'connected_agent:inventory_agent' or 'code_interpreter'
+    """
+    tool_type = read_field(tool_call, "type") or "tool"
+    detail = read_field(tool_call, tool_type)
+    name = read_field(detail, "name") or read_field(tool_call, "name")
+    return f"{tool_type}:{name}" if name else tool_type
+
+
+def step_tool_labels(step):
+    """
+    List labels for every tool call made in a run step.
+
+    Args:
+        step: Run step object
+
+    Returns:
+        list[str]: One label per tool call (empty for message creation steps)
+    """
+    details = read_field(step, "step_details")
+    tool_calls = read_field(details, "tool_calls") or []
+    return [describe_tool_call(tool_call) for tool_call in tool_calls]
@@ -0,0 +1,59 @@
+# core/streaming.py
+
+from azure.ai.agents.models import AgentEventHandler
+from core.log_config import flush_logs
+from core.run_steps import step_tool_labels
+
+
+class ConsoleStreamHandler(AgentEventHandler):
+    """
+    Agent event handler that prints message deltas as they arrive and reports tool steps.
+
+    Attributes:
+        run: Latest run object received from the stream (the final run once done)
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.run = None
+        self._text_parts = []
+        self._message_id = None
+        self._reported_steps = set()
+
+    @property
+    def text(self):
+        """Full assistant text streamed during the run."""
+        return "".join(self._text_parts)
+
+    def on_message_delta(self, delta):
+        if delta.id != self._message_id:
+            self._message_id = delta.id
+            # Status lines logged before the reply must not land inside it
+            flush_logs()
+            print("\n🧠 Assistant: ", end="", flush=True)
+
+        if delta.text:
+            self._text_parts.append(delta.text)
+            print(delta.text, end="", flush=True)
+
+    def on_thread_message(self, message):
+        if message.id == self._message_id and message.status == "completed":
+            print()
+
+    def on_thread_run(self, run):
+        self.run = run
+
+    def on_run_step(self, step):
+        if step.type != "tool_calls" or (step.id, step.status) in self._reported_steps:
+            return
+
+        self._reported_steps.add((step.id, step.status))
+        flush_logs()
+        for label in step_tool_labels(step):
+            print(f"🔧 {label} — {step.status}")
+
+    def on_error(self, data):
+        print(f"\n❌ Stream error: {data}")
+
+    def on_unhandled_event(self, event_type, event_data):
+        pass
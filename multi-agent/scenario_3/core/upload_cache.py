@@ -0,0 +1,221 @@
+# core/upload_cache.py
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from core.azure_client import project_endpoint
+from core.local_store import JsonStore
+from core.polling import AdaptivePolling
+from core.resource_manifest import DEFAULT_MANIFEST
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_UPLOAD_CACHE_PATH = "upload_cache.json"
+INDEXING_TIMEOUT = 300
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a local file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as local_file:
+        for chunk in iter(lambda: local_file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_key(endpoint, name):
+    return f"{endpoint}#{name}" if endpoint else name
+
+
+def _status(vector_store):
+    return getattr(vector_store.status, "value", vector_store.status)
+
+
+def fully_indexed(vector_store):
+    """Return True if a vector store finished indexing without failed files."""
+    file_counts = getattr(vector_store, "file_counts", None)
+    return vector_store.status == "completed" and not getattr(file_counts, "failed", 0)
+
+
+class UploadCache:
+    """
+    Content-addressed cache of uploaded files and the vector stores built from them.
+
+    Files are keyed by the SHA-256 of their bytes and vector stores by their name and
+    file IDs, both per project endpoint, so unchanged data is neither re-uploaded nor
+    re-indexed and switching PROJECT_ENDPOINT never overwrites another project's
+    entries. Cached IDs are verified against the service before reuse and replaced
+    only if they no longer exist (404); other errors are raised rather than leaking a
+    duplicate. Only vector stores that indexed every file are cached, and a cached one
+    is reused once its indexing has completed.
+
+    Args:
+        path (optional): Cache file. Defaults to UPLOAD_CACHE_PATH or upload_cache.json.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._store = None
+        self._lock = threading.Lock()
+        self.created_in_session = {"files": [], "vector_stores": []}
+
+    @property
+    def store(self):
+        with self._lock:
+            if self._store is None:
+                self._store = JsonStore(
+                    self._path or os.getenv("UPLOAD_CACHE_PATH", DEFAULT_UPLOAD_CACHE_PATH))
+            return self._store
+
+    @traced()
+    def upload_file(self, project, file_path, purpose=None):
+        """
+        Return an uploaded file with the content of file_path, uploading only if needed.
+
+        Args:
+            project: Azure AI Project client
+            file_path: Path of the local file
+            purpose (optional): Upload purpose. Defaults to FilePurpose.AGENTS.
+
+        Returns:
+            file: Uploaded file object (reused or new)
+
+        Raises:
+            Exception: If the upload fails
+        """
+        endpoint = project_endpoint(project)
+        name = f"file:{file_sha256(file_path)}"
+        key, entry, legacy = self._lookup(endpoint, name)
+
+        if entry or legacy:
+            from azure.core.exceptions import ResourceNotFoundError
+
+            cached = entry or legacy
+            try:
+                file = project.agents.files.get(cached["id"])
+                logger.info("♻️ Reusing uploaded file for %s: %s", file_path, file.id)
+                if legacy:
+                    self._adopt(name, key, legacy, endpoint)
+                return file
+            except ResourceNotFoundError:
+                logger.warning("⚠️ Cached file %s no longer exists, uploading again", cached['id'])
+
+        if purpose is None:
+            from azure.ai.agents.models import FilePurpose
+
+            purpose = FilePurpose.AGENTS
+        file = project.agents.files.upload(file_path=file_path, purpose=purpose)
+        self._record_created(file.id, "files")
+        self._remember(key, file.id, endpoint, source=os.path.basename(file_path))
+        return file
+
+    @traced()
+    def get_or_create_vector_store(self, project, file_ids, name):
+        """
+        Return an indexed vector store over file_ids, creating and indexing it only if needed.
+
+        Args:
+            project: Azure AI Project client
+            file_ids: IDs of the files to index
+            name: Vector store name
+
+        Returns:
+            vector_store: Vector store object (reused or new). A new store whose indexing
+                failed, or left files unindexed, is returned but not cached.
+
+        Raises:
+            TimeoutError: If the cached vector store is still indexing after INDEXING_TIMEOUT seconds
+            Exception: If vector store creation fails
+        """
+        endpoint = project_endpoint(project)
+        cache_name = f"vector_store:{name}:{','.join(sorted(file_ids))}"
+        key, entry, legacy = self._lookup(endpoint, cache_name)
+
+        if entry or legacy:
+            vector_store = self._cached_vector_store(project, (entry or legacy)["id"])
+            if vector_store is not None:
+                logger.info("♻️ Reusing vector store %s: %s", name, vector_store.id)
+                if legacy:
+                    self._adopt(cache_name, key, legacy, endpoint)
+                return vector_store
+
+        vector_store = project.agents.vector_stores.create_and_poll(file_ids=file_ids, name=name)
+        self._record_created(vector_store.id, "vector_stores")
+        if fully_indexed(vector_store):
+            self._remember(key, vector_store.id, endpoint, source=name)
+        else:
+            logger.warning("⚠️ Vector store %s is %s with %s failed file(s); not caching it",
+                           vector_store.id, _status(vector_store),
+                           getattr(getattr(vector_store, "file_counts", None), "failed", 0))
+        return vector_store
+
+    def _cached_vector_store(self, project, vector_store_id):
+        """Return the cached vector store once indexed, or None if it is gone or unusable."""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            vector_store = project.agents.vector_stores.get(vector_store_id)
+            deadline = time.monotonic() + INDEXING_TIMEOUT
+            for interval in AdaptivePolling().intervals():
+                if vector_store.status != "in_progress" or time.monotonic() + interval > deadline:
+                    break
+                logger.debug("⏳ Cached vector store %s is still indexing", vector_store_id)
+                time.sleep(interval)
+                vector_store = project.agents.vector_stores.get(vector_store_id)
+        except ResourceNotFoundError:
+            logger.warning("⚠️ Cached vector store %s no longer exists, recreating it", vector_store_id)
+            return None
+
+        if fully_indexed(vector_store):
+            return vector_store
+        if vector_store.status == "in_progress":
+            raise TimeoutError(f"Vector store {vector_store_id} still indexing after {INDEXING_TIMEOUT}s")
+
+        logger.warning("⚠️ Cached vector store %s is %s or missing files, recreating it",
+                       vector_store_id, _status(vector_store))
+        try:
+            project.agents.vector_stores.delete(vector_store_id)
+            DEFAULT_MANIFEST.forget(vector_store_id)
+        except Exception as e:
+            logger.warning("⚠️ Failed to delete vector store %s: %s", vector_store_id, e)
+        return None
+
+    def forget(self, resource_id):
+        """Remove a file or vector store from the cache, e.g. after deleting it."""
+        for key, entry in self.store.items():
+            if entry.get("id") == resource_id:
+                self.store.delete(key)
+
+    def _lookup(self, endpoint, name):
+        """Return (key, entry, legacy): legacy is an entry from before keys had an endpoint."""
+        key = _cache_key(endpoint, name)
+        entry = self.store.get(key)
+        legacy = self.store.get(name) if entry is None and key != name else None
+        return key, entry, legacy
+
+    def _adopt(self, name, key, legacy, endpoint):
+        # The legacy entry's resource exists in this project, so it belongs to this endpoint
+        self.store.delete(name)
+        self.store.set(key, {**legacy, "endpoint": endpoint})
+
+    def _record_created(self, resource_id, kind):
+        with self._lock:
+            self.created_in_session[kind].append(resource_id)
+        DEFAULT_MANIFEST.record(kind, resource_id)
+
+    def _remember(self, key, resource_id, endpoint, source):
+        self.store.set(key, {
+            "id": resource_id,
+            "endpoint": endpoint,
+            "source": source,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+
+# Shared by every factory in the process so created_in_session covers the whole run.
+DEFAULT_UPLOAD_CACHE = UploadCache()
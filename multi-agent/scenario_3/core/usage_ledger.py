@@ -0,0 +1,276 @@
+# core/usage_ledger.py
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from core.agent_registry import DEFAULT_REGISTRY
+from core.log_config import flush_logs
+from core.run_profiler import ended_at, list_run_steps, seconds_between
+from core.run_steps import read_field, step_tool_labels
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_USAGE_LEDGER = "usage_ledger.jsonl"
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+SUMMARY_TOP_TURNS = 3
+PROMPT_PREVIEW_CHARS = 60
+
+LEDGER_COLUMNS = (
+    "timestamp", "session_id", "entry", "role", "agent", "agent_id", "thread_id", "run_id",
+    "step_id", "status", "tools", "prompt_chars", "prompt_preview", "duration_seconds",
+    "prompt_tokens", "completion_tokens", "total_tokens",
+)
+
+_TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+def usage_tracking_enabled():
+    """Return True unless USAGE_TRACKING is set to 'false'."""
+    return os.getenv("USAGE_TRACKING", "true").lower() == "true"
+
+
+def _tokens(usage):
+    return {field: read_field(usage, field) for field in _TOKEN_FIELDS}
+
+
+class UsageLedger:
+    """
+    Token usage per run, run step and connected-agent call, with per-session totals.
+
+    After each run the ledger lists the run's steps on a background thread, so the
+    reply is never delayed, and writes one entry per run, step and connected-agent
+    call to USAGE_LEDGER (JSON lines, or SQLite for a .db/.sqlite path):
+
+    - run: the run's own usage, attributed to the agent that was run (the orchestrator),
+      and the wall-clock seconds the client waited for it
+    - step: each model call of the orchestrator, with the tools it called
+    - connected_agent: each call into a connected agent, with that agent's usage
+      when the service reports it (its sub-run is looked up when the step links it)
+
+    Totals per agent and the most expensive turns are printed by print_summary, which
+    register_summary_at_exit runs when the process ends.
+
+    Args:
+        path (optional): Ledger file. Defaults to USAGE_LEDGER or usage_ledger.jsonl.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._executor = None
+        self._prompts = {}
+        self._turns = []
+        # Token totals stay None while the service has reported no usage for an agent
+        self._totals = defaultdict(lambda: {"role": None, "runs": 0, "calls": 0,
+                                            **{field: None for field in _TOKEN_FIELDS}})
+        self.session_id = f"{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+    @property
+    def path(self):
+        return self._path or os.getenv("USAGE_LEDGER", DEFAULT_USAGE_LEDGER)
+
+    def note_prompt(self, thread_id, content):
+        """Remember the user message sent on a thread, to label the next run's entries."""
+        with self._lock:
+            self._prompts[thread_id] = content
+
+    def record_run(self, project, thread_id, run, steps=None, duration=None):
+        """
+        Queue a finished run for accounting; returns immediately.
+
+        Args:
+            project: Azure AI Project client (sync), used to list steps and sub-runs
+            thread_id: ID of the conversation thread
+            run: Run object in its final status
+            steps (optional): Run steps, if the caller has already listed them
+            duration (optional): Seconds from runs.create to the final status, measured by
+                the caller. Defaults to the run's timestamps, which have whole-second resolution.
+        """
+        if not usage_tracking_enabled():
+            return
+        with self._lock:
+            prompt = self._prompts.pop(thread_id, None)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="usage-ledger")
+            self._executor.submit(self._record, project, thread_id, run, steps, prompt, duration)
+
+    def record_entries(self, thread_id, run, steps, prompt=None, project=None, duration=None):
+        """
+        Build, write and total the entries of a run synchronously.
+
+        Used by record_run's worker and by async callers that list steps themselves.
+
+        Returns:
+            list[dict]: The ledger entries written
+        """
+        entries = self._build_entries(thread_id, run, steps, prompt, project, duration)
+        self._write(entries)
+        self._add_to_totals(entries)
+        return entries
+
+    def _record(self, project, thread_id, run, steps, prompt, duration):
+        try:
+            if steps is None:
+                steps = list_run_steps(project, thread_id, run)
+            self.record_entries(thread_id, run, steps, prompt, project, duration)
+        except Exception as e:
+            logger.warning("⚠️ Failed to record usage of run %s: %s", run.id, e)
+
+    def _build_entries(self, thread_id, run, steps, prompt, project, duration):
+        agent_id = getattr(run, "agent_id", None)  # REST name is assistant_id
+        agent = DEFAULT_REGISTRY.name_of(agent_id) or agent_id
+        base = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "session_id": self.session_id,
+            "thread_id": thread_id,
+            "run_id": run.id,
+            "prompt_chars": len(prompt) if prompt is not None else None,
+            "prompt_preview": prompt[:PROMPT_PREVIEW_CHARS] if prompt is not None else None,
+        }
+        if duration is None:
+            duration = seconds_between(read_field(run, "created_at"), ended_at(run))
+        entries = [{
+            **base, "entry": "run", "role": "orchestrator", "agent": agent, "agent_id": agent_id,
+            "step_id": None, "status": run.status, "tools": None, "duration_seconds": duration,
+            **_tokens(read_field(run, "usage")),
+        }]
+
+        for step in steps:
+            labels = step_tool_labels(step)
+            entries.append({
+                **base, "entry": "step", "role": "orchestrator", "agent": agent, "agent_id": agent_id,
+                "step_id": step.id, "status": step.status, "tools": ", ".join(labels) or None,
+                "duration_seconds": seconds_between(read_field(step, "created_at"), ended_at(step)),
+                **_tokens(read_field(step, "usage")),
+            })
+            tool_calls = read_field(read_field(step, "step_details"), "tool_calls") or []
+            for tool_call in tool_calls:
+                if read_field(tool_call, "type") == "connected_agent":
+                    entries.append(self._connected_entry(base, step, tool_call, project))
+        return entries
+
+    def _connected_entry(self, base, step, tool_call, project):
+        details = read_field(tool_call, "connected_agent")
+        usage = read_field(details, "usage") or read_field(tool_call, "usage")
+        sub_run_id, sub_thread_id = read_field(details, "run_id"), read_field(details, "thread_id")
+        if usage is None and project is not None and sub_run_id and sub_thread_id:
+            try:
+                usage = read_field(project.agents.runs.get(thread_id=sub_thread_id, run_id=sub_run_id), "usage")
+            except Exception as e:
+                logger.debug("📡 Connected-agent run %s not readable: %s", sub_run_id, e)
+        return {
+            **base, "entry": "connected_agent", "role": "connected",
+            "agent": read_field(details, "name") or read_field(tool_call, "name") or "connected_agent",
+            "agent_id": read_field(details, "agent_id"), "step_id": step.id, "status": step.status,
+            "tools": None, "duration_seconds": None, **_tokens(usage),
+        }
+
+    def _write(self, entries):
+        path = self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith(SQLITE_SUFFIXES):
+            self._write_sqlite(path, entries)
+            return
+        with open(path, "a", encoding="utf-8") as ledger:
+            ledger.write("".join(json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+                                 for entry in entries))
+
+    @staticmethod
+    def _write_sqlite(path, entries):
+        connection = sqlite3.connect(path)
+        try:
+            with connection:
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS usage ({', '.join(LEDGER_COLUMNS)})")
+                connection.executemany(
+                    f"INSERT INTO usage VALUES ({', '.join('?' * len(LEDGER_COLUMNS))})",
+                    [tuple(entry.get(column) for column in LEDGER_COLUMNS) for entry in entries])
+        finally:
+            connection.close()
+
+    def _add_to_totals(self, entries):
+        with self._lock:
+            for entry in entries:
+                if entry["entry"] == "step":
+                    continue  # Already included in the run's usage
+                totals = self._totals[entry["agent"]]
+                totals["role"] = entry["role"]
+                totals["runs" if entry["entry"] == "run" else "calls"] += 1
+                for field in _TOKEN_FIELDS:
+                    if entry[field] is not None:
+                        totals[field] = (totals[field] or 0) + entry[field]
+
+            run = entries[0]
+            connected = sum(entry["total_tokens"] or 0 for entry in entries
+                            if entry["entry"] == "connected_agent")
+            self._turns.append({**run, "total_tokens": (run["total_tokens"] or 0) + connected})
+
+    def totals(self):
+        """
+        Return {agent: {role, runs, calls, prompt_tokens, completion_tokens, total_tokens}}.
+
+        Token counts are None for agents whose usage the service never reported.
+        """
+        self.flush()
+        with self._lock:
+            return {agent: dict(values) for agent, values in self._totals.items()}
+
+    def flush(self, timeout=30):
+        """Wait (up to timeout seconds) for queued runs to be recorded."""
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            done = threading.Event()
+            try:
+                executor.submit(done.set)
+            except RuntimeError:
+                return  # Shut down at interpreter exit, which first finishes queued runs
+            done.wait(timeout)
+
+    def print_summary(self):
+        """Print token totals per agent and the most expensive turns of this session."""
+        totals = self.totals()
+        if not totals:
+            return
+        flush_logs()
+
+        def tokens(value):
+            return "unknown" if value is None else value
+
+        print(f"\n🧾 Token usage this session (ledger: {self.path})")
+        print(f"   {'Agent':<28} {'Role':<12} {'Runs':>5} {'Calls':>6} {'Prompt':>9} {'Completion':>11} {'Total':>9}")
+        for agent, values in sorted(totals.items(), key=lambda item: item[1]["total_tokens"] or 0, reverse=True):
+            print(f"   {agent:<28} {values['role']:<12} {values['runs']:>5} {values['calls']:>6} "
+                  f"{tokens(values['prompt_tokens']):>9} {tokens(values['completion_tokens']):>11} "
+                  f"{tokens(values['total_tokens']):>9}")
+        grand_total = sum(values["total_tokens"] or 0 for values in totals.values())
+        print(f"   {'All agents':<28} {'':<12} {'':>5} {'':>6} {'':>9} {'':>11} {grand_total:>9}")
+        if any(values["total_tokens"] is None for values in totals.values()):
+            print("   (unknown: the service reported no usage for those calls; not included in the total)")
+
+        with self._lock:
+            turns = sorted(self._turns, key=lambda turn: turn["total_tokens"], reverse=True)
+        print("\n   Most expensive turns:")
+        for turn in turns[:SUMMARY_TOP_TURNS]:
+            duration = f"{turn['duration_seconds']:.2f}s" if turn["duration_seconds"] is not None else "-"
+            prompt = turn["prompt_preview"] or turn["run_id"]
+            print(f"   {turn['total_tokens']:>9} tokens  {duration:>7}  {prompt!r}")
+
+
+def register_summary_at_exit(ledger=None):
+    """Print the ledger's session summary when the process exits (no-op if USAGE_TRACKING=false)."""
+    if usage_tracking_enabled():
+        atexit.register((ledger or DEFAULT_LEDGER).print_summary)
+
+
+# Shared by every conversation in the process so the summary covers the whole session.
+DEFAULT_LEDGER = UsageLedger()
@@ -1,9 +1,17 @@
 # main.py
 
+import logging
 import sys
+from dotenv import load_dotenv
 from settings import load_configuration
 from core.azure_client import connect_to_project
+from core.log_config import setup_logging, flush_logs
+from core.tracing import setup_tracing, span
 from core.cleanup_utils import delete_agents
+from core.provisioning import Step, provision
+from core.resource_manifest import register_teardown_at_exit
+from core.usage_ledger import register_summary_at_exit
+from core.upload_cache import DEFAULT_UPLOAD_CACHE
 from agents.knowledge_agent import create_knowledge_agent
 from agents.inventory_agent import create_inventory_agent
 from agents.sales_agent import create_sales_agent
@@ -12,14 +20,31 @@ from core.conversation_manager import (
     create_thread,
     send_user_message,
     run_agent,
+    stream_agent,
     display_agent_responses
 )
+from core.parallel_demo import run_questions_concurrently, print_demo_results
+
+logger = logging.getLogger(__name__)
+
+
+DEMO_QUESTIONS = [
+    "Hi! Are there any apples in stock?",
+    "What's our company policy on returns?",
+    "Can you analyze last month's sales performance?",
+    "Show me all available products",
+    "What are the top selling items?"
+]
 
 
 def create_inventory_system(project, model_name):
     """
     Create and initialize the complete inventory management system with all agents.
 
+    The knowledge, inventory and sales agents (with their uploads and vector store) are
+    provisioned concurrently; the store manager follows once their tools are ready.
+    On failure, everything created during provisioning is deleted again.
+
     Args:
         project: Azure AI Project client
         model_name: Name of the model deployment to use
@@ -28,43 +53,53 @@ def create_inventory_system(project, model_name):
         tuple: All created agents (knowledge, inventory, sales, store_manager)
     """
     try:
-        print("")
-        print("🏗️ Building Inventory Management System...")
-
-        knowledge_agent, knowledge_agent_tool = create_knowledge_agent(
-            project, model_name, './data/company.md')
-        inventory_agent, inventory_agent_tool = create_inventory_agent(
-            project, model_name)
-        sales_agent, sales_agent_tool = create_sales_agent(
-            project, model_name, './data/sales_data.csv')
-        store_manager_agent = create_main_agent(
-            project, model_name, knowledge_agent_tool, inventory_agent_tool, sales_agent_tool)
-
-        print("✅ Inventory management system ready!")
+        logger.info("🏗️ Building Inventory Management System...")
+
+        results = provision(project, [
+            Step("knowledge", lambda: create_knowledge_agent(
+                project, model_name, './data/company.md')),
+            Step("inventory", lambda: create_inventory_agent(project, model_name)),
+            Step("sales", lambda: create_sales_agent(
+                project, model_name, './data/sales_data.csv')),
+            Step("store_manager", lambda knowledge, inventory, sales: create_main_agent(
+                project, model_name, knowledge[1], inventory[1], sales[1]),
+                requires=("knowledge", "inventory", "sales")),
+        ], upload_cache=DEFAULT_UPLOAD_CACHE)
+
+        knowledge_agent = results["knowledge"][0]
+        inventory_agent = results["inventory"][0]
+        sales_agent = results["sales"][0]
+        store_manager_agent = results["store_manager"]
+
+        logger.info("✅ Inventory management system ready!")
         return knowledge_agent, inventory_agent, sales_agent, store_manager_agent
 
     except Exception as e:
-        print(f"❌ Failed to create inventory system: {e}")
+        logger.error("❌ Failed to create inventory system: %s", e)
         raise
 
 
-def interactive_session(project, store_manager_agent):
+def interactive_session(project, store_manager_agent, stream=True):
     """
     Start an interactive chat session with the store manager agent.
 
     Args:
         project: Azure AI Project client
         store_manager_agent: The main store manager agent
+        stream (bool, optional): Stream replies token by token. Defaults to True.
     """
     try:
         thread = create_thread(project)
 
+        flush_logs()
         print("\n🎉 Welcome to your Inventory Management System!")
         print("Ask me about inventory, company policies, sales analysis, or product availability.")
         print("Type 'quit' to exit.\n")
 
         while True:
+            in_turn = False
             try:
+                flush_logs()
                 user_input = input("👤 You: ").strip()
 
                 if user_input.lower() in ['quit', 'exit', 'bye']:
@@ -74,20 +109,30 @@ def interactive_session(project, store_manager_agent):
                 if not user_input:
                     continue
 
-                send_user_message(project, thread, user_input)
-                run = run_agent(project, thread, store_manager_agent)
-                display_agent_responses(project, thread, run)
+                in_turn = True
+                with span("turn"):
+                    send_user_message(project, thread, user_input)
+                    if stream:
+                        stream_agent(project, thread, store_manager_agent)
+                    else:
+                        run = run_agent(project, thread, store_manager_agent)
+                        display_agent_responses(project, thread, run)
                 print()
 
             except KeyboardInterrupt:
+                if in_turn:
+                    # The run was cancelled server-side; keep chatting on the same thread
+                    flush_logs()
+                    print("⛔ Request cancelled. Ask something else or type 'quit' to exit.")
+                    continue
                 print("\n👋 Session ended. Have a great day!")
                 break
             except Exception as e:
-                print(f"❌ Error during conversation: {e}")
+                logger.error("❌ Error during conversation: %s", e)
                 continue
 
     except Exception as e:
-        print(f"❌ Failed to start interactive session: {e}")
+        logger.error("❌ Failed to start interactive session: %s", e)
         raise
 
 
@@ -102,33 +147,52 @@ def demo_session(project, store_manager_agent):
     try:
         thread = create_thread(project)
 
-        demo_questions = [
-            "Hi! Are there any apples in stock?",
-            "What's our company policy on returns?",
-            "Can you analyze last month's sales performance?",
-            "Show me all available products",
-            "What are the top selling items?"
-        ]
-
+        flush_logs()
         print("\n🎬 Running Inventory Management Demo Session...")
         print("=" * 50)
 
-        for question in demo_questions:
+        for question in DEMO_QUESTIONS:
             try:
+                flush_logs()
                 print(f"\n💭 Demo Question: {question}")
                 print("-" * 40)
 
-                send_user_message(project, thread, question)
-                run = run_agent(project, thread, store_manager_agent)
-                display_agent_responses(project, thread, run)
+                with span("turn"):
+                    send_user_message(project, thread, question)
+                    run = run_agent(project, thread, store_manager_agent)
+                    display_agent_responses(project, thread, run)
                 print()
 
             except Exception as e:
-                print(f"❌ Error processing demo question '{question}': {e}")
+                logger.error("❌ Error processing demo question '%s': %s", question, e)
                 continue
 
     except Exception as e:
-        print(f"❌ Failed to run demo session: {e}")
+        logger.error("❌ Failed to run demo session: %s", e)
+        raise
+
+
+def parallel_demo_session(project, store_manager_agent, max_concurrency=None):
+    """
+    Run the demo questions in parallel, each on its own thread.
+
+    Args:
+        project: Azure AI Project client
+        store_manager_agent: The main inventory management agent
+        max_concurrency (int, optional): Max questions in flight at once. Defaults to the
+            DEMO_MAX_CONCURRENCY environment variable, or 4.
+    """
+    try:
+        flush_logs()
+        print("\n🎬 Running Inventory Management Parallel Demo Session...")
+        print("=" * 50)
+
+        results, total_elapsed = run_questions_concurrently(
+            project, store_manager_agent, DEMO_QUESTIONS, max_concurrency)
+        print_demo_results(results, total_elapsed)
+
+    except Exception as e:
+        logger.error("❌ Failed to run parallel demo session: %s", e)
         raise
 
 
@@ -137,24 +201,34 @@ def main():
     Main entry point for the inventory management system.
     """
     try:
-        print("🚀 Starting Inventory Management System...")
+        # .env first, so LOG_* and TRACING settings apply from the first line
+        load_dotenv()
+        setup_logging()
+        setup_tracing("inventory-management")
+        logger.info("🚀 Starting Inventory Management System...")
 
         endpoint, model_name = load_configuration()
         project = connect_to_project(endpoint)
+        register_teardown_at_exit(project)
+        register_summary_at_exit()
 
         _, _, _, store_manager_agent = create_inventory_system(
             project, model_name)
 
+        flush_logs()
         print("\nSelect session type:")
         print("1. Interactive session (chat with the system)")
         print("2. Demo session (see predefined examples)")
+        print("3. Parallel demo session (each example on its own thread)")
 
-        choice = input("Enter choice (1 or 2): ").strip()
+        choice = input("Enter choice (1, 2 or 3): ").strip()
 
         if choice == "1":
             interactive_session(project, store_manager_agent)
         elif choice == "2":
             demo_session(project, store_manager_agent)
+        elif choice == "3":
+            parallel_demo_session(project, store_manager_agent)
         else:
             print("Running demo session by default...")
             demo_session(project, store_manager_agent)
@@ -163,15 +237,15 @@ def main():
         # print("\n🧹 Cleaning up agents...")
         # delete_agents(project, store_manager_agent, knowledge_agent, inventory_agent, sales_agent)
 
-        print("🎉 Inventory Management System session completed!")
+        logger.info("🎉 Inventory Management System session completed!")
 
     except KeyboardInterrupt:
-        print("\n🛑 Program interrupted by user")
+        logger.info("🛑 Program interrupted by user")
     except Exception as e:
-        print(f"💥 Unexpected error: {e}")
+        logger.error("💥 Unexpected error: %s", e)
         sys.exit(1)
     finally:
-        print("🔴 Program terminated")
+        logger.info("🔴 Program terminated")
 
 
 if __name__ == "__main__":
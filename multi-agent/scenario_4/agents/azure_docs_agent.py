@@ -1,11 +1,20 @@
 # agents/azure_docs_agent.py
 
+import logging
 import os
-from azure.ai.projects import AIProjectClient
-from azure.ai.agents.models import McpTool, ConnectedAgentTool
+from typing import TYPE_CHECKING
+from core.agent_registry import DEFAULT_REGISTRY
+from core.tracing import traced, set_attributes
 
+logger = logging.getLogger(__name__)
 
-def create_azure_docs_agent(project: AIProjectClient, model_name: str):
+
+if TYPE_CHECKING:
+    from azure.ai.projects import AIProjectClient
+
+
+@traced()
+def create_azure_docs_agent(project: "AIProjectClient", model_name: str):
     """
     Create an Azure documentation agent with MCP tools for Azure REST API documentation.
 
@@ -19,6 +28,8 @@ def create_azure_docs_agent(project: AIProjectClient, model_name: str):
     Raises:
         Exception: If agent creation fails
     """
+    from azure.ai.agents.models import McpTool, ConnectedAgentTool
+
     agent_name = "azure_docs_agent"
     agent_description = "Specialized agent for Azure REST API documentation and specifications"
     agent_instructions = (
@@ -47,7 +58,7 @@ def create_azure_docs_agent(project: AIProjectClient, model_name: str):
         "Focus on providing comprehensive, accurate Azure documentation and API information!"
     )
 
-    print(f"🤖 Creating agent ({agent_name})...")
+    logger.info("🤖 Creating agent (%s)...", agent_name)
 
     try:
         # Get MCP server configuration from environment variables
@@ -55,8 +66,7 @@ def create_azure_docs_agent(project: AIProjectClient, model_name: str):
             "MCP_SERVER_URL_AZURE_REST", "https://gitmcp.io/Azure/azure-rest-api-specs")
         mcp_server_label = os.environ.get("MCP_SERVER_LABEL", "github")
 
-        print(
-            f"🔗 Configuring MCP server: {mcp_server_label} at {mcp_server_url}")
+        logger.info("🔗 Configuring MCP server: %s at %s", mcp_server_label, mcp_server_url)
 
         # Initialize agent MCP tool
         mcp_tool = McpTool(
@@ -69,12 +79,13 @@ def create_azure_docs_agent(project: AIProjectClient, model_name: str):
         search_api_code = "search_azure_rest_api_code"
         mcp_tool.allow_tool(search_api_code)
 
-        print(f"🔧 Configured MCP tools: {mcp_tool.allowed_tools}")
+        logger.info("🔧 Configured MCP tools: %s", mcp_tool.allowed_tools)
 
         # Update headers if needed
         mcp_tool.update_headers("User-Agent", "AzureDocsAgent/1.0")
 
-        agent = project.agents.create_agent(
+        agent = DEFAULT_REGISTRY.get_or_create_agent(
+            project,
             model=model_name,
             name=agent_name,
             description=agent_description,
@@ -82,7 +93,8 @@ def create_azure_docs_agent(project: AIProjectClient, model_name: str):
             tools=mcp_tool.definitions,
             tool_resources=mcp_tool.resources
         )
-        print(f"✅ Created {agent_name}, ID: {agent.id}")
+        set_attributes(agent_name=agent_name, agent_id=agent.id)
+        logger.info("✅ %s ready, ID: %s", agent_name, agent.id)
 
         connected_tool = ConnectedAgentTool(
             id=agent.id,
@@ -90,10 +102,10 @@ def create_azure_docs_agent(project: AIProjectClient, model_name: str):
             description="Azure REST API documentation search and analysis with MCP tools"
         )
 
-        print(f"✅ {agent_name} connected as tool.")
+        logger.info("✅ %s connected as tool.", agent_name)
         return agent, connected_tool
 
     except Exception as e:
-        print(f"❌ Failed to create agent ({agent_name}): {e}")
-        print("💡 Make sure MCP_SERVER_URL_AZURE_REST and MCP_SERVER_LABEL environment variables are set")
+        logger.error("❌ Failed to create agent (%s): %s", agent_name, e)
+        logger.info("💡 Make sure MCP_SERVER_URL_AZURE_REST and MCP_SERVER_LABEL environment variables are set")
         raise
@@ -1,6 +1,13 @@
 # agents/study_buddy_agent.py
 
+import logging
+from core.agent_registry import DEFAULT_REGISTRY
+from core.tracing import traced, set_attributes
 
+logger = logging.getLogger(__name__)
+
+
+@traced()
 def create_study_buddy_agent(project, model_name, azure_docs_agent_tool):
     """
     Create the main study buddy agent that coordinates with the Azure documentation agent.
@@ -55,13 +62,14 @@ def create_study_buddy_agent(project, model_name, azure_docs_agent_tool):
         "and coordinate responses effectively to provide the best educational experience."
     )
 
-    print(f"🤖 Creating ({agent_name})...")
+    logger.info("🤖 Creating (%s)...", agent_name)
 
     try:
         # Use the connected Azure documentation agent tool
         all_tools = azure_docs_agent_tool.definitions
 
-        agent = project.agents.create_agent(
+        agent = DEFAULT_REGISTRY.get_or_create_agent(
+            project,
             model=model_name,
             name=agent_name,
             description=agent_description,
@@ -69,10 +77,11 @@ def create_study_buddy_agent(project, model_name, azure_docs_agent_tool):
             tools=all_tools,
         )
 
-        print(f"✅ {agent_name} created: {agent.id}")
-        print(f"🔗 Connected to {len(all_tools)} specialized tools")
+        set_attributes(agent_name=agent_name, agent_id=agent.id)
+        logger.info("✅ %s ready: %s", agent_name, agent.id)
+        logger.info("🔗 Connected to %s specialized tools", len(all_tools))
         return agent
 
     except Exception as e:
-        print(f"❌ Failed to create agent ({agent_name}): {e}")
+        logger.error("❌ Failed to create agent (%s): %s", agent_name, e)
         raise
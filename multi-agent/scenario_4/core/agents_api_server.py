@@ -0,0 +1,339 @@
+# core/agents_api_server.py
+
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from core.fake_project import FakeAgentsBackend, NotFound
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_RETRY_AFTER = 1
+PROJECT_PATH = "/api/projects/local"
+
+# Routes are matched after the /api/projects/<name> prefix of the endpoint
+ROUTES = []
+
+
+def route(method, pattern):
+    """Register a handler method for an HTTP method and path pattern."""
+    def decorator(func):
+        ROUTES.append((method, re.compile(f"^{pattern}$"), func))
+        return func
+    return decorator
+
+
+def _paging(query):
+    return {
+        "limit": int(query.get("limit", 20)),
+        "order": query.get("order", "desc"),
+        "after": query.get("after"),
+    }
+
+
+def _list_page(items, limit):
+    # One extra item was requested to tell whether another page follows
+    page = items[:limit]
+    return {
+        "object": "list",
+        "data": page,
+        "first_id": page[0]["id"] if page else None,
+        "last_id": page[-1]["id"] if page else None,
+        "has_more": len(items) > limit,
+    }
+
+
+class AgentsApiHandler(BaseHTTPRequestHandler):
+    """Maps Agents REST requests onto the server's FakeAgentsBackend."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so client connection pooling is measured
+
+    @property
+    def backend(self):
+        return self.server.backend
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        logger.debug("🌐 %s - %s", self.address_string(), format % args)
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        path = re.sub(r"^/api/projects/[^/]+", "", url.path).rstrip("/") or "/"
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.body = self._read_body()
+
+        behavior = self.backend.behavior
+        time.sleep(behavior.draw(behavior.api_latency))
+        if behavior.chance(behavior.error_rate):
+            self.server.count("injected_errors")
+            self._send_error(behavior.error_status, "too_many_requests" if behavior.error_status == 429
+                             else "server_error", "Injected error (FAKE_ERROR_RATE).",
+                             {"Retry-After": str(self.server.retry_after)})
+            return
+
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                self.server.count("requests")
+                try:
+                    result = handler(self, *match.groups())
+                except NotFound as e:
+                    self._send_error(404, "not_found", str(e))
+                except (KeyError, ValueError, TypeError) as e:
+                    self._send_error(400, "invalid_request", str(e))
+                else:
+                    if result is not None:
+                        self._send_json(200, result)
+                return
+        self._send_error(404, "not_found", f"No route for {method} {url.path}")
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            message = BytesParser(policy=default_policy).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + raw)
+            return {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+        return json.loads(raw) if raw else {}
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status, code, message, headers=None):
+        self._send_json(status, {"error": {"code": code, "message": message}}, headers)
+
+    def _send_events(self, events):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in events:
+            self.wfile.write(f"{len(event):X}\r\n".encode("ascii") + event + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    # Assistants
+
+    @route("POST", "/assistants")
+    def create_assistant(self):
+        return self.backend.create_agent(**self.body)
+
+    @route("GET", "/assistants")
+    def list_assistants(self):
+        paging = _paging(self.query)
+        items = self.backend.list_agents(**{**paging, "limit": paging["limit"] + 1})
+        return _list_page(items, paging["limit"])
+
+    @route("GET", "/assistants/([^/]+)")
+    def get_assistant(self, agent_id):
+        return self.backend.get_agent(agent_id)
+
+    @route("POST", "/assistants/([^/]+)")
+    def update_assistant(self, agent_id):
+        return self.backend.update_agent(agent_id, **self.body)
+
+    @route("DELETE", "/assistants/([^/]+)")
+    def delete_assistant(self, agent_id):
+        return self.backend.delete_agent(agent_id)
+
+    # Threads and messages
+
+    @route("POST", "/threads")
+    def create_thread(self):
+        return self.backend.create_thread(**self.body)
+
+    @route("GET", "/threads")
+    def list_threads(self):
+        paging = _paging(self.query)
+        items = self.backend.list_threads(**{**paging, "limit": paging["limit"] + 1})
+        return _list_page(items, paging["limit"])
+
+    @route("GET", "/threads/([^/]+)")
+    def get_thread(self, thread_id):
+        return self.backend.get_thread(thread_id)
+
+    @route("DELETE", "/threads/([^/]+)")
+    def delete_thread(self, thread_id):
+        return self.backend.delete_thread(thread_id)
+
+    @route("POST", "/threads/([^/]+)/messages")
+    def create_message(self, thread_id):
+        return self.backend.create_message(thread_id, self.body["role"], self.body["content"])
+
+    @route("GET", "/threads/([^/]+)/messages")
+    def list_messages(self, thread_id):
+        paging = _paging(self.query)
+        items = self.backend.list_messages(thread_id, run_id=self.query.get("run_id"),
+                                           **{**paging, "limit": paging["limit"] + 1})
+        return _list_page(items, paging["limit"])
+
+    # Runs and run steps
+
+    @route("POST", "/threads/([^/]+)/runs")
+    def create_run(self, thread_id):
+        run = self.backend.create_run(thread_id, self.body["assistant_id"])
+        if self.body.get("stream"):
+            self._send_events(self.backend.run_events(thread_id, run["id"]))
+            return None
+        return run
+
+    @route("GET", "/threads/([^/]+)/runs/([^/]+)")
+    def get_run(self, thread_id, run_id):
+        return self.backend.get_run(thread_id, run_id)
+
+    @route("POST", "/threads/([^/]+)/runs/([^/]+)/cancel")
+    def cancel_run(self, thread_id, run_id):
+        return self.backend.cancel_run(thread_id, run_id)
+
+    @route("POST", "/threads/([^/]+)/runs/([^/]+)/submit_tool_outputs")
+    def submit_tool_outputs(self, thread_id, run_id):
+        run = self.backend.submit_tool_outputs(thread_id, run_id, self.body["tool_outputs"])
+        if self.body.get("stream"):
+            self._send_events(self.backend.run_events(thread_id, run_id, created=False))
+            return None
+        return run
+
+    @route("GET", "/threads/([^/]+)/runs/([^/]+)/steps")
+    def list_run_steps(self, thread_id, run_id):
+        paging = _paging(self.query)
+        items = self.backend.list_run_steps(thread_id, run_id, **{**paging, "limit": paging["limit"] + 1})
+        return _list_page(items, paging["limit"])
+
+    # Files and vector stores
+
+    @route("POST", "/files")
+    def upload_file(self):
+        part = self.body["file"]
+        purpose = self.body["purpose"].get_content().strip()
+        return self.backend.upload_file(part.get_filename(), len(part.get_payload(decode=True) or b""), purpose)
+
+    @route("GET", "/files/([^/]+)")
+    def get_file(self, file_id):
+        return self.backend.get_file(file_id)
+
+    @route("DELETE", "/files/([^/]+)")
+    def delete_file(self, file_id):
+        return self.backend.delete_file(file_id)
+
+    @route("POST", "/vector_stores")
+    def create_vector_store(self):
+        return self.backend.create_vector_store(self.body.get("file_ids"), self.body.get("name"))
+
+    @route("GET", "/vector_stores/([^/]+)")
+    def get_vector_store(self, vector_store_id):
+        return self.backend.get_vector_store(vector_store_id)
+
+    @route("DELETE", "/vector_stores/([^/]+)")
+    def delete_vector_store(self, vector_store_id):
+        return self.backend.delete_vector_store(vector_store_id)
+
+
+class AgentsApiServer(ThreadingHTTPServer):
+    """
+    Local HTTP stand-in for the Agents REST API, for load testing the real SDK path.
+
+    Serves the routes the scenarios use (assistants, threads, messages, runs, run
+    steps, files and vector stores) from one in-memory FakeAgentsBackend, including
+    streamed runs as server-sent events, over keep-alive connections. Run it with
+    `python -m core.agents_api_server` and point a scenario at `endpoint`
+    (PROJECT_ENDPOINT=http://127.0.0.1:8765/api/projects/local).
+
+    The FAKE_* variables of core.fake_project shape it: FAKE_API_LATENCY is added to
+    every request, FAKE_ERROR_RATE answers with FAKE_ERROR_STATUS (429 by default,
+    with a Retry-After header) so the SDK's retry policy is exercised, and
+    FAKE_REPLIES scripts the assistant replies.
+
+    Args:
+        address: (host, port) to listen on; port 0 picks a free port
+        backend (optional): FakeAgentsBackend. Defaults to one configured from FAKE_* variables.
+        retry_after (optional): Whole Retry-After seconds sent with injected errors (FAKE_RETRY_AFTER)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, backend=None, retry_after=None):
+        super().__init__(address, AgentsApiHandler)
+        self.backend = backend or FakeAgentsBackend()
+        self.retry_after = retry_after if retry_after is not None else \
+            int(os.getenv("FAKE_RETRY_AFTER", DEFAULT_RETRY_AFTER))
+        self.counters = {"requests": 0, "injected_errors": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        """PROJECT_ENDPOINT value that targets this server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{PROJECT_PATH}"
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+
+def start_server(host=DEFAULT_HOST, port=0, backend=None):
+    """
+    Start an AgentsApiServer on a background thread (e.g. inside a benchmark).
+
+    Returns:
+        AgentsApiServer: Running server; call shutdown() to stop it
+    """
+    server = AgentsApiServer((host, port), backend)
+    threading.Thread(target=server.serve_forever, name="agents-api-server", daemon=True).start()
+    logger.info("🌐 Local Agents API listening at %s", server.endpoint)
+    return server
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Serve an in-memory stand-in for the Agents REST API (settings from FAKE_* variables).")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    return parser.parse_args()
+
+
+def main():
+    from dotenv import load_dotenv
+    from core.log_config import setup_logging
+
+    args = parse_args()
+    load_dotenv()
+    setup_logging()
+    server = AgentsApiServer((args.host, args.port))
+    logger.info("🌐 Local Agents API listening; set PROJECT_ENDPOINT=%s", server.endpoint)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("🛑 Stopped after %d requests (%d injected errors)",
+                    server.counters["requests"], server.counters["injected_errors"])
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# core/polling.py
+
+import asyncio
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from core.tracing import traced, span, set_attributes
+
+ACTIVE_RUN_STATUSES = ("queued", "in_progress")
+TERMINAL_RUN_STATUSES = ("completed", "failed", "cancelled", "expired", "incomplete")
+
+
+class FixedPolling:
+    """
+    Polling strategy that waits a constant interval between status checks.
+
+    Args:
+        interval (float, optional): Seconds to wait between status checks. Defaults to 2.
+    """
+
+    def __init__(self, interval=2):
+        self.interval = interval
+
+    def intervals(self, agent_id=None):
+        """Yield the wait before each status check."""
+        while True:
+            yield self.interval
+
+    def record(self, agent_id, duration):
+        """Fixed polling ignores run history."""
+
+
+class AdaptivePolling:
+    """
+    Polling strategy with a fast first check, exponential backoff, jitter and a cap.
+
+    Completed run durations are remembered per agent. Once an agent has history,
+    the first check is deferred until shortly before its typical completion time,
+    so long connected-agent runs are not polled while they are certainly still busy.
+
+    The n-th check never comes before (n - 1) * spacing seconds, so a run is checked
+    at most once more than FixedPolling(spacing) would check it, and less often
+    once it runs past about 8 s: with the defaults, checks land at about 0.5, 2, 4,
+    8, 13 and then every 5 seconds, against 2, 4, 6, 8, 10, 12 for FixedPolling(2).
+
+    Args:
+        initial (float, optional): First wait in seconds. Defaults to 0.5.
+        multiplier (float, optional): Backoff factor between waits. Defaults to 2.
+        max_interval (float, optional): Upper bound for a single wait. Defaults to 5.
+        jitter (float, optional): Relative +/- jitter applied to every wait. Defaults to 0.2.
+        history_size (int, optional): Completed runs remembered per agent. Defaults to 20.
+        hint_ratio (float, optional): Share of the median duration to wait before the
+            first check when history exists. Defaults to 0.8.
+        spacing (float, optional): Average seconds between checks that polling never
+            exceeds in volume. Defaults to 2, the former fixed interval.
+    """
+
+    def __init__(self, initial=0.5, multiplier=2.0, max_interval=5.0, jitter=0.2,
+                 history_size=20, hint_ratio=0.8, spacing=2.0):
+        self.initial = initial
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.spacing = spacing
+        self.hint_ratio = hint_ratio
+        self._history = defaultdict(lambda: deque(maxlen=history_size))
+        self._lock = threading.Lock()
+
+    def expected_duration(self, agent_id):
+        """Return the median completed run duration for an agent, or None without history."""
+        if agent_id is None:
+            return None
+        with self._lock:
+            durations = list(self._history.get(agent_id, ()))
+        return statistics.median(durations) if durations else None
+
+    def intervals(self, agent_id=None):
+        """Yield the wait before each status check."""
+        elapsed = 0.0
+        for checks, delay in enumerate(self._backoff(agent_id)):
+            # Request volume stays within that of FixedPolling(spacing)
+            delay = max(delay, checks * self.spacing - elapsed)
+            elapsed += delay
+            yield delay
+
+    def _backoff(self, agent_id):
+        expected = self.expected_duration(agent_id)
+        if expected:
+            yield self._with_jitter(max(self.initial, expected * self.hint_ratio))
+
+        delay = self.initial
+        while True:
+            yield self._with_jitter(delay)
+            delay = min(delay * self.multiplier, self.max_interval)
+
+    def record(self, agent_id, duration):
+        """Remember how long a completed run took for the given agent."""
+        if agent_id is None:
+            return
+        with self._lock:
+            self._history[agent_id].append(duration)
+
+    def _with_jitter(self, delay):
+        if not self.jitter:
+            return delay
+        return max(0.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+# Shared by every run in the process so duration hints carry across turns.
+DEFAULT_POLLING = AdaptivePolling()
+
+
+@traced()
+def wait_for_run(project, thread_id, run, agent_id=None, polling=None, timeout=60, on_status=None):
+    """
+    Poll a run until it leaves the queued/in_progress states.
+
+    Args:
+        project: Azure AI Project client
+        thread_id: ID of the thread the run belongs to
+        run: Run object returned by runs.create
+        agent_id (optional): Agent ID used to look up and record duration hints
+        polling (optional): Polling strategy. Defaults to the shared AdaptivePolling.
+        timeout (int, optional): Max time (in seconds) to wait for the run. Defaults to 60.
+        on_status (callable, optional): Called with the run after every status check
+
+    Returns:
+        run: Run object in its final (or non-pollable) status
+
+    Raises:
+        TimeoutError: If the run does not complete within the timeout period
+    """
+    polling = polling or DEFAULT_POLLING
+    start_time = time.monotonic()
+    delays = polling.intervals(agent_id)
+
+    while run.status in ACTIVE_RUN_STATUSES:
+        remaining = timeout - (time.monotonic() - start_time)
+        if remaining <= 0:
+            raise TimeoutError("⏰ Run timed out while waiting for completion.")
+
+        time.sleep(min(next(delays), remaining))
+        with span("poll_run", thread_id=thread_id, run_id=run.id):
+            run = project.agents.runs.get(thread_id=thread_id, run_id=run.id)
+            set_attributes(run_status=run.status)
+        if on_status:
+            on_status(run)
+
+    if run.status == "completed":
+        polling.record(agent_id, time.monotonic() - start_time)
+
+    return run
+
+
+@traced()
+async def wait_for_run_async(project, thread_id, run, agent_id=None, polling=None, timeout=60, on_status=None):
+    """
+    Async counterpart of wait_for_run for the azure.ai.projects.aio client.
+
+    Args:
+        project: Async Azure AI Project client
+        thread_id: ID of the thread the run belongs to
+        run: Run object returned by runs.create
+        agent_id (optional): Agent ID used to look up and record duration hints
+        polling (optional): Polling strategy. Defaults to the shared AdaptivePolling.
+        timeout (int, optional): Max time (in seconds) to wait for the run. Defaults to 60.
+        on_status (callable, optional): Called with the run after every status check
+
+    Returns:
+        run: Run object in its final (or non-pollable) status
+
+    Raises:
+        TimeoutError: If the run does not complete within the timeout period
+    """
+    polling = polling or DEFAULT_POLLING
+    start_time = time.monotonic()
+    delays = polling.intervals(agent_id)
+
+    while run.status in ACTIVE_RUN_STATUSES:
+        remaining = timeout - (time.monotonic() - start_time)
+        if remaining <= 0:
+            raise TimeoutError("⏰ Run timed out while waiting for completion.")
+
+        await asyncio.sleep(min(next(delays), remaining))
+        with span("poll_run", thread_id=thread_id, run_id=run.id):
+            run = await project.agents.runs.get(thread_id=thread_id, run_id=run.id)
+            set_attributes(run_status=run.status)
+        if on_status:
+            on_status(run)
+
+    if run.status == "completed":
+        polling.record(agent_id, time.monotonic() - start_time)
+
+    return run
+
+
+@traced()
+def cancel_run(project, thread_id, run_id, grace_period=5, poll_interval=0.25):
+    """
+    Cancel a run server-side and wait briefly for it to reach a terminal status.
+
+    Cancelling frees the thread for the next runs.create and stops the run from
+    consuming model capacity after the client has given up on it.
+
+    Args:
+        project: Azure AI Project client
+        thread_id: ID of the thread the run belongs to
+        run_id: ID of the run to cancel
+        grace_period (float, optional): Max seconds to wait for the cancellation. Defaults to 5.
+        poll_interval (float, optional): Seconds between status checks. Defaults to 0.25.
+
+    Returns:
+        run: Latest run object ('cancelled' unless it finished first or the grace period ran out)
+    """
+    run = project.agents.runs.cancel(thread_id=thread_id, run_id=run_id)
+    deadline = time.monotonic() + grace_period
+
+    while run.status not in TERMINAL_RUN_STATUSES and time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        run = project.agents.runs.get(thread_id=thread_id, run_id=run_id)
+
+    return run
+
+
+async def cancel_run_async(project, thread_id, run_id, grace_period=5, poll_interval=0.25):
+    """
+    Async counterpart of cancel_run for the azure.ai.projects.aio client.
+
+    Args:
+        project: Async Azure AI Project client
+        thread_id: ID of the thread the run belongs to
+        run_id: ID of the run to cancel
+        grace_period (float, optional): Max seconds to wait for the cancellation. Defaults to 5.
+        poll_interval (float, optional): Seconds between status checks. Defaults to 0.25.
+
+    Returns:
+        run: Latest run object ('cancelled' unless it finished first or the grace period ran out)
+    """
+    run = await project.agents.runs.cancel(thread_id=thread_id, run_id=run_id)
+    deadline = time.monotonic() + grace_period
+
+    while run.status not in TERMINAL_RUN_STATUSES and time.monotonic() < deadline:
+        await asyncio.sleep(poll_interval)
+        run = await project.agents.runs.get(thread_id=thread_id, run_id=run_id)
+
+    return run
@@ -0,0 +1,190 @@
+# core/run_profiler.py
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from core.log_config import flush_logs
+from core.run_steps import read_field, step_tool_labels
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PROFILE_LOG = "run_profiles.jsonl"
+
+_log_lock = threading.Lock()
+
+
+def profiling_enabled():
+    """Return True when RUN_PROFILING is set to 'true' in the environment."""
+    return os.getenv("RUN_PROFILING", "false").lower() == "true"
+
+
+def should_profile(profile=None):
+    """Resolve an explicit profile flag, falling back to RUN_PROFILING when it is None."""
+    return profiling_enabled() if profile is None else bool(profile)
+
+
+def _seconds(value):
+    """Convert an SDK timestamp (datetime or unix seconds) to unix seconds."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def seconds_between(start, end):
+    """Return the seconds from one SDK timestamp to another (None if either is missing)."""
+    start, end = _seconds(start), _seconds(end)
+    if start is None or end is None:
+        return None
+    return round(end - start, 3)
+
+
+def ended_at(obj):
+    """Return when a run or run step reached its final status, or None."""
+    for attr in ("completed_at", "failed_at", "cancelled_at", "expired_at"):
+        value = read_field(obj, attr)
+        if value is not None:
+            return value
+    return None
+
+
+def _usage(obj):
+    usage = getattr(obj, "usage", None)
+    if not usage:
+        return None
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+        "total_tokens": getattr(usage, "total_tokens", None),
+    }
+
+
+def list_run_steps(project, thread_id, run):
+    """
+    List the steps of a run in execution order.
+
+    Args:
+        project: Azure AI Project client
+        thread_id: ID of the conversation thread
+        run: Run object
+
+    Returns:
+        list: Run step objects, oldest first
+    """
+    from azure.ai.agents.models import ListSortOrder
+
+    return list(project.agents.run_steps.list(
+        thread_id=thread_id,
+        run_id=run.id,
+        order=ListSortOrder.ASCENDING
+    ))
+
+
+def build_run_profile(thread_id, run, steps):
+    """
+    Build a structured timing record for a finished run.
+
+    Args:
+        thread_id: ID of the conversation thread
+        run: Run object in its final status
+        steps: Run steps as returned by list_run_steps
+
+    Returns:
+        dict: Queued time, total time, token usage and one entry per step
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "thread_id": thread_id,
+        "run_id": run.id,
+        "agent_id": getattr(run, "agent_id", None),
+        "status": run.status,
+        "queued_seconds": seconds_between(run.created_at, getattr(run, "started_at", None)),
+        "total_seconds": seconds_between(run.created_at, ended_at(run)),
+        "usage": _usage(run),
+        "steps": [
+            {
+                "step_id": step.id,
+                "type": step.type,
+                "status": step.status,
+                "tools": step_tool_labels(step),
+                "duration_seconds": seconds_between(step.created_at, ended_at(step)),
+                "usage": _usage(step),
+            }
+            for step in steps
+        ],
+    }
+
+
+def print_run_profile(profile):
+    """
+    Print a per-turn timing table for a run profile.
+
+    Args:
+        profile: Record returned by build_run_profile
+    """
+    def fmt_seconds(value):
+        return f"{value:.2f}s" if value is not None else "-"
+
+    def fmt_tokens(usage):
+        if not usage:
+            return "-"
+        return f"{usage['prompt_tokens']}/{usage['completion_tokens']}"
+
+    flush_logs()
+    print(f"\n⏱️ Run {profile['run_id']} — {profile['status']} in "
+          f"{fmt_seconds(profile['total_seconds'])} (queued {fmt_seconds(profile['queued_seconds'])})")
+    print(f"   {'#':>2}  {'Step':<17} {'Agent / tool':<38} {'Duration':>9}  {'Tokens in/out':>13}")
+
+    for index, step in enumerate(profile["steps"], start=1):
+        tools = ", ".join(step["tools"]) or "-"
+        print(f"   {index:>2}  {step['type']:<17} {tools:<38} "
+              f"{fmt_seconds(step['duration_seconds']):>9}  {fmt_tokens(step['usage']):>13}")
+
+    print(f"   Run tokens in/out: {fmt_tokens(profile['usage'])}")
+
+
+def append_run_profile(profile, path=None):
+    """
+    Append a run profile as one JSON line to a local log file.
+
+    Args:
+        profile: Record returned by build_run_profile
+        path (optional): Log file path. Defaults to RUN_PROFILE_LOG or run_profiles.jsonl.
+    """
+    path = path or os.getenv("RUN_PROFILE_LOG", DEFAULT_PROFILE_LOG)
+    line = json.dumps(profile, ensure_ascii=False)
+    with _log_lock:
+        with open(path, "a", encoding="utf-8") as log_file:
+            log_file.write(line + "\n")
+
+
+def record_run_profile(project, thread_id, run, path=None):
+    """
+    Collect, print and log the latency breakdown of a finished run.
+
+    Profiling never breaks the conversation: failures are reported and swallowed.
+
+    Args:
+        project: Azure AI Project client
+        thread_id: ID of the conversation thread
+        run: Run object in its final status
+        path (optional): JSONL log file path
+
+    Returns:
+        list: The run's steps, for reuse (e.g. by the usage ledger), or None if they
+            could not be listed
+    """
+    steps = None
+    try:
+        steps = list_run_steps(project, thread_id, run)
+        profile = build_run_profile(thread_id, run, steps)
+        print_run_profile(profile)
+        append_run_profile(profile, path)
+
+    except Exception as e:
+        logger.warning("⚠️ Failed to profile run %s: %s", run.id, e)
+    return steps
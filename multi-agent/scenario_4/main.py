@@ -1,23 +1,51 @@
 # main.py
 
+import logging
 import sys
+from dotenv import load_dotenv
 from settings import load_configuration
 from core.azure_client import connect_to_project
+from core.log_config import setup_logging, flush_logs
+from core.tracing import setup_tracing, span
 from core.cleanup_utils import delete_agents
+from core.provisioning import Step, provision
+from core.resource_manifest import register_teardown_at_exit
+from core.usage_ledger import register_summary_at_exit
 from agents.azure_docs_agent import create_azure_docs_agent
 from agents.study_buddy_agent import create_study_buddy_agent
 from core.conversation_manager import (
     create_thread,
     send_user_message,
     run_agent,
+    stream_agent,
     display_agent_responses
 )
+from core.parallel_demo import run_questions_concurrently, print_demo_results
+
+logger = logging.getLogger(__name__)
+
+
+DEMO_QUESTIONS = [
+    "Hi! Can you help me understand Azure REST APIs?",
+]
+
+# This is another example
+# DEMO_QUESTIONS = [
+#     "Hi! Can you help me understand Azure REST APIs?",
+#     "Please summarize the Azure REST API specifications Readme",
+#     "What are the key components of Azure Resource Manager APIs?",
+#     "How do I authenticate with Azure REST APIs?",
+#     "What are the best practices for Azure API development?"
+# ]
 
 
 def create_study_system(project, model_name):
     """
     Create and initialize the complete study buddy system with all agents.
 
+    The study buddy is created once the Azure docs agent tool is ready; on failure,
+    everything created during provisioning is deleted again.
+
     Args:
         project: Azure AI Project client
         model_name: Name of the model deployment to use
@@ -26,39 +54,46 @@ def create_study_system(project, model_name):
         tuple: All created agents (azure_docs_agent, study_buddy_agent)
     """
     try:
-        print("")
-        print("🏗️ Building Study Buddy System...")
+        logger.info("🏗️ Building Study Buddy System...")
 
-        azure_docs_agent, azure_docs_agent_tool = create_azure_docs_agent(
-            project, model_name)
-        study_buddy_agent = create_study_buddy_agent(
-            project, model_name, azure_docs_agent_tool)
+        results = provision(project, [
+            Step("azure_docs", lambda: create_azure_docs_agent(project, model_name)),
+            Step("study_buddy", lambda azure_docs: create_study_buddy_agent(
+                project, model_name, azure_docs[1]), requires=("azure_docs",)),
+        ])
 
-        print("✅ Study buddy system ready!")
+        azure_docs_agent = results["azure_docs"][0]
+        study_buddy_agent = results["study_buddy"]
+
+        logger.info("✅ Study buddy system ready!")
         return azure_docs_agent, study_buddy_agent
 
     except Exception as e:
-        print(f"❌ Failed to create study system: {e}")
+        logger.error("❌ Failed to create study system: %s", e)
         raise
 
 
-def interactive_session(project, study_buddy_agent):
+def interactive_session(project, study_buddy_agent, stream=True):
     """
     Start an interactive chat session with the study buddy agent.
 
     Args:
         project: Azure AI Project client
         study_buddy_agent: The main study buddy agent
+        stream (bool, optional): Stream replies token by token. Defaults to True.
     """
     try:
         thread = create_thread(project)
 
+        flush_logs()
         print("\n🎉 Welcome to your Azure Documentation Study Buddy!")
         print("Ask me about Azure REST API specifications, documentation, or any Azure-related questions.")
         print("Type 'quit' to exit.\n")
 
         while True:
+            in_turn = False
             try:
+                flush_logs()
                 user_input = input("👤 You: ").strip()
 
                 if user_input.lower() in ['quit', 'exit', 'bye']:
@@ -68,20 +103,30 @@ def interactive_session(project, study_buddy_agent):
                 if not user_input:
                     continue
 
-                send_user_message(project, thread, user_input)
-                run = run_agent(project, thread, study_buddy_agent)
-                display_agent_responses(project, thread, run)
+                in_turn = True
+                with span("turn"):
+                    send_user_message(project, thread, user_input)
+                    if stream:
+                        stream_agent(project, thread, study_buddy_agent)
+                    else:
+                        run = run_agent(project, thread, study_buddy_agent)
+                        display_agent_responses(project, thread, run)
                 print()
 
             except KeyboardInterrupt:
+                if in_turn:
+                    # The run was cancelled server-side; keep chatting on the same thread
+                    flush_logs()
+                    print("⛔ Request cancelled. Ask something else or type 'quit' to exit.")
+                    continue
                 print("\n👋 Session ended. Happy studying!")
                 break
             except Exception as e:
-                print(f"❌ Error during conversation: {e}")
+                logger.error("❌ Error during conversation: %s", e)
                 continue
 
     except Exception as e:
-        print(f"❌ Failed to start interactive session: {e}")
+        logger.error("❌ Failed to start interactive session: %s", e)
         raise
 
 
@@ -96,38 +141,52 @@ def demo_session(project, study_buddy_agent):
     try:
         thread = create_thread(project)
 
-        demo_questions = [
-            "Hi! Can you help me understand Azure REST APIs?",
-        ]
-
-        # This is another example
-        # demo_questions = [
-        #     "Hi! Can you help me understand Azure REST APIs?",
-        #     "Please summarize the Azure REST API specifications Readme",
-        #     "What are the key components of Azure Resource Manager APIs?",
-        #     "How do I authenticate with Azure REST APIs?",
-        #     "What are the best practices for Azure API development?"
-        # ]
-
+        flush_logs()
         print("\n🎬 Running Study Buddy Demo Session...")
         print("=" * 50)
 
-        for question in demo_questions:
+        for question in DEMO_QUESTIONS:
             try:
+                flush_logs()
                 print(f"\n💭 Demo Question: {question}")
                 print("-" * 40)
 
-                send_user_message(project, thread, question)
-                run = run_agent(project, thread, study_buddy_agent)
-                display_agent_responses(project, thread, run)
+                with span("turn"):
+                    send_user_message(project, thread, question)
+                    run = run_agent(project, thread, study_buddy_agent)
+                    display_agent_responses(project, thread, run)
                 print()
 
             except Exception as e:
-                print(f"❌ Error processing demo question '{question}': {e}")
+                logger.error("❌ Error processing demo question '%s': %s", question, e)
                 continue
 
     except Exception as e:
-        print(f"❌ Failed to run demo session: {e}")
+        logger.error("❌ Failed to run demo session: %s", e)
+        raise
+
+
+def parallel_demo_session(project, study_buddy_agent, max_concurrency=None):
+    """
+    Run the demo questions in parallel, each on its own thread.
+
+    Args:
+        project: Azure AI Project client
+        study_buddy_agent: The main study buddy agent
+        max_concurrency (int, optional): Max questions in flight at once. Defaults to the
+            DEMO_MAX_CONCURRENCY environment variable, or 4.
+    """
+    try:
+        flush_logs()
+        print("\n🎬 Running Study Buddy Parallel Demo Session...")
+        print("=" * 50)
+
+        results, total_elapsed = run_questions_concurrently(
+            project, study_buddy_agent, DEMO_QUESTIONS, max_concurrency)
+        print_demo_results(results, total_elapsed)
+
+    except Exception as e:
+        logger.error("❌ Failed to run parallel demo session: %s", e)
         raise
 
 
@@ -136,24 +195,34 @@ def main():
     Main entry point for the study buddy system.
     """
     try:
-        print("🚀 Starting Study Buddy System...")
+        # .env first, so LOG_* and TRACING settings apply from the first line
+        load_dotenv()
+        setup_logging()
+        setup_tracing("study-buddy")
+        logger.info("🚀 Starting Study Buddy System...")
 
         endpoint, model_name = load_configuration()
         project = connect_to_project(endpoint)
+        register_teardown_at_exit(project)
+        register_summary_at_exit()
 
         _, study_buddy_agent = create_study_system(
             project, model_name)
 
+        flush_logs()
         print("\nSelect session type:")
         print("1. Interactive session (chat with the study buddy)")
         print("2. Demo session (see predefined examples)")
+        print("3. Parallel demo session (each example on its own thread)")
 
-        choice = input("Enter choice (1 or 2): ").strip()
+        choice = input("Enter choice (1, 2 or 3): ").strip()
 
         if choice == "1":
             interactive_session(project, study_buddy_agent)
         elif choice == "2":
             demo_session(project, study_buddy_agent)
+        elif choice == "3":
+            parallel_demo_session(project, study_buddy_agent)
         else:
             print("Running demo session by default...")
             demo_session(project, study_buddy_agent)
@@ -162,15 +231,15 @@ def main():
         # print("\n🧹 Cleaning up agents...")
         # delete_agents(project, study_buddy_agent, azure_docs_agent)
 
-        print("🎉 Study Buddy System session completed!")
+        logger.info("🎉 Study Buddy System session completed!")
 
     except KeyboardInterrupt:
-        print("\n🛑 Program interrupted by user")
+        logger.info("🛑 Program interrupted by user")
     except Exception as e:
-        print(f"💥 Unexpected error: {e}")
+        logger.error("💥 Unexpected error: %s", e)
         sys.exit(1)
     finally:
-        print("🔴 Program terminated")
+        logger.info("🔴 Program terminated")
 
 
 if __name__ == "__main__":
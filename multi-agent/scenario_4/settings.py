@@ -1,8 +1,11 @@
 # settings.py
 
+import logging
 import os
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 
 def load_configuration():
     """
@@ -15,22 +18,22 @@ def load_configuration():
         ValueError: If required environment variables are not set
     """
     try:
-        print("🔄 Loading environment variables...")
+        logger.info("🔄 Loading environment variables...")
         load_dotenv()
 
         env = os.getenv("ENVIRONMENT", "development")
         endpoint = os.getenv("PROJECT_ENDPOINT")
         model = os.getenv("MODEL_DEPLOYMENT_NAME")
 
-        print(f"🌐 ENVIRONMENT: {env}")
+        logger.info("🌐 ENVIRONMENT: %s", env)
 
         if not endpoint or not model:
             raise ValueError(
                 "❌ PROJECT_ENDPOINT or MODEL_DEPLOYMENT_NAME not set in environment variables.")
 
-        print("✅ Configuration loaded successfully.")
+        logger.info("✅ Configuration loaded successfully.")
         return endpoint, model
 
     except Exception as e:
-        print(f"❌ Failed to load configuration: {e}")
+        logger.error("❌ Failed to load configuration: %s", e)
         raise
@@ -0,0 +1,71 @@
+"""
+Tests of the token cache settings in each scenario's core/credentials.py, without Azure access.
+
+Each copy of credentials.py is loaded from its path, so the copies are tested side
+by side in one process.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CREDENTIALS_FILES = tuple(os.path.join(f"scenario_{scenario}", "core", "credentials.py") for scenario in (2, 3, 4))
+
+
+def load_credentials(path):
+    name = "credentials_" + path.replace(os.sep, "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=CREDENTIALS_FILES)
+def credentials(request, monkeypatch):
+    for variable in ("AZURE_TOKEN_CACHE", "AZURE_TOKEN_CACHE_ALLOW_UNENCRYPTED"):
+        monkeypatch.delenv(variable, raising=False)
+    return load_credentials(request.param)
+
+
+def without_keyring(credentials, monkeypatch):
+    monkeypatch.setattr(credentials, "encrypted_cache_available", lambda: False)
+
+
+def test_service_principal_tokens_are_not_persisted(credentials, monkeypatch):
+    monkeypatch.setattr(credentials, "encrypted_cache_available", lambda: True)
+
+    assert credentials._token_cache_options("environment") == {}
+    assert credentials._token_cache_options("workload_identity") == {}
+
+
+def test_interactive_tokens_are_persisted_encrypted(credentials, monkeypatch):
+    monkeypatch.setattr(credentials, "encrypted_cache_available", lambda: True)
+
+    options = credentials._token_cache_options("interactive")["cache_persistence_options"]
+    assert options.allow_unencrypted_storage is False
+
+
+def test_no_keyring_keeps_tokens_in_memory(credentials, monkeypatch):
+    without_keyring(credentials, monkeypatch)
+
+    assert credentials._token_cache_options("interactive") == {}
+    assert credentials._token_cache_options("device_code") == {}
+
+
+def test_no_keyring_persists_unencrypted_when_allowed(credentials, monkeypatch):
+    without_keyring(credentials, monkeypatch)
+    monkeypatch.setenv("AZURE_TOKEN_CACHE_ALLOW_UNENCRYPTED", "true")
+
+    options = credentials._token_cache_options("interactive")["cache_persistence_options"]
+    assert options.allow_unencrypted_storage is True
+
+
+def test_missing_libsecret_means_no_keyring(credentials, monkeypatch):
+    monkeypatch.setattr(sys, "platform", "linux")
+    # A None entry makes the import fail, as it does without libsecret and PyGObject
+    monkeypatch.setitem(sys.modules, "msal_extensions.libsecret", None)
+
+    assert credentials.encrypted_cache_available() is False
@@ -0,0 +1,63 @@
+"""
+Tests of core.resource_manifest against the in-process fake project.
+
+Each scenario ships its own core package, so every test runs once per scenario in
+a subprocess whose working directory is that scenario.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("scenario_2", "scenario_3", "scenario_4")
+
+EXIT_SCRIPT = """
+from core.azure_client import connect_to_project
+from core.resource_manifest import DEFAULT_MANIFEST, register_teardown_at_exit
+
+project = connect_to_project("fake://local")
+agent = project.agents.create_agent(model="gpt-fake", name="teardown-test", instructions="-")
+thread = project.agents.threads.create()
+DEFAULT_MANIFEST.record("agents", agent.id)
+DEFAULT_MANIFEST.record("threads", thread.id)
+register_teardown_at_exit(project)
+print(DEFAULT_MANIFEST.path)
+"""
+
+
+def run_and_exit(scenario, tmp_path, teardown_on_exit):
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.path.join(ROOT, scenario),
+        TEARDOWN_ON_EXIT=teardown_on_exit,
+        RESOURCE_MANIFEST_DIR=str(tmp_path / "manifests"),
+        AGENT_REGISTRY_PATH=str(tmp_path / "agent_registry.json"),
+        UPLOAD_CACHE_PATH=str(tmp_path / "upload_cache.json"),
+        FAKE_API_LATENCY="0",
+    )
+    result = subprocess.run([sys.executable, "-c", EXIT_SCRIPT], cwd=os.path.join(ROOT, scenario),
+                            env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert "Traceback" not in result.stderr, result.stderr
+    return result.stdout.strip().splitlines()[-1]
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_teardown_on_exit_empties_manifest(scenario, tmp_path):
+    manifest_path = run_and_exit(scenario, tmp_path, "true")
+
+    assert not os.path.exists(manifest_path)
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_manifest_kept_without_teardown_on_exit(scenario, tmp_path):
+    manifest_path = run_and_exit(scenario, tmp_path, "false")
+
+    with open(manifest_path, encoding="utf-8") as manifest_file:
+        resources = json.load(manifest_file)
+    assert len(resources["agents"]) == 1
+    assert len(resources["threads"]) == 1
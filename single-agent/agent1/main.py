@@ -1,14 +1,19 @@
+import logging
 import os
 from dotenv import load_dotenv
 from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
 from azure.ai.agents.models import ListSortOrder
+from credentials import get_credential
+from log_config import setup_logging, flush_logs
+from polling import wait_for_run
 
-print("🚀 Script started...")
-
-# Load environment variables from .env file
-print("🔄 Loading environment variables...")
+# Load environment variables from .env file (LOG_* settings included)
 load_dotenv()
+setup_logging()
+logger = logging.getLogger(__name__)
+
+logger.info("🚀 Script started...")
+logger.info("✅ Environment variables loaded")
 
 # Get environment variables
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
@@ -16,9 +21,9 @@ PROJECT_ENDPOINT = os.getenv("PROJECT_ENDPOINT")
 MODEL_DEPLOYMENT_NAME = os.getenv("MODEL_DEPLOYMENT_NAME")
 
 # Confirm environment variable values
-print(f"🌐 ENVIRONMENT: {ENVIRONMENT}")
+logger.info("🌐 ENVIRONMENT: %s", ENVIRONMENT)
 if PROJECT_ENDPOINT and MODEL_DEPLOYMENT_NAME:
-    print("✅ Found PROJECT_ENDPOINT and MODEL_DEPLOYMENT_NAME")
+    logger.info("✅ Found PROJECT_ENDPOINT and MODEL_DEPLOYMENT_NAME")
 if not PROJECT_ENDPOINT:
     raise ValueError("❌ PROJECT_ENDPOINT environment variable is not set.")
 if not MODEL_DEPLOYMENT_NAME:
@@ -26,14 +31,14 @@ if not MODEL_DEPLOYMENT_NAME:
         "❌ MODEL_DEPLOYMENT_NAME environment variable is not set.")
 
 # Create AI Project client
-print("🔗 Connecting to Azure AI Project...")
+logger.info("🔗 Connecting to Azure AI Project...")
 project = AIProjectClient(
     endpoint=PROJECT_ENDPOINT,
-    credential=DefaultAzureCredential(),
+    credential=get_credential(),
 )
 
 # Set up agent configuration
-print("🛠️ Setting up agent configuration...")
+logger.info("🛠️ Setting up agent configuration...")
 agent_name: str = "general-writing-agent-001"
 
 agent_description: str = (
@@ -49,51 +54,56 @@ agent_instructions: str = (
 )
 
 # Create an agent
-print("🤖 Creating agent...")
+logger.info("🤖 Creating agent...")
 agent = project.agents.create_agent(
     model=MODEL_DEPLOYMENT_NAME,
     name=agent_name,
     instructions=agent_instructions,
     description=agent_description
 )
-print(f"✅ Agent created: {agent.id}")
+logger.info("✅ Agent created: %s", agent.id)
 
 # Create a new thread
-print("🧵 Creating conversation thread...")
+logger.info("🧵 Creating conversation thread...")
 thread = project.agents.threads.create()
-print(f"✅ Thread created: {thread.id}")
+logger.info("✅ Thread created: %s", thread.id)
 
 # Define user message content
 user_message_content: str = "Write me a poem about flowers"
-print(f"💬 User message: {user_message_content}")
+logger.info("💬 User message: %s", user_message_content)
 
 # Send a user message
-print("📨 Sending user message to agent...")
+logger.info("📨 Sending user message to agent...")
 message = project.agents.messages.create(
     thread_id=thread.id,
     role="user",
     content=user_message_content
 )
-print(f"✅ Message sent: {message.id}")
+logger.info("✅ Message sent: %s", message.id)
 
 # Run the agent
-print("🏃 Running agent...")
-run = project.agents.runs.create_and_process(
+logger.info("🏃 Running agent...")
+run = project.agents.runs.create(
     thread_id=thread.id,
     agent_id=agent.id
 )
+logger.info("🔄 Run initiated: %s — Status: %s", run.id, run.status)
+
+# Poll with adaptive backoff instead of the SDK's fixed one-second loop
+run = wait_for_run(project, thread.id, run, agent_id=agent.id, timeout=120)
 
 if run.status == "failed":
-    print(f"❌ Run failed: {run.last_error}")
+    logger.error("❌ Run failed: %s", run.last_error)
 else:
-    print(f"✅ Run completed with status: {run.status}")
+    logger.info("✅ Run completed with status: %s", run.status)
 
 # Retrieve and display agent's response
-print("📥 Fetching messages from thread...")
+logger.info("📥 Fetching messages from thread...")
 messages = project.agents.messages.list(
     thread_id=thread.id, order=ListSortOrder.ASCENDING
 )
 
+flush_logs()
 for message in messages:
     if message.run_id == run.id and message.text_messages:
         print(
@@ -104,4 +114,4 @@ for message in messages:
 # project.agents.delete_agent(agent.id)
 # print("✅ Agent deleted")
 
-print("🎉 Script completed successfully.")
+logger.info("🎉 Script completed successfully.")
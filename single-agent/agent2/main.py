@@ -1,18 +1,33 @@
+import logging
 import os
 import time
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
 from azure.ai.projects import AIProjectClient
 from azure.ai.agents.models import FunctionTool, ToolSet, ListSortOrder
 from tools import get_company_details
+from credentials import get_credential
+from log_config import setup_logging, flush_logs
+from polling import wait_for_run
+from tool_registry import ToolRegistry
+from usage_ledger import DEFAULT_LEDGER, register_summary_at_exit
+
+logger = logging.getLogger(__name__)
 
 
 # ---------------------------------------------
 # Project setup functions
 # ---------------------------------------------
 
-print("🔄 Loading environment variables...")
+# .env is loaded first so its LOG_* settings apply from the first line
 load_dotenv()
+setup_logging()
+logger.info("✅ Environment variables loaded")
+
+# Max time in seconds to wait for the agent between tool-call rounds
+RUN_TIMEOUT = float(os.getenv("RUN_TIMEOUT", 120))
+
+# Adding a tool only requires registering its function here
+TOOL_REGISTRY = ToolRegistry([get_company_details])
 
 
 def setup_project_client():
@@ -27,16 +42,16 @@ def setup_project_client():
         raise ValueError(
             "❌ MODEL_DEPLOYMENT_NAME is not set in the .env file.")
 
-    print("🔗 Connecting to Azure AI Project...")
+    logger.info("🔗 Connecting to Azure AI Project...")
 
     try:
         project_client = AIProjectClient(
             endpoint=PROJECT_ENDPOINT,
-            credential=DefaultAzureCredential(),
+            credential=get_credential(),
         )
-        print("✅ Azure AI Project Connected!")
+        logger.info("✅ Azure AI Project Connected!")
     except Exception as e:
-        print(f"❌ Error initializing AIProjectClient: {e}")
+        logger.error("❌ Error initializing AIProjectClient: %s", e)
         raise
 
     return project_client, MODEL_DEPLOYMENT_NAME
@@ -45,13 +60,12 @@ def setup_project_client():
 def setup_toolset():
     """Define and return toolset containing user-defined functions."""
 
-    print("🛠️ Setting up agent tool configuration...")
+    logger.info("🛠️ Setting up agent tool configuration...")
 
-    user_functions = {get_company_details}
-    functions = FunctionTool(user_functions)
+    functions = FunctionTool(TOOL_REGISTRY.functions)
     toolset = ToolSet()
     toolset.add(functions)
-    print(f"✅ User toolset defined: {toolset}")
+    logger.info("✅ User toolset defined: %s", toolset)
     return toolset
 
 # ---------------------------------------------
@@ -62,7 +76,7 @@ def setup_toolset():
 def create_agent(project_client, model_deployment_name):
     """Create a new AI agent with toolset attached."""
 
-    print("🤖 Creating a new agent...")
+    logger.info("🤖 Creating a new agent...")
 
     try:
         agent_name: str = "company-info-agent-001"
@@ -81,8 +95,6 @@ def create_agent(project_client, model_deployment_name):
 
         agent_toolset = setup_toolset()
 
-        project_client.agents.enable_auto_function_calls(agent_toolset)
-
         agent = project_client.agents.create_agent(
             model=model_deployment_name,
             name=agent_name,
@@ -90,9 +102,9 @@ def create_agent(project_client, model_deployment_name):
             description=agent_description,
             toolset=agent_toolset,
         )
-        print(f"✅ Agent created! ID: {agent.id}")
+        logger.info("✅ Agent created! ID: %s", agent.id)
     except Exception as e:
-        print(f"❌ Error creating agent: {e}")
+        logger.error("❌ Error creating agent: %s", e)
         raise
 
     return agent
@@ -101,12 +113,12 @@ def create_agent(project_client, model_deployment_name):
 def create_thread(project_client):
     """Create a new conversation thread."""
 
-    print("🧵 Creating a new conversation thread...")
+    logger.info("🧵 Creating a new conversation thread...")
     try:
         thread = project_client.agents.threads.create()
-        print(f"✅ Thread created! ID: {thread.id}")
+        logger.info("✅ Thread created! ID: %s", thread.id)
     except Exception as e:
-        print(f"❌ Error creating thread: {e}")
+        logger.error("❌ Error creating thread: %s", e)
         raise
 
     return thread
@@ -119,20 +131,17 @@ def create_thread(project_client):
 def get_agent(project_client, agent_id):
     """Retrieve an existing agent using ID."""
 
-    print("🤖 Retrieving an existing agent...")
+    logger.info("🤖 Retrieving an existing agent...")
 
     try:
-        agent_toolset = setup_toolset()
-        project_client.agents.enable_auto_function_calls(agent_toolset)
-
         agent = project_client.agents.get_agent(agent_id)
         if not agent or 'id' not in agent:
-            print("❌ No agent found.")
+            logger.error("❌ No agent found.")
             return None
 
-        print(f"✅ Using existing agent. ID: {agent['id']}")
+        logger.info("✅ Using existing agent. ID: %s", agent['id'])
     except Exception as e:
-        print(f"❌ Error retrieving agent: {e}")
+        logger.error("❌ Error retrieving agent: %s", e)
         raise
 
     return agent
@@ -141,14 +150,14 @@ def get_agent(project_client, agent_id):
 def get_thread(project_client, thread_id):
     """Retrieve an existing thread using ID."""
 
-    print("🧵 Retrieve an existing conversation thread...")
+    logger.info("🧵 Retrieve an existing conversation thread...")
 
     thread = project_client.agents.threads.get(thread_id)
     if not thread or 'id' not in thread:
-        print("❌ No thread found.")
+        logger.error("❌ No thread found.")
         return None
 
-    print(f"✅ Using existing thread. ID: {thread['id']}")
+    logger.info("✅ Using existing thread. ID: %s", thread['id'])
     return thread
 
 # ---------------------------------------------
@@ -159,47 +168,45 @@ def get_thread(project_client, thread_id):
 def _get_or_create_agent(project_client, model_deployment_name, agent_id):
     """Retrieve an existing agent by ID or create a new one if ID is not provided."""
 
-    print("🤖 Retrieving an existing agent or creating a new one...")
+    logger.info("🤖 Retrieving an existing agent or creating a new one...")
 
     if not agent_id:
-        print("🔍 AGENT_ID not found in .env. Creating a new agent...")
+        logger.info("🔍 AGENT_ID not found in .env. Creating a new agent...")
         try:
             agent = create_agent(project_client, model_deployment_name)
-            print(
-                f"⚠️ Please update your .env file with AGENT_ID: {agent.id}")
+            logger.warning("⚠️ Please update your .env file with AGENT_ID: %s", agent.id)
             return agent
         except Exception as e:
-            print(f"❌ Error creating agent: {e}")
+            logger.error("❌ Error creating agent: %s", e)
             raise
 
-    print("✅ AGENT_ID found. Retrieving existing agent...")
+    logger.info("✅ AGENT_ID found. Retrieving existing agent...")
     return get_agent(project_client, agent_id)
 
 
 def _get_or_create_thread(project_client, thread_id):
     """Retrieve an existing thread by ID or create a new one if ID is not provided."""
 
-    print("🧵 Retrieving an existing conversation thread. or creating a new one..")
+    logger.info("🧵 Retrieving an existing conversation thread. or creating a new one..")
 
     if not thread_id:
-        print("🔍 THREAD_ID not found in .env. Creating a new thread...")
+        logger.info("🔍 THREAD_ID not found in .env. Creating a new thread...")
         try:
             thread = create_thread(project_client)
-            print(
-                f"⚠️ Please update your .env file with THREAD_ID: {thread.id}")
+            logger.warning("⚠️ Please update your .env file with THREAD_ID: %s", thread.id)
             return thread
         except Exception as e:
-            print(f"❌ Error creating thread: {e}")
+            logger.error("❌ Error creating thread: %s", e)
             raise
 
-    print("✅ THREAD_ID found. Retrieving existing thread...")
+    logger.info("✅ THREAD_ID found. Retrieving existing thread...")
     return get_thread(project_client, thread_id)
 
 
 def get_or_create_agent_and_thread(project_client, model_deployment_name):
     """Main entry to retrieve or create agent and thread."""
 
-    print("🤖🧵 Retrieve an existing or creating a new agent and thread..")
+    logger.info("🤖🧵 Retrieve an existing or creating a new agent and thread..")
 
     agent_id = os.getenv("AGENT_ID")
     thread_id = os.getenv("THREAD_ID")
@@ -216,7 +223,7 @@ def get_or_create_agent_and_thread(project_client, model_deployment_name):
 def send_user_message(project_client, thread, user_message):
     """Send a user message to the thread."""
 
-    print("\n📨 Sending user message to agent...")
+    logger.info("📨 Sending user message to agent...")
 
     try:
         message = project_client.agents.messages.create(
@@ -224,9 +231,10 @@ def send_user_message(project_client, thread, user_message):
             role="user",
             content=user_message,
         )
-        print(f"✅ Message sent! ID: {message['id']}")
+        DEFAULT_LEDGER.note_prompt(thread.id, user_message)
+        logger.info("✅ Message sent! ID: %s", message['id'])
     except Exception as e:
-        print(f"❌ Error sending message: {e}")
+        logger.error("❌ Error sending message: %s", e)
         return False
     return True
 
@@ -234,7 +242,7 @@ def send_user_message(project_client, thread, user_message):
 def extract_tool_calls(run):
     """Extract tool call data from a run."""
 
-    print("🛠️ Extracting tool call data from a run...")
+    logger.debug("🛠️ Extracting tool call data from a run...")
 
     ra = run.required_action
     submit_tool_outputs = None
@@ -255,67 +263,50 @@ def extract_tool_calls(run):
     return tool_calls, ra
 
 
-def handle_tool_output(tool_call):
-    """Handle the execution of a single tool call."""
-
-    print("🛠️ Handling the execution of a single tool call...")
-
-    tool_name = tool_call.name
-    tool_id = tool_call.id
-
-    if tool_name == "get_company_details":
-        output = get_company_details()
-    else:
-        return None
-
-    return {"tool_call_id": tool_id, "output": output}
-
-
 def handle_tool_calls(run, project_client, thread):
-    """Run all required tools and submit their output back to the run."""
+    """Run all required tools, submit their output back to the run and return the updated run."""
 
-    print("🛠️ Running all required tools and submit their output back to the run...")
+    logger.debug("🛠️ Running all required tools and submit their output back to the run...")
 
-    tool_outputs = []
     tool_calls, ra = extract_tool_calls(run)
 
     if not tool_calls:
-        print(f"❌ Could not access tool_calls. run.required_action: {ra}")
-    for tool_call in tool_calls:
-        result = handle_tool_output(tool_call)
-        if result:
-            tool_outputs.append(result)
-
-    if tool_outputs:
-        project_client.agents.runs.submit_tool_outputs(
-            thread_id=thread.id, run_id=run.id, tool_outputs=tool_outputs
-        )
+        logger.error("❌ Could not access tool_calls. run.required_action: %s", ra)
+        return project_client.agents.runs.cancel(thread_id=thread.id, run_id=run.id)
+
+    tool_outputs = [TOOL_REGISTRY.dispatch(tool_call) for tool_call in tool_calls]
+
+    return project_client.agents.runs.submit_tool_outputs(
+        thread_id=thread.id, run_id=run.id, tool_outputs=tool_outputs
+    )
 
 
 def process_run(project_client, thread, agent):
     """Execute the agent and handle the run lifecycle."""
 
-    print("🛠️ Executing the agent and handle the run lifecycle...")
+    logger.debug("🛠️ Executing the agent and handle the run lifecycle...")
 
     try:
-        run = project_client.agents.runs.create_and_process(
+        started = time.perf_counter()
+        run = project_client.agents.runs.create(
             thread_id=thread.id, agent_id=agent.id
         )
-        print(f"🏃 Run started! ID: {run.id}")
-
-        while run.status in ["queued", "in_progress", "requires_action"]:
-            time.sleep(1)
-            run = project_client.agents.runs.get(
-                thread_id=thread.id, run_id=run.id)
-
-            if run.status == "requires_action":
-                handle_tool_calls(run, project_client, thread)
-
-        print(f"✅ Run completed with status: {run.status}")
+        logger.info("🏃 Run started! ID: %s", run.id)
+
+        run = wait_for_run(project_client, thread.id, run,
+                           agent_id=agent.id, timeout=RUN_TIMEOUT)
+        while run.status == "requires_action":
+            run = handle_tool_calls(run, project_client, thread)
+            # The agent's duration hint covers a whole run, not what is left after tool outputs
+            run = wait_for_run(project_client, thread.id, run, timeout=RUN_TIMEOUT)
+        DEFAULT_LEDGER.record_run(project_client, thread.id, run, agent=agent.name,
+                                  duration=time.perf_counter() - started)
+
+        logger.info("✅ Run completed with status: %s", run.status)
         if run.status == "failed":
-            print(f"❌ Run failed: {run.last_error}")
+            logger.error("❌ Run failed: %s", run.last_error)
     except Exception as e:
-        print(f"❌ Error during run: {e}")
+        logger.error("❌ Error during run: %s", e)
         return False
 
     return True
@@ -324,21 +315,26 @@ def process_run(project_client, thread, agent):
 def display_latest_assistant_message(project_client, thread):
     """Display the latest message from the assistant."""
 
-    print("📨 Displaying the latest message from the assistant...")
+    logger.debug("📨 Displaying the latest message from the assistant...")
 
     try:
-        messages = project_client.agents.messages.list(thread_id=thread.id)
-        recent_assistant_message = next(
-            (m for m in messages if m["role"] == "assistant"), None)
+        # Only the newest message is needed: it is either this turn's reply or,
+        # if the agent did not answer, this turn's user message.
+        messages = project_client.agents.messages.list(
+            thread_id=thread.id, order=ListSortOrder.DESCENDING, limit=1)
+        latest_message = next(iter(messages), None)
+        recent_assistant_message = (
+            latest_message if latest_message and latest_message["role"] == "assistant" else None)
 
         if recent_assistant_message:
             for content_item in recent_assistant_message["content"]:
                 if content_item.get("type") == "text":
                     value = content_item["text"].get("value")
                     if value:
+                        flush_logs()
                         print(f"\n[🤖 AIAgent]: {value}\n")
     except Exception as e:
-        print(f"❌ Error retrieving messages: {e}")
+        logger.error("❌ Error retrieving messages: %s", e)
 
 # ---------------------------------------------
 # Optional clean-up
@@ -348,19 +344,19 @@ def display_latest_assistant_message(project_client, thread):
 def delete_agent(project_client, agent):
     """Delete an agent after use (optional)."""
 
-    print("🗑️ Deleting the agent after use (optional)...")
+    logger.info("🗑️ Deleting the agent after use (optional)...")
 
     project_client.agents.delete_agent(agent.id)
-    print("✅ Agent deleted.")
+    logger.info("✅ Agent deleted.")
 
 
 def delete_thread(project_client, thread):
     """Delete a thread after use (optional)."""
 
-    print("🗑️ Deleting the conversational thread after use (optional)...")
+    logger.info("🗑️ Deleting the conversational thread after use (optional)...")
 
     project_client.agents.threads.delete(thread_id=thread.id)
-    print("✅ Thread Deleted")
+    logger.info("✅ Thread Deleted")
 
 
 # ---------------------------------------------
@@ -369,12 +365,15 @@ def delete_thread(project_client, thread):
 
 
 def run_cli():
-    print("🚀 Running CLI application...")
+    logger.info("🚀 Running CLI application...")
+    register_summary_at_exit()
     project_client, model_deployment_name = setup_project_client()
     agent, thread = get_or_create_agent_and_thread(
         project_client, model_deployment_name)
+    flush_logs()
     print("\nType 'exit', 'q', or press Enter on an empty line to stop the conversation.\n")
     while True:
+        flush_logs()
         user_message = input(
             "✨ Enter your message for the agent!\n\n[🧑 You]: ")
         if user_message.strip().lower() in ("exit", "q", ""):
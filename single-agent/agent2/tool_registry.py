@@ -0,0 +1,70 @@
+import inspect
+import json
+
+# ---------------------------------------------
+# Tool dispatch registry
+# ---------------------------------------------
+
+
+class ToolRegistry:
+    """
+    Maps tool names to Python callables and executes function tool calls.
+
+    Arguments sent by the model (`tool_call.function.arguments`, a JSON string)
+    are decoded once and bound against the function's signature before the call,
+    so adding a tool only means registering the function.
+
+    :param functions: Functions to register under their own names.
+    """
+
+    def __init__(self, functions=()):
+        self._tools = {}
+        for function in functions:
+            self.register(function)
+
+    def register(self, function, name=None):
+        """Register a function under `name` (defaults to the function name)."""
+        self._tools[name or function.__name__] = (function, inspect.signature(function))
+        return function
+
+    @property
+    def functions(self):
+        """Registered functions, e.g. to build the agent's FunctionTool."""
+        return {function for function, _ in self._tools.values()}
+
+    def dispatch(self, tool_call):
+        """
+        Execute one function tool call.
+
+        Unknown tools, malformed or mismatching arguments and exceptions raised by
+        the tool are returned as a JSON error output rather than raised, so the
+        model can see what went wrong and the run can continue.
+
+        :param tool_call: Function tool call from run.required_action.
+        :return: {"tool_call_id": ..., "output": ...} ready for submit_tool_outputs.
+        """
+        name = tool_call.function.name
+        try:
+            output = self._call(name, tool_call.function.arguments)
+        except Exception as e:
+            output = json.dumps({"error": f"{name}: {e}"})
+
+        if not isinstance(output, str):
+            output = json.dumps(output)
+        return {"tool_call_id": tool_call.id, "output": output}
+
+    def _call(self, name, raw_arguments):
+        if name not in self._tools:
+            raise LookupError("unknown tool")
+        function, signature = self._tools[name]
+
+        arguments = json.loads(raw_arguments) if raw_arguments else {}
+        if not isinstance(arguments, dict):
+            raise TypeError("arguments must be a JSON object")
+
+        try:
+            bound = signature.bind(**arguments)
+        except TypeError as e:
+            raise TypeError(f"invalid arguments ({e})") from None
+
+        return function(*bound.args, **bound.kwargs)
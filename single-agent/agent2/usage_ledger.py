@@ -0,0 +1,200 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from log_config import flush_logs
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_USAGE_LEDGER = "usage_ledger.jsonl"
+PROMPT_PREVIEW_CHARS = 60
+
+# Same columns as the multi-agent ledger (multi-agent/scenario_*/core/usage_ledger.py),
+# so the files of both can be analysed together
+LEDGER_COLUMNS = (
+    "timestamp", "session_id", "entry", "role", "agent", "agent_id", "thread_id", "run_id",
+    "step_id", "status", "tools", "prompt_chars", "prompt_preview", "duration_seconds",
+    "prompt_tokens", "completion_tokens", "total_tokens",
+)
+
+_TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+
+
+def usage_tracking_enabled():
+    """Return True unless USAGE_TRACKING is set to 'false'."""
+    return os.getenv("USAGE_TRACKING", "true").lower() == "true"
+
+
+def _field(obj, key):
+    # SDK models are mapping-style; fall back to attributes for plain objects
+    if obj is None:
+        return None
+    try:
+        return obj.get(key)
+    except AttributeError:
+        return getattr(obj, key, None)
+
+
+def _tokens(usage):
+    return {field: _field(usage, field) for field in _TOKEN_FIELDS}
+
+
+def _seconds_between(start, end):
+    if start is None or end is None:
+        return None
+    return (end - start).total_seconds()
+
+
+def _tool_labels(step):
+    tool_calls = _field(_field(step, "step_details"), "tool_calls") or []
+    return [_field(_field(tool_call, "function"), "name") or _field(tool_call, "type")
+            for tool_call in tool_calls]
+
+
+class UsageLedger:
+    """
+    Token usage per run and run step, with per-session totals.
+
+    After each run the ledger lists the run's steps on a background thread, so the
+    reply is never delayed, and appends one JSON line per run and per step to
+    USAGE_LEDGER: the run with its usage and the wall-clock seconds the client
+    waited for it, and each step with its usage and the tools it called.
+
+    Args:
+        path (optional): Ledger file. Defaults to USAGE_LEDGER or usage_ledger.jsonl.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._executor = None
+        self._prompts = {}
+        # Token totals stay None while the service has reported no usage
+        self._totals = {"runs": 0, **{field: None for field in _TOKEN_FIELDS}}
+        self.session_id = f"{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+    @property
+    def path(self):
+        return self._path or os.getenv("USAGE_LEDGER", DEFAULT_USAGE_LEDGER)
+
+    def note_prompt(self, thread_id, content):
+        """Remember the user message sent on a thread, to label the next run's entries."""
+        with self._lock:
+            self._prompts[thread_id] = content
+
+    def record_run(self, project, thread_id, run, agent=None, duration=None):
+        """
+        Queue a finished run for accounting; returns immediately.
+
+        Args:
+            project: Azure AI Project client, used to list the run's steps
+            thread_id: ID of the conversation thread
+            run: Run object in its final status
+            agent (optional): Agent name. Defaults to the run's agent ID.
+            duration (optional): Seconds from runs.create to the final status, measured by the caller
+        """
+        if not usage_tracking_enabled():
+            return
+        with self._lock:
+            prompt = self._prompts.pop(thread_id, None)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="usage-ledger")
+            self._executor.submit(self._record, project, thread_id, run, agent, duration, prompt)
+
+    def _record(self, project, thread_id, run, agent, duration, prompt):
+        try:
+            from azure.ai.agents.models import ListSortOrder
+
+            steps = list(project.agents.run_steps.list(
+                thread_id=thread_id, run_id=run.id, order=ListSortOrder.ASCENDING))
+            entries = self._build_entries(thread_id, run, steps, agent, duration, prompt)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as ledger:
+                ledger.write("".join(json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+                                     for entry in entries))
+            self._add_to_totals(entries[0])
+        except Exception as e:
+            logger.warning("⚠️ Failed to record usage of run %s: %s", run.id, e)
+
+    def _build_entries(self, thread_id, run, steps, agent, duration, prompt):
+        agent_id = _field(run, "agent_id")  # REST name is assistant_id
+        base = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "session_id": self.session_id,
+            "role": "agent",
+            "agent": agent or agent_id,
+            "agent_id": agent_id,
+            "thread_id": thread_id,
+            "run_id": run.id,
+            "prompt_chars": len(prompt) if prompt is not None else None,
+            "prompt_preview": prompt[:PROMPT_PREVIEW_CHARS] if prompt is not None else None,
+        }
+        if duration is None:
+            duration = _seconds_between(_field(run, "created_at"), _field(run, "completed_at"))
+        entries = [{
+            **base, "entry": "run", "step_id": None, "status": run.status, "tools": None,
+            "duration_seconds": duration, **_tokens(_field(run, "usage")),
+        }]
+        for step in steps:
+            entries.append({
+                **base, "entry": "step", "step_id": step.id, "status": step.status,
+                "tools": ", ".join(_tool_labels(step)) or None,
+                "duration_seconds": _seconds_between(_field(step, "created_at"), _field(step, "completed_at")),
+                **_tokens(_field(step, "usage")),
+            })
+        return entries
+
+    def _add_to_totals(self, run_entry):
+        with self._lock:
+            self._totals["runs"] += 1
+            for field in _TOKEN_FIELDS:
+                if run_entry[field] is not None:
+                    self._totals[field] = (self._totals[field] or 0) + run_entry[field]
+
+    def totals(self):
+        """Return {runs, prompt_tokens, completion_tokens, total_tokens}; tokens are None if never reported."""
+        self.flush()
+        with self._lock:
+            return dict(self._totals)
+
+    def flush(self, timeout=30):
+        """Wait (up to timeout seconds) for queued runs to be recorded."""
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            done = threading.Event()
+            try:
+                executor.submit(done.set)
+            except RuntimeError:
+                return  # Shut down at interpreter exit, which first finishes queued runs
+            done.wait(timeout)
+
+    def print_summary(self):
+        """Print this session's token totals."""
+        totals = self.totals()
+        if not totals["runs"]:
+            return
+        flush_logs()
+
+        def tokens(value):
+            return "unknown" if value is None else value
+
+        print(f"\n🧾 Token usage this session: {tokens(totals['prompt_tokens'])} in, "
+              f"{tokens(totals['completion_tokens'])} out, {tokens(totals['total_tokens'])} total "
+              f"over {totals['runs']} runs (ledger: {self.path})")
+
+
+def register_summary_at_exit(ledger=None):
+    """Print the ledger's session summary when the process exits (no-op if USAGE_TRACKING=false)."""
+    if usage_tracking_enabled():
+        atexit.register((ledger or DEFAULT_LEDGER).print_summary)
+
+
+# Shared by every run in the process so the summary covers the whole session.
+DEFAULT_LEDGER = UsageLedger()
@@ -0,0 +1,125 @@
+"""
+Compare per-call latency of one-off requests against the pooled inventory client.
+
+By default a local stand-in inventory server is started on 127.0.0.1, so the
+numbers isolate connection setup cost (TCP only; against an https endpoint the
+TLS handshake saved by keep-alive is larger). Pass --url to benchmark a real
+inventory API instead.
+
+Usage:
+    python benchmark_inventory_client.py [--calls 200] [--url https://...]
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from inventory_client import InventoryClient
+
+ITEMS = [
+    {"id": i, "name": f"Item {i}", "price": 9.99 + i, "quantity": i * 3,
+     "description": f"Stand-in inventory item {i}"}
+    for i in range(1, 51)
+]
+
+
+class StandInInventoryHandler(BaseHTTPRequestHandler):
+    """Serves GET /items and GET /items/{id} with keep-alive and optional gzip."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if path == "/items":
+            self._send_json(200, ITEMS)
+        elif path.startswith("/items/") and path[len("/items/"):].isdigit():
+            item_id = int(path[len("/items/"):])
+            if 1 <= item_id <= len(ITEMS):
+                self._send_json(200, ITEMS[item_id - 1])
+            else:
+                self._send_json(404, {"detail": "Item not found"})
+        else:
+            self._send_json(404, {"detail": "Not Found"})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = gzip.compress(body)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInInventoryHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+def time_calls(call, calls):
+    durations = []
+    for i in range(calls):
+        start = time.perf_counter()
+        call(i)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def summarize(label, durations):
+    durations = sorted(durations)
+    p95 = durations[int(len(durations) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(durations):7.2f} ms   "
+          f"p50 {statistics.median(durations):7.2f} ms   p95 {p95:7.2f} ms")
+    return statistics.mean(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200, help="Requests per variant")
+    parser.add_argument("--url", help="Inventory API base URL (defaults to a local stand-in server)")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url.rstrip("/") if args.url else None
+    if not base_url:
+        server, base_url = start_stand_in_server()
+
+    def path(i):
+        return f"/items/{i % len(ITEMS) + 1}"
+
+    print(f"🏁 {args.calls} GET requests per variant against {base_url}\n")
+
+    one_off = time_calls(
+        lambda i: requests.get(f"{base_url}{path(i)}", timeout=10), args.calls)
+
+    client = InventoryClient(base_url)
+    client.get(path(0))  # open the first pooled connection outside the measurement
+    pooled = time_calls(lambda i: client.get(path(i)), args.calls)
+    client.close()
+
+    one_off_mean = summarize("requests.get per call", one_off)
+    pooled_mean = summarize("pooled InventoryClient", pooled)
+    print(f"\n⚡ Pooled client is {one_off_mean / pooled_mean:.1f}x faster per call")
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
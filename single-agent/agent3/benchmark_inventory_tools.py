@@ -0,0 +1,86 @@
+"""
+Measure the inventory tool layer (tools.py: pooled client, read cache, retries) under load.
+
+Calls get_inventory_item and update_inventory_item from --concurrency threads, with
+reads skewed towards a hot set of items so the cache sees a realistic mix, and
+reports latency per tool and the cache hit rate. Run it against the local
+inventory server of multi-agent scenario 3, which can be seeded with millions of
+items and given latency and injected errors:
+
+    cd multi-agent/scenario_3 && python -m core.inventory_api_server --items 1000000
+
+Usage:
+    python benchmark_inventory_tools.py [--calls 2000] [--concurrency 8] [--items 1000000]
+        [--hot 100] [--writes 0.1] [--url http://127.0.0.1:8766]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_URL = "http://127.0.0.1:8766"
+HOT_SHARE = 0.8  # Share of calls that go to the hot items
+
+
+def summarize(label, durations):
+    if not durations:
+        return
+    durations = sorted(durations)
+    p95 = durations[max(0, int(len(durations) * 0.95) - 1)]
+    print(f"{label:<24} {len(durations):>6} calls   mean {statistics.mean(durations):7.2f} ms   "
+          f"p50 {statistics.median(durations):7.2f} ms   p95 {p95:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=os.getenv("INVENTORY_API_URI", DEFAULT_URL),
+                        help=f"Inventory API base URL (default: INVENTORY_API_URI or {DEFAULT_URL})")
+    parser.add_argument("--calls", type=int, default=2000, help="Tool calls in total")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent tool calls")
+    parser.add_argument("--items", type=int, default=1000, help="Item IDs to draw from (1..items)")
+    parser.add_argument("--hot", type=int, default=100, help="Hot items (1..hot) drawing most calls")
+    parser.add_argument("--writes", type=float, default=0.1, help="Share of calls that update an item")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the workload")
+    args = parser.parse_args()
+
+    # The client and cache read their settings on first use
+    os.environ["INVENTORY_API_URI"] = args.url
+    from tools import get_inventory_item, update_inventory_item
+    from inventory_cache import get_inventory_cache
+
+    rng = random.Random(args.seed)
+    hot = max(1, min(args.hot, args.items))
+    workload = []
+    for _ in range(args.calls):
+        item_id = rng.randint(1, hot) if rng.random() < HOT_SHARE else rng.randint(1, args.items)
+        workload.append(("update" if rng.random() < args.writes else "get", item_id))
+
+    def call(operation):
+        kind, item_id = operation
+        start = time.perf_counter()
+        if kind == "get":
+            result = get_inventory_item(item_id)
+        else:
+            result = update_inventory_item(item_id, quantity=item_id % 100)
+        return kind, (time.perf_counter() - start) * 1000, '"error"' in result
+
+    print(f"🏁 {args.calls} tool calls ({args.writes:.0%} writes), concurrency {args.concurrency}, "
+          f"{args.items} items, against {args.url}\n")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(call, workload))
+    elapsed = time.perf_counter() - start
+
+    summarize("get_inventory_item", [ms for kind, ms, _ in results if kind == "get"])
+    summarize("update_inventory_item", [ms for kind, ms, _ in results if kind == "update"])
+    errors = sum(1 for _, _, failed in results if failed)
+    stats = get_inventory_cache().stats()
+    print(f"\n⚡ {len(results) / elapsed:.0f} calls/s, {errors} errors, "
+          f"cache hit rate {stats['hit_rate']:.0%} ({stats['hits']} hits, {stats['misses']} misses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# ---------------------------------------------
+# Inventory read cache
+# ---------------------------------------------
+ITEMS_KEY = "items"
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def item_key(item_id):
+    return f"item:{item_id}"
+
+
+class InventoryCache:
+    """
+    Thread-safe TTL cache for inventory API reads, bounded in size (LRU eviction).
+
+    Every write bumps a generation counter. A read that started before a write
+    cannot store its (possibly pre-write) result afterwards, so our own writes
+    are never followed by stale cached data, even with concurrent tool calls.
+
+    :param ttl: Seconds an entry stays valid (0 disables caching).
+    :param max_entries: Max entries kept before the least recently used is evicted.
+    """
+
+    def __init__(self, ttl=30, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a cached value.
+
+        :return: (value, generation) - value is None on a miss; pass the generation
+            to put() so a result fetched across a write is not stored.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], self._generation
+
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None, self._generation
+
+    def put(self, key, value, generation=None):
+        """Store a value unless a write happened since `generation` was read."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def write(self, invalidate=(), patch=None):
+        """
+        Apply a successful write: drop stale keys and optionally store fresh values.
+
+        :param invalidate: Keys whose cached value the write made stale.
+        :param patch: Optional {key: value} with values returned by the write.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in invalidate:
+                self._entries.pop(key, None)
+        for key, value in (patch or {}).items():
+            self.put(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+def get_inventory_cache():
+    """Return the process-wide inventory cache, reading its settings on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = InventoryCache(
+                    ttl=float(os.getenv("INVENTORY_CACHE_TTL", 30)),
+                    max_entries=int(os.getenv("INVENTORY_CACHE_SIZE", 256)),
+                )
+    return _cache
@@ -0,0 +1,123 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tracing import span, set_attributes, inject_headers
+
+# ---------------------------------------------
+# Shared Inventory API client
+# ---------------------------------------------
+DEFAULT_INVENTORY_API_URI = "https://simple-fastapi-inventory.azurewebsites.net/"
+
+# Retries are limited to idempotent verbs; POST is never replayed
+RETRY_METHODS = frozenset({"GET", "PUT", "DELETE"})
+RETRY_STATUSES = (429, 502, 503, 504)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class InventoryClient:
+    """
+    HTTP client for the inventory API backed by one pooled, keep-alive session.
+
+    Connections are reused across tool calls (and across the concurrent tool
+    calls of one step), responses are requested gzip-compressed, and GET/PUT/
+    DELETE are retried with exponential backoff on connection errors and
+    429/5xx responses, honouring Retry-After.
+
+    :param base_url: Root URL of the inventory API.
+    :param timeout: Timeout for a single request in seconds.
+    :param pool_size: Max connections kept open to the API.
+    :param max_retries: Retries for idempotent requests (0 disables retries).
+    :param backoff_factor: Base of the exponential backoff between retries.
+    """
+
+    def __init__(self, base_url, timeout=10, pool_size=10, max_retries=3, backoff_factor=0.5):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+    def request(self, method, path, **kwargs):
+        """
+        Send a request to the inventory API and raise on HTTP errors.
+
+        :param method: HTTP verb.
+        :param path: Path below the base URL (e.g. "/items/42").
+        :return: requests.Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.base_url}{path}"
+        with span(f"HTTP {method}", http_method=method, url=url):
+            # traceparent links the inventory API's own spans to this tool call
+            inject_headers(kwargs.setdefault("headers", {}))
+            response = self.session.request(method, url, **kwargs)
+            set_attributes(status_code=response.status_code)
+            response.raise_for_status()
+            return response
+
+    @property
+    def worst_case_seconds(self):
+        """
+        Longest a request can take: every attempt timing out plus the backoff between them.
+
+        Waits requested by a server's Retry-After header are not included.
+        """
+        backoff = sum(self.backoff_factor * 2 ** attempt for attempt in range(self.max_retries))
+        return self.timeout * (self.max_retries + 1) + backoff
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def get_inventory_client():
+    """
+    Return the process-wide inventory client, creating it on first use.
+
+    Settings are read from the environment at that point, so values loaded
+    from .env after tools.py is imported still apply.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = InventoryClient(
+                    base_url=os.getenv("INVENTORY_API_URI", DEFAULT_INVENTORY_API_URI),
+                    timeout=float(os.getenv("REQUEST_TIMEOUT", 10)),
+                    pool_size=int(os.getenv("INVENTORY_POOL_SIZE", 10)),
+                    max_retries=int(os.getenv("INVENTORY_MAX_RETRIES", 3)),
+                    backoff_factor=float(os.getenv("INVENTORY_RETRY_BACKOFF", 0.5)),
+                )
+    return _client
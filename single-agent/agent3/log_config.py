@@ -0,0 +1,118 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+
+DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_LOG_FORMAT = "console"
+DEFAULT_AZURE_LOG_LEVEL = "WARNING"
+
+# Attributes every LogRecord has; anything else was passed with extra= and goes into JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_queue = None
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, thread and any extra= fields."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """The emoji status lines as they read on the console; DEBUG lines are indented."""
+
+    def format(self, record):
+        message = super().format(record)
+        return f"   {message}" if record.levelno < logging.INFO else message
+
+
+def setup_logging(level=None, log_format=None, log_file=None):
+    """
+    Route all logging through one non-blocking queue to the configured outputs.
+
+    Callers only enqueue records; a single listener thread formats and writes them,
+    so slow consoles or files never stall the conversation or polling loops. Safe to
+    call more than once (later calls are ignored).
+
+    Args:
+        level (optional): Minimum level. Defaults to LOG_LEVEL, or INFO.
+            DEBUG adds per-poll run status and other chatter.
+        log_format (optional): Console output: "console" (emoji status lines),
+            "json" (one JSON object per line) or "none". Defaults to LOG_FORMAT, or console.
+        log_file (optional): Also write JSON lines to this file. Defaults to LOG_FILE.
+    """
+    global _queue, _listener
+    if _listener is not None:
+        return
+
+    level = (level or os.getenv("LOG_LEVEL", DEFAULT_LOG_LEVEL)).upper()
+    log_format = (log_format or os.getenv("LOG_FORMAT", DEFAULT_LOG_FORMAT)).lower()
+    log_file = log_file or os.getenv("LOG_FILE")
+
+    handlers = []
+    if log_format == "console":
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(ConsoleFormatter("%(message)s"))
+        handlers.append(console)
+    elif log_format == "json":
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(JsonFormatter())
+        handlers.append(stream)
+    elif log_format != "none":
+        raise ValueError(f"Unknown LOG_FORMAT '{log_format}' (use console, json or none)")
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    _queue = queue.Queue()
+    _listener = logging.handlers.QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(_queue))
+    root.setLevel(level)
+
+    # The SDK logs every HTTP request at INFO; keep it quiet unless asked for
+    logging.getLogger("azure").setLevel(os.getenv("AZURE_LOG_LEVEL", DEFAULT_AZURE_LOG_LEVEL).upper())
+
+
+def flush_logs():
+    """
+    Wait until every queued record has been written.
+
+    Call before printing directly to the console (replies, menus, input prompts) so
+    status lines logged just before appear first.
+    """
+    if _queue is not None:
+        _queue.join()
+
+
+def _stop_listener():
+    global _queue, _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        _queue = None
@@ -1,9 +1,11 @@
+import logging
 import os
+import json
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
-from azure.identity import DefaultAzureCredential
 from azure.ai.projects import AIProjectClient
-from azure.ai.agents.models import FunctionTool, ToolSet
+from azure.ai.agents.models import FunctionTool, ToolSet, ListSortOrder
 from tools import (
     get_inventory_details,
     create_inventory_item,
@@ -11,12 +13,43 @@ from tools import (
     update_inventory_item,
     delete_inventory_item,
 )
+from inventory_cache import get_inventory_cache
+from inventory_client import get_inventory_client
+from credentials import get_credential
+from log_config import setup_logging, flush_logs
+from polling import wait_for_run
+from tracing import setup_tracing, traced, span, set_attributes, bind
+from tool_registry import ToolRegistry
+from usage_ledger import DEFAULT_LEDGER, register_summary_at_exit
+
+logger = logging.getLogger(__name__)
+
 
 # ---------------------------------------------
 # Load environment variables
 # ---------------------------------------------
-print("🔄 Loading environment variables...")
+# .env is loaded first so its LOG_* and TRACING settings apply from the first line
 load_dotenv()
+setup_logging()
+setup_tracing("inventory-agent")
+logger.info("✅ Environment variables loaded")
+
+# Tool calls of one requires_action step run concurrently on a bounded pool
+TOOL_CALL_WORKERS = int(os.getenv("TOOL_CALL_WORKERS", 4))
+# Per-tool-call timeout in seconds. It defaults to, and is never below, the inventory
+# client's worst case (REQUEST_TIMEOUT x (INVENTORY_MAX_RETRIES + 1) plus backoff), so a
+# call reported as timed out has actually stopped working and cannot write afterwards
+_CLIENT_WORST_CASE = get_inventory_client().worst_case_seconds
+TOOL_CALL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", _CLIENT_WORST_CASE))
+if TOOL_CALL_TIMEOUT < _CLIENT_WORST_CASE:
+    logger.warning("⚠️ TOOL_CALL_TIMEOUT=%ss is below the inventory client's worst case; using %.1fs",
+                   TOOL_CALL_TIMEOUT, _CLIENT_WORST_CASE)
+    TOOL_CALL_TIMEOUT = _CLIENT_WORST_CASE
+# Max time in seconds to wait for the agent between tool-call rounds
+RUN_TIMEOUT = float(os.getenv("RUN_TIMEOUT", 120))
+
+_tool_executor = ThreadPoolExecutor(
+    max_workers=TOOL_CALL_WORKERS, thread_name_prefix="tool-call")
 
 # ---------------------------------------------
 # Project setup functions
@@ -32,31 +65,34 @@ def setup_project_client():
         raise ValueError(
             "❌ PROJECT_ENDPOINT or MODEL_DEPLOYMENT_NAME missing in .env")
 
-    print("🔗 Connecting to Azure AI Project...")
+    logger.info("🔗 Connecting to Azure AI Project...")
     try:
         project_client = AIProjectClient(
-            endpoint=PROJECT_ENDPOINT, credential=DefaultAzureCredential())
-        print("✅ Connected to Azure AI Project!")
+            endpoint=PROJECT_ENDPOINT, credential=get_credential())
+        logger.info("✅ Connected to Azure AI Project!")
     except Exception as e:
-        print(f"❌ Error initializing AIProjectClient: {e}")
+        logger.error("❌ Error initializing AIProjectClient: %s", e)
         raise
     return project_client, MODEL_DEPLOYMENT_NAME
 
 
+# Adding a tool only requires registering its function here
+TOOL_REGISTRY = ToolRegistry([
+    get_inventory_details,
+    create_inventory_item,
+    get_inventory_item,
+    update_inventory_item,
+    delete_inventory_item,
+])
+
+
 def setup_toolset():
     """Define inventory API functions as FunctionTool and return a ToolSet."""
-    print("🛠️ Setting up agent toolset...")
-    user_functions = {
-        get_inventory_details,
-        create_inventory_item,
-        get_inventory_item,
-        update_inventory_item,
-        delete_inventory_item,
-    }
-    functions = FunctionTool(user_functions)
+    logger.info("🛠️ Setting up agent toolset...")
+    functions = FunctionTool(TOOL_REGISTRY.functions)
     toolset = ToolSet()
     toolset.add(functions)
-    print(f"✅ Toolset defined: {toolset}")
+    logger.info("✅ Toolset defined: %s", toolset)
     return toolset
 
 # ---------------------------------------------
@@ -64,10 +100,10 @@ def setup_toolset():
 # ---------------------------------------------
 
 
+@traced()
 def create_agent(project_client, model_name):
-    print("🤖 Creating a new agent...")
+    logger.info("🤖 Creating a new agent...")
     agent_toolset = setup_toolset()
-    project_client.agents.enable_auto_function_calls(agent_toolset)
     agent = project_client.agents.create_agent(
         model=model_name,
         name="inventory-agent-001",
@@ -79,53 +115,54 @@ def create_agent(project_client, model_name):
         description="Advanced inventory agent with full CRUD capabilities",
         toolset=agent_toolset,
     )
-    print(f"✅ Agent created! ID: {agent.id}")
+    set_attributes(agent_id=agent.id)
+    logger.info("✅ Agent created! ID: %s", agent.id)
     return agent
 
 
+@traced()
 def create_thread(project_client):
-    print("🧵 Creating a new conversation thread...")
+    logger.info("🧵 Creating a new conversation thread...")
     thread = project_client.agents.threads.create()
-    print(f"✅ Thread created! ID: {thread.id}")
+    set_attributes(thread_id=thread.id)
+    logger.info("✅ Thread created! ID: %s", thread.id)
     return thread
 
 
 def get_agent(project_client, agent_id):
-    print("🤖 Retrieving existing agent...")
-    agent_toolset = setup_toolset()
-    project_client.agents.enable_auto_function_calls(agent_toolset)
+    logger.info("🤖 Retrieving existing agent...")
     agent = project_client.agents.get_agent(agent_id)
     if not agent or "id" not in agent:
-        print("❌ No agent found.")
+        logger.error("❌ No agent found.")
         return None
-    print(f"✅ Using existing agent. ID: {agent['id']}")
+    logger.info("✅ Using existing agent. ID: %s", agent['id'])
     return agent
 
 
 def get_thread(project_client, thread_id):
-    print("🧵 Retrieving existing thread...")
+    logger.info("🧵 Retrieving existing thread...")
     thread = project_client.agents.threads.get(thread_id)
     if not thread or "id" not in thread:
-        print("❌ No thread found.")
+        logger.error("❌ No thread found.")
         return None
-    print(f"✅ Using existing thread. ID: {thread['id']}")
+    logger.info("✅ Using existing thread. ID: %s", thread['id'])
     return thread
 
 
 def _get_or_create_agent(project_client, model_name, agent_id):
     if not agent_id:
-        print("🔍 AGENT_ID not found. Creating new agent...")
+        logger.info("🔍 AGENT_ID not found. Creating new agent...")
         agent = create_agent(project_client, model_name)
-        print(f"⚠️ Update .env with AGENT_ID={agent.id}")
+        logger.warning("⚠️ Update .env with AGENT_ID=%s", agent.id)
         return agent
     return get_agent(project_client, agent_id)
 
 
 def _get_or_create_thread(project_client, thread_id):
     if not thread_id:
-        print("🔍 THREAD_ID not found. Creating new thread...")
+        logger.info("🔍 THREAD_ID not found. Creating new thread...")
         thread = create_thread(project_client)
-        print(f"⚠️ Update .env with THREAD_ID={thread.id}")
+        logger.warning("⚠️ Update .env with THREAD_ID=%s", thread.id)
         return thread
     return get_thread(project_client, thread_id)
 
@@ -142,6 +179,7 @@ def get_or_create_agent_and_thread(project_client, model_name):
 # ---------------------------------------------
 
 
+@traced()
 def send_user_message(project_client, thread, user_message):
     try:
         project_client.agents.messages.create(
@@ -149,8 +187,9 @@ def send_user_message(project_client, thread, user_message):
             role="user",
             content=user_message,
         )
+        DEFAULT_LEDGER.note_prompt(thread.id, user_message)
     except Exception as e:
-        print(f"❌ Error sending message: {e}")
+        logger.error("❌ Error sending message: %s", e)
         return False
     return True
 
@@ -163,83 +202,94 @@ def extract_tool_calls(run):
     return tool_calls, ra
 
 
-def handle_tool_output(tool_call):
-    tool_name = tool_call.name
-    tool_id = tool_call.id
-    params = getattr(tool_call, "parameters", {})
-
-    if tool_name == "get_inventory_details":
-        output = get_inventory_details()
-    elif tool_name == "get_inventory_item":
-        output = get_inventory_item(params.get("item_id"))
-    elif tool_name == "create_inventory_item":
-        output = create_inventory_item(
-            name=params.get("name"),
-            price=params.get("price"),
-            quantity=params.get("quantity"),
-            description=params.get("description")
-        )
-    elif tool_name == "update_inventory_item":
-        output = update_inventory_item(
-            item_id=params.get("item_id"),
-            name=params.get("name"),
-            price=params.get("price"),
-            quantity=params.get("quantity"),
-            description=params.get("description")
-        )
-    elif tool_name == "delete_inventory_item":
-        output = delete_inventory_item(params.get("item_id"))
-    else:
-        return None
+def execute_tool_calls(tool_calls):
+    """Run the tool calls of one step concurrently; outputs keep the order of the calls."""
+    started_at = {}
+    submitted_at = time.monotonic()
 
-    return {"tool_call_id": tool_id, "output": output}
+    def timed_call(index, tool_call):
+        started_at[index] = time.monotonic()
+        with span("tool_call", tool_name=tool_call.function.name, tool_call_id=tool_call.id):
+            return TOOL_REGISTRY.dispatch(tool_call)
 
+    # bind() carries the trace context into the pool, so tool spans nest under the run
+    futures = [_tool_executor.submit(bind(timed_call), index, tool_call)
+               for index, tool_call in enumerate(tool_calls)]
 
+    tool_outputs = []
+    for index, (tool_call, future) in enumerate(zip(tool_calls, futures)):
+        # Each call gets TOOL_CALL_TIMEOUT from when it started, or from submission while queued
+        elapsed = time.monotonic() - started_at.get(index, submitted_at)
+        try:
+            result = future.result(timeout=max(0.0, TOOL_CALL_TIMEOUT - elapsed))
+        except FutureTimeoutError:
+            # A running call cannot be stopped (it ends within the client's worst case);
+            # one still queued is withdrawn so it never runs after being reported
+            if index not in started_at and future.cancel():
+                error = f"Tool call not started within {TOOL_CALL_TIMEOUT}s"
+            else:
+                error = f"Tool call timed out after {TOOL_CALL_TIMEOUT}s"
+            result = {"tool_call_id": tool_call.id, "output": json.dumps({"error": error})}
+        except Exception as e:
+            result = {"tool_call_id": tool_call.id, "output": json.dumps({"error": str(e)})}
+
+        tool_outputs.append(result)
+
+    return tool_outputs
+
+
+@traced()
 def handle_tool_calls(run, project_client, thread):
+    """Execute the requested tool calls and submit their outputs; return the updated run."""
     tool_calls, ra = extract_tool_calls(run)
     if not tool_calls:
-        print(f"❌ No tool calls found. run.required_action: {ra}")
-        return
+        logger.error("❌ No tool calls found. run.required_action: %s", ra)
+        return project_client.agents.runs.cancel(thread_id=thread.id, run_id=run.id)
 
-    tool_outputs = []
-    for tool_call in tool_calls:
-        result = handle_tool_output(tool_call)
-        if result:
-            tool_outputs.append(result)
-
-    if tool_outputs:
-        project_client.agents.runs.submit_tool_outputs(
-            thread_id=thread.id, run_id=run.id, tool_outputs=tool_outputs
-        )
+    tool_outputs = execute_tool_calls(tool_calls)
+    return project_client.agents.runs.submit_tool_outputs(
+        thread_id=thread.id, run_id=run.id, tool_outputs=tool_outputs
+    )
 
 
+@traced()
 def process_run(project_client, thread, agent):
+    """Create a run and drive it to completion, executing tool calls as they are requested."""
     try:
-        run = project_client.agents.runs.create_and_process(
+        started = time.perf_counter()
+        run = project_client.agents.runs.create(
             thread_id=thread.id, agent_id=agent.id)
-        while run.status in ["queued", "in_progress", "requires_action"]:
-            time.sleep(1)
-            run = project_client.agents.runs.get(
-                thread_id=thread.id, run_id=run.id)
-            if run.status == "requires_action":
-                handle_tool_calls(run, project_client, thread)
+        set_attributes(thread_id=thread.id, agent_id=agent.id, run_id=run.id)
+        run = wait_for_run(project_client, thread.id, run,
+                           agent_id=agent.id, timeout=RUN_TIMEOUT)
+        while run.status == "requires_action":
+            run = handle_tool_calls(run, project_client, thread)
+            # The agent's duration hint covers a whole run, not what is left after tool outputs
+            run = wait_for_run(project_client, thread.id, run, timeout=RUN_TIMEOUT)
+        set_attributes(run_status=run.status)
+        DEFAULT_LEDGER.record_run(project_client, thread.id, run, agent=agent.name,
+                                  duration=time.perf_counter() - started)
         if run.status == "failed":
-            print(f"❌ Run failed: {run.last_error}")
+            logger.error("❌ Run failed: %s", run.last_error)
             return False
     except Exception as e:
-        print(f"❌ Error during run: {e}")
+        logger.error("❌ Error during run: %s", e)
         return False
     return True
 
 
 def display_latest_assistant_message(project_client, thread):
-    messages = project_client.agents.messages.list(thread_id=thread.id)
-    recent = next((m for m in messages if m["role"] == "assistant"), None)
+    # Newest message only: the reply of this turn, or this turn's user message if none
+    messages = project_client.agents.messages.list(
+        thread_id=thread.id, order=ListSortOrder.DESCENDING, limit=1)
+    latest = next(iter(messages), None)
+    recent = latest if latest and latest["role"] == "assistant" else None
     if recent:
         for c in recent["content"]:
             if c.get("type") == "text":
                 value = c["text"]["value"]
                 if value:
+                    flush_logs()
                     print(f"\n[🤖 InventoryAgent]: {value}\n")
 
 # ---------------------------------------------
@@ -248,19 +298,27 @@ def display_latest_assistant_message(project_client, thread):
 
 
 def run_cli():
+    register_summary_at_exit()
     client, model_name = setup_project_client()
     agent, thread = get_or_create_agent_and_thread(client, model_name)
 
+    flush_logs()
     print("\nType 'exit', 'q', or Enter on empty line to quit.\n")
     while True:
+        flush_logs()
         msg = input("[🧑 You]: ")
         if msg.strip().lower() in ("exit", "q", ""):
             break
-        if not send_user_message(client, thread, msg):
-            continue
-        if not process_run(client, thread, agent):
-            continue
-        display_latest_assistant_message(client, thread)
+        with span("turn", thread_id=thread.id):
+            if not send_user_message(client, thread, msg):
+                continue
+            if not process_run(client, thread, agent):
+                continue
+            display_latest_assistant_message(client, thread)
+
+    stats = get_inventory_cache().stats()
+    logger.info("📊 Inventory cache: %d hits, %d misses (hit rate %.0f%%)",
+                stats['hits'], stats['misses'], stats['hit_rate'] * 100)
 
 
 if __name__ == "__main__":
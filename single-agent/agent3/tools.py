@@ -1,15 +1,15 @@
 import os
 import json
 import requests
+from inventory_client import get_inventory_client
+from inventory_cache import ITEMS_KEY, item_key, get_inventory_cache
 
 # ---------------------------------------------
 # Inventory API Tools
 # ---------------------------------------------
-INVENTORY_API_URI = os.getenv(
-    "INVENTORY_API_URI", "https://simple-fastapi-inventory.azurewebsites.net/")
-
-# Timeout for API requests in seconds
-REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", 10))
+# Base URL, timeout, pool size and retries are read by inventory_client.
+# Reads are served from inventory_cache (INVENTORY_CACHE_TTL / INVENTORY_CACHE_SIZE);
+# writes invalidate the entries they touch, even when the request fails.
 
 # Optional: Project/Agent environment variables
 PROJECT_ENDPOINT = os.getenv("PROJECT_ENDPOINT")
@@ -24,10 +24,13 @@ def get_inventory_details() -> str:
 
     Returns a JSON string of all items.
     """
-    url = f"{INVENTORY_API_URI}/items"
+    cached, generation = get_inventory_cache().get(ITEMS_KEY)
+    if cached is not None:
+        return cached
+
     try:
-        response = requests.get(url, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
+        response = get_inventory_client().get("/items")
+        get_inventory_cache().put(ITEMS_KEY, response.text, generation)
         return response.text
     except requests.RequestException as e:
         return json.dumps({"error": str(e)})
@@ -42,10 +45,13 @@ def get_inventory_item(
     :param item_id: ID of the inventory item.
     :return: JSON string of the item details.
     """
-    url = f"{INVENTORY_API_URI}/items/{item_id}"
+    cached, generation = get_inventory_cache().get(item_key(item_id))
+    if cached is not None:
+        return cached
+
     try:
-        response = requests.get(url, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
+        response = get_inventory_client().get(f"/items/{item_id}")
+        get_inventory_cache().put(item_key(item_id), response.text, generation)
         return response.text
     except requests.RequestException as e:
         return json.dumps({"error": str(e)})
@@ -66,7 +72,6 @@ def create_inventory_item(
     :param description: Optional description.
     :return: JSON string of the created item.
     """
-    url = f"{INVENTORY_API_URI}/items/"
     payload = {
         "name": name,
         "price": price,
@@ -76,12 +81,14 @@ def create_inventory_item(
         payload["description"] = description
 
     try:
-        response = requests.post(url, json=payload, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        return response.text
+        response = get_inventory_client().post("/items/", json=payload)
     except requests.RequestException as e:
+        get_inventory_cache().write(invalidate=[ITEMS_KEY])
         return json.dumps({"error": str(e)})
 
+    get_inventory_cache().write(invalidate=[ITEMS_KEY], patch=_item_patch(response.text))
+    return response.text
+
 
 def update_inventory_item(
     item_id,
@@ -90,7 +97,6 @@ def update_inventory_item(
     quantity=None,
     description=None
 ) -> str:
-    url = f"{INVENTORY_API_URI}/items/{item_id}"
     payload = {k: v for k, v in {
         "name": name,
         "price": price,
@@ -98,13 +104,16 @@ def update_inventory_item(
         "description": description
     }.items() if v is not None}
 
+    stale = [ITEMS_KEY, item_key(item_id)]
     try:
-        response = requests.put(url, json=payload, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        return response.text
+        response = get_inventory_client().put(f"/items/{item_id}", json=payload)
     except requests.RequestException as e:
+        get_inventory_cache().write(invalidate=stale)
         return json.dumps({"error": str(e)})
 
+    get_inventory_cache().write(invalidate=stale, patch=_item_patch(response.text))
+    return response.text
+
 
 def delete_inventory_item(
     item_id
@@ -115,10 +124,23 @@ def delete_inventory_item(
     :param item_id: ID of the item to delete.
     :return: JSON string with result of the operation.
     """
-    url = f"{INVENTORY_API_URI}/items/{item_id}"
+    stale = [ITEMS_KEY, item_key(item_id)]
     try:
-        response = requests.delete(url, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        return response.text if response.text else json.dumps({"success": True})
+        response = get_inventory_client().delete(f"/items/{item_id}")
     except requests.RequestException as e:
+        get_inventory_cache().write(invalidate=stale)
         return json.dumps({"error": str(e)})
+
+    get_inventory_cache().write(invalidate=stale)
+    return response.text if response.text else json.dumps({"success": True})
+
+
+def _item_patch(response_text):
+    """Cache entry for the item returned by a create/update, if it carries an ID."""
+    try:
+        item = json.loads(response_text)
+    except ValueError:
+        return None
+    if isinstance(item, dict) and item.get("id") is not None:
+        return {item_key(item["id"]): response_text}
+    return None
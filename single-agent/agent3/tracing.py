@@ -0,0 +1,281 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_DIR = "traces"
+DEFAULT_TRACING_EXPORTERS = "file"
+
+# Short keyword names used by callers -> OpenTelemetry attribute names
+ATTRIBUTE_NAMES = {
+    "agent_id": "gen_ai.agent.id",
+    "agent_name": "gen_ai.agent.name",
+    "thread_id": "gen_ai.thread.id",
+    "run_id": "gen_ai.thread.run.id",
+    "run_status": "gen_ai.thread.run.status",
+    "message_id": "gen_ai.message.id",
+    "tool_name": "gen_ai.tool.name",
+    "tool_call_id": "gen_ai.tool.call.id",
+    "http_method": "http.request.method",
+    "url": "url.full",
+    "status_code": "http.response.status_code",
+    "server": "server.address",
+}
+
+_tracer = None
+_lock = threading.Lock()
+
+
+class _NoopSpan:
+    """Stands in for a span while tracing is disabled; every method does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def record_exception(self, exception, attributes=None):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def tracing_enabled():
+    """Return True if TRACING is set to true."""
+    return os.getenv("TRACING", "false").lower() == "true"
+
+
+def setup_tracing(service_name):
+    """
+    Start exporting spans if TRACING=true; otherwise leave every helper a no-op.
+
+    Exporters are chosen with TRACING_EXPORTERS (comma-separated):
+    - file: Chrome trace-event JSON under TRACE_DIR, one file per session. Open it
+      in https://ui.perfetto.dev or chrome://tracing for a flame graph of each turn.
+    - otlp: OTLP/HTTP to OTEL_EXPORTER_OTLP_ENDPOINT (default http://localhost:4318),
+      e.g. a local Jaeger or Aspire dashboard.
+    - console: print finished spans (debugging the instrumentation itself).
+
+    Needs the tracing extra (`pip install -e .[tracing]`). When
+    azure-core-tracing-opentelemetry is installed, the SDK's HTTP calls become
+    child spans too. Safe to call more than once.
+
+    Args:
+        service_name: service.name resource attribute (OTEL_SERVICE_NAME overrides it)
+
+    Returns:
+        bool: True if spans are being exported
+    """
+    global _tracer
+    if _tracer is not None or not tracing_enabled():
+        return _tracer is not None
+
+    with _lock:
+        if _tracer is not None:
+            return True
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            logger.warning("⚠️ TRACING=true but OpenTelemetry is not installed (pip install -e .[tracing])")
+            return False
+
+        provider = TracerProvider(resource=Resource.create(
+            {"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)}))
+        provider.add_span_processor(_ThreadAttributes())
+        names = os.getenv("TRACING_EXPORTERS", DEFAULT_TRACING_EXPORTERS)
+        for name in (name.strip().lower() for name in names.split(",") if name.strip()):
+            provider.add_span_processor(BatchSpanProcessor(_exporter(name)))
+        trace.set_tracer_provider(provider)
+        _tracer = trace.get_tracer(__name__)
+
+        try:
+            from azure.core.settings import settings
+            from azure.core.tracing.ext.opentelemetry_span import OpenTelemetrySpan
+            settings.tracing_implementation = OpenTelemetrySpan
+        except ImportError:
+            pass
+
+    logger.info("🔭 Tracing enabled (%s)", names)
+    return True
+
+
+def _exporter(name):
+    if name == "file":
+        return ChromeTraceExporter(os.getenv("TRACE_DIR", DEFAULT_TRACE_DIR))
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    if name == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter()
+    raise ValueError(f"Unknown exporter '{name}' in TRACING_EXPORTERS (use file, otlp or console)")
+
+
+def _attributes(attributes):
+    return {ATTRIBUTE_NAMES.get(key, key): value for key, value in attributes.items() if value is not None}
+
+
+def span(name, **attributes):
+    """
+    Context manager for a span named name, child of the current span.
+
+    Attributes use the short names in ATTRIBUTE_NAMES (thread_id, run_id, ...);
+    None values are dropped. Returns a shared no-op span while tracing is disabled.
+    """
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _tracer.start_as_current_span(name, attributes=_attributes(attributes))
+
+
+def set_attributes(**attributes):
+    """Add attributes (short names as for span) to the current span."""
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+    trace.get_current_span().set_attributes(_attributes(attributes))
+
+
+def traced(name=None):
+    """
+    Decorator wrapping every call of a function (sync or async) in a span.
+
+    The span is named after the function unless name is given. Disabled tracing
+    costs one global lookup per call.
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await func(*args, **kwargs)
+                with _tracer.start_as_current_span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.start_as_current_span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def bind(func):
+    """
+    Return func bound to the caller's trace context, for use in thread pools.
+
+    Spans started by func on a worker thread then nest under the caller's span.
+    Returns func unchanged while tracing is disabled.
+    """
+    if _tracer is None:
+        return func
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def run_in_context(*args, **kwargs):
+        # A context can only be entered by one thread at a time, so each call gets a copy
+        return context.copy().run(func, *args, **kwargs)
+    return run_in_context
+
+
+def inject_headers(headers):
+    """Add W3C trace-context headers (traceparent) for the current span to headers."""
+    if _tracer is None:
+        return headers
+    from opentelemetry.propagate import inject
+    inject(headers)
+    return headers
+
+
+class _ThreadAttributes:
+    """Span processor tagging each span with the thread that started it."""
+
+    def on_start(self, span, parent_context=None):
+        thread = threading.current_thread()
+        span.set_attribute("thread.id", thread.ident)
+        span.set_attribute("thread.name", thread.name)
+
+    def _on_ending(self, span):
+        pass
+
+    def on_end(self, span):
+        pass
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self, timeout_millis=30000):
+        return True
+
+
+class ChromeTraceExporter:
+    """
+    Writes finished spans as Chrome trace events (one "complete" event per span).
+
+    Events are grouped by process and thread, so concurrent provisioning steps,
+    parallel demo questions and tool calls show up as separate tracks. The file is
+    valid JSON once the process exits; a trace cut short still loads, as the
+    format allows a missing closing bracket.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.path = os.path.join(directory, f"session-{stamp}-{os.getpid()}.json")
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write("[")
+        self._first = True
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        with self._lock:
+            for finished in spans:
+                attributes = dict(finished.attributes or {})
+                event = {
+                    "name": finished.name,
+                    "cat": finished.instrumentation_scope.name if finished.instrumentation_scope else "",
+                    "ph": "X",
+                    "ts": finished.start_time / 1000,
+                    "dur": (finished.end_time - finished.start_time) / 1000,
+                    "pid": os.getpid(),
+                    "tid": attributes.pop("thread.id", 0),
+                    "args": {**attributes, "status": finished.status.status_code.name},
+                }
+                self._file.write(("\n" if self._first else ",\n") + json.dumps(event, default=str))
+                self._first = False
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.write("\n]\n")
+                self._file.close()
+                logger.info("🔭 Trace written to %s", self.path)
+
+    def force_flush(self, timeout_millis=30000):
+        return True
@@ -0,0 +1,89 @@
+"""
+Tests of usage_ledger.py in agent2 and agent3, with a stand-in project client.
+
+Each copy is loaded from its path with its agent directory on sys.path, as main.py
+runs it.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGENTS = ("agent2", "agent3")
+
+CREATED = datetime(2026, 1, 1, tzinfo=timezone.utc)
+USAGE = {"prompt_tokens": 30, "completion_tokens": 12, "total_tokens": 42}
+
+
+def load_ledger(agent, monkeypatch):
+    monkeypatch.syspath_prepend(os.path.join(ROOT, agent))
+    spec = importlib.util.spec_from_file_location(
+        f"usage_ledger_{agent}", os.path.join(ROOT, agent, "usage_ledger.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubProject:
+    """Project client whose run_steps.list returns one tool-call step and one message step."""
+
+    def __init__(self):
+        steps = [
+            SimpleNamespace(
+                id="step_1", status="completed", created_at=CREATED,
+                completed_at=CREATED + timedelta(seconds=1), usage=USAGE,
+                step_details={"tool_calls": [{"type": "function", "function": {"name": "get_inventory_item"}}]}),
+            SimpleNamespace(
+                id="step_2", status="completed", created_at=CREATED,
+                completed_at=CREATED + timedelta(seconds=2), usage=None,
+                step_details={"type": "message_creation"}),
+        ]
+        self.agents = SimpleNamespace(run_steps=SimpleNamespace(list=lambda **kwargs: iter(steps)))
+
+
+def finished_run(usage=USAGE):
+    return SimpleNamespace(id="run_1", agent_id="asst_1", status="completed", usage=usage,
+                           created_at=CREATED, completed_at=CREATED + timedelta(seconds=2))
+
+
+@pytest.fixture(params=AGENTS)
+def ledger_module(request, monkeypatch):
+    monkeypatch.delenv("USAGE_TRACKING", raising=False)
+    pytest.importorskip("azure.ai.agents.models")
+    return load_ledger(request.param, monkeypatch)
+
+
+def test_run_and_steps_are_written_with_ledger_columns(ledger_module, tmp_path):
+    ledger = ledger_module.UsageLedger(path=str(tmp_path / "usage.jsonl"))
+    ledger.note_prompt("thread_1", "How many widgets are left?")
+
+    ledger.record_run(StubProject(), "thread_1", finished_run(), agent="inventory-agent", duration=0.25)
+    ledger.flush()
+
+    with open(ledger.path, encoding="utf-8") as ledger_file:
+        entries = [json.loads(line) for line in ledger_file]
+    assert [entry["entry"] for entry in entries] == ["run", "step", "step"]
+    assert all(tuple(sorted(entry)) == tuple(sorted(ledger_module.LEDGER_COLUMNS)) for entry in entries)
+    run, tool_step, message_step = entries
+    assert run["duration_seconds"] == 0.25
+    assert run["agent"] == "inventory-agent"
+    assert run["prompt_preview"] == "How many widgets are left?"
+    assert run["total_tokens"] == 42
+    assert tool_step["tools"] == "get_inventory_item"
+    assert message_step["total_tokens"] is None
+
+
+def test_totals_stay_unknown_without_reported_usage(ledger_module, tmp_path):
+    ledger = ledger_module.UsageLedger(path=str(tmp_path / "usage.jsonl"))
+
+    ledger.record_run(StubProject(), "thread_1", finished_run(usage=None))
+
+    totals = ledger.totals()
+    assert totals["runs"] == 1
+    assert totals["total_tokens"] is None